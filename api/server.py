@@ -17,23 +17,61 @@ sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import uuid
 import asyncio
-from datetime import datetime
-import json
+import hashlib
+import time
+import orjson
+
+from src.orchestrator import analyze_paper_in_worker
+from src.memory import get_session_manager, create_progress_store, ProgressStore
+from src.utils import get_logger, Config, format_timestamp
+
+# Progress tracking store (Redis when REDIS_URL is set, in-memory otherwise)
+progress_store: Optional[ProgressStore] = None
+
+# Worker processes for CPU-bound paper analysis (keeps the event loop free)
+analysis_pool: Optional[ProcessPoolExecutor] = None
+
+# Uploaded PDFs (created once at startup)
+UPLOAD_DIR = Config.DATA_ROOT / "uploads"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    global progress_store, analysis_pool
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    if Config.CELERY_BROKER_URL:
+        # Import now so a misconfigured broker fails at startup, not on upload
+        import api.tasks
+    progress_store = create_progress_store(Config.REDIS_URL, ttl=Config.PROGRESS_TTL_SECONDS)
+    # Spawned workers start clean instead of inheriting this process's
+    # threads and locks (session sweeper/writer, event loop) mid-operation
+    analysis_pool = ProcessPoolExecutor(
+        max_workers=Config.ANALYSIS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    yield
+    analysis_pool.shutdown(wait=False, cancel_futures=True)
+    await progress_store.close()
 
-from src.orchestrator import OrchestratorAgent
-from src.memory import get_session_manager
-from src.utils import get_logger, Config
 
 # Initialize
-app = FastAPI(title="ScholarLens API", version="1.0.0")
+app = FastAPI(
+    title="ScholarLens API",
+    version="1.0.0",
+    lifespan=lifespan
+)
 logger = get_logger("api")
 session_manager = get_session_manager()
-orchestrator = OrchestratorAgent()
 
 # CORS - allow frontend to connect
 app.add_middleware(
@@ -44,10 +82,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for analysis progress
-analysis_progress = {}
-
-
 class AnalysisRequest(BaseModel):
     """Request model for analysis."""
     session_id: Optional[str] = None
@@ -64,8 +98,13 @@ class AnalysisStatus(BaseModel):
     completed_at: Optional[str] = None
 
 
+def _orjson_response(data: Dict[str, Any]) -> Response:
+    """Encode a response body with orjson, bypassing FastAPI's encoder."""
+    return Response(content=orjson.dumps(data), media_type="application/json")
+
+
 @app.get("/")
-async def root():
+async def root() -> Dict[str, Any]:
     """Health check endpoint."""
     return {
         "name": "ScholarLens API",
@@ -79,11 +118,13 @@ async def root():
 async def upload_and_analyze(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    session_id: Optional[str] = None
+    session_id: Optional[str] = None,
+    force: bool = False
 ):
     """
     Upload a PDF and start analysis.
     Returns immediately with session_id for tracking progress.
+    A completed analysis of identical content is reused unless force=true.
     """
     # Validate file type
     if not file.filename.endswith('.pdf'):
@@ -94,36 +135,53 @@ async def upload_and_analyze(
         session_id = str(uuid.uuid4())
     
     # Save uploaded file
-    upload_dir = Config.DATA_ROOT / "uploads"
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    file_path = upload_dir / f"{session_id}_{file.filename}"
+    file_path = UPLOAD_DIR / f"{session_id}_{file.filename}"
     
     try:
-        contents = await file.read()
+        # Stream to disk in fixed-size chunks so memory stays bounded,
+        # hashing as we go to detect re-uploads of the same paper
+        hasher = hashlib.sha256()
         with open(file_path, "wb") as f:
-            f.write(contents)
+            while chunk := await file.read(Config.UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                f.write(chunk)
+        content_hash = hasher.hexdigest()
         
         logger.info(f"File uploaded: {file_path}")
         
-        # Initialize progress tracking
-        analysis_progress[session_id] = {
+        # Reuse a completed analysis of identical content
+        reused = None
+        if not force:
+            reused = await reuse_prior_analysis(session_id, content_hash, file.filename)
+        if reused is not None:
+            file_path.unlink(missing_ok=True)
+            return reused
+        
+        # Initialize progress tracking (timestamps stored as epoch ns,
+        # formatted only when a response is built)
+        started_at = time.time_ns()
+        await progress_store.set_progress(session_id, {
             "status": "queued",
             "progress": 0,
             "current_stage": "Initializing",
-            "started_at": datetime.now().isoformat(),
+            "started_at": started_at,
             "filename": file.filename
-        }
+        })
         
-        # Start analysis in background
-        background_tasks.add_task(run_analysis, session_id, str(file_path))
+        # Start analysis: durable Celery job when a broker is configured,
+        # otherwise an in-process background task
+        if Config.CELERY_BROKER_URL:
+            from api.tasks import analyze_paper_task
+            analyze_paper_task.delay(session_id, str(file_path))
+        else:
+            background_tasks.add_task(run_analysis, session_id, str(file_path), content_hash)
         
         return AnalysisStatus(
             session_id=session_id,
             status="queued",
             progress=0,
             current_stage="Queued for processing",
-            started_at=datetime.now().isoformat()
+            started_at=format_timestamp(started_at)
         )
         
     except Exception as e:
@@ -131,56 +189,172 @@ async def upload_and_analyze(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def run_analysis(session_id: str, pdf_path: str):
+async def reuse_prior_analysis(
+    session_id: str,
+    content_hash: str,
+    filename: str
+) -> Optional[AnalysisStatus]:
+    """
+    Point a new session at the completed analysis of an identical upload.
+    
+    Args:
+        session_id: New session ID
+        content_hash: SHA-256 hex digest of the uploaded file
+        filename: Uploaded filename
+    
+    Returns:
+        Completed status, or None if no reusable analysis exists
+    """
+    prior_session_id = await progress_store.get_content_session(content_hash)
+    if prior_session_id is None:
+        return None
+    
+    prior = await progress_store.get_progress(prior_session_id)
+    if not prior or prior.get("status") != "completed":
+        return None
+    
+    # The report and session endpoints read the session manager, so the
+    # new ID gets its own copy of the prior session
+    copied = session_manager.copy_session(
+        prior_session_id,
+        session_id,
+        {'reused_from': prior_session_id}
+    )
+    if copied is None:
+        return None
+    
+    now = time.time_ns()
+    await progress_store.set_progress(session_id, {
+        "status": "completed",
+        "progress": 100,
+        "current_stage": "Complete",
+        "started_at": now,
+        "completed_at": now,
+        "filename": filename,
+        "result": prior.get("result"),
+        "reused_from": prior_session_id
+    })
+    
+    report_paths = {}
+    for fmt in ("json", "md"):
+        path = await progress_store.get_report_path(prior_session_id, fmt)
+        if path:
+            report_paths[fmt] = path
+    await progress_store.set_report_paths(session_id, report_paths)
+    
+    logger.info(f"Reusing analysis from session {prior_session_id} for {session_id}")
+    
+    return AnalysisStatus(
+        session_id=session_id,
+        status="completed",
+        progress=100,
+        current_stage="Complete",
+        started_at=format_timestamp(now),
+        completed_at=format_timestamp(now)
+    )
+
+
+async def run_analysis(session_id: str, pdf_path: str, content_hash: Optional[str] = None):
     """Background task to run paper analysis."""
     try:
         # Update progress
-        analysis_progress[session_id]["status"] = "processing"
-        analysis_progress[session_id]["progress"] = 10
-        analysis_progress[session_id]["current_stage"] = "Document Extraction"
+        await progress_store.update_progress(
+            session_id,
+            status="processing",
+            progress=10,
+            current_stage="Document Extraction"
+        )
         
         logger.info(f"Starting analysis for session: {session_id}")
         
-        # Run orchestrator (this calls all agents)
-        result = await asyncio.to_thread(
-            orchestrator.analyze_paper,
+        # Run orchestrator in a worker process (this calls all agents)
+        result, session = await asyncio.get_running_loop().run_in_executor(
+            analysis_pool,
+            analyze_paper_in_worker,
             pdf_path,
-            session_id
+            session_id,
+            True,
+            content_hash
         )
+        # The worker's session manager is its own; keep the session here
+        # so the report and session endpoints can serve it
+        if session is not None:
+            session_manager.add_session(session)
         
         # Update progress
-        analysis_progress[session_id]["status"] = "completed"
-        analysis_progress[session_id]["progress"] = 100
-        analysis_progress[session_id]["current_stage"] = "Complete"
-        analysis_progress[session_id]["completed_at"] = datetime.now().isoformat()
-        analysis_progress[session_id]["result"] = result
+        await progress_store.update_progress(
+            session_id,
+            status="completed",
+            progress=100,
+            current_stage="Complete",
+            completed_at=time.time_ns(),
+            result=result
+        )
+        await progress_store.set_report_paths(
+            session_id,
+            result.get('execution_metadata', {}).get('output_files', {})
+        )
+        # Placeholder reports (no API key) aren't worth reusing
+        if content_hash and result['execution_metadata'].get('llm_enabled'):
+            await progress_store.set_content_session(content_hash, session_id)
         
         logger.info(f"Analysis completed for session: {session_id}")
         
     except Exception as e:
         logger.error(f"Analysis failed for {session_id}: {e}")
-        analysis_progress[session_id]["status"] = "failed"
-        analysis_progress[session_id]["error"] = str(e)
-        analysis_progress[session_id]["completed_at"] = datetime.now().isoformat()
+        await progress_store.update_progress(
+            session_id,
+            status="failed",
+            error=str(e),
+            completed_at=time.time_ns()
+        )
+
+
+@lru_cache(maxsize=1024)
+def _format_stored_time(ns: int) -> str:
+    """Format a stored timestamp; status polls reformat the same values."""
+    return format_timestamp(ns)
 
 
-@app.get("/api/status/{session_id}", response_model=AnalysisStatus)
+def _format_time(value: Any) -> Optional[str]:
+    """Format a stored progress timestamp (epoch ns) for API responses."""
+    if isinstance(value, int):
+        return _format_stored_time(value)
+    return value
+
+
+@app.get(
+    "/api/status/{session_id}",
+    response_model=None,
+    responses={200: {"model": AnalysisStatus}}
+)
 async def get_analysis_status(session_id: str):
     """Get the status of an analysis job."""
-    if session_id not in analysis_progress:
+    progress_data = await progress_store.get_progress(session_id)
+    if progress_data is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    progress_data = analysis_progress[session_id]
-    
-    return AnalysisStatus(
-        session_id=session_id,
-        status=progress_data["status"],
-        progress=progress_data["progress"],
-        current_stage=progress_data.get("current_stage"),
-        error=progress_data.get("error"),
-        started_at=progress_data.get("started_at"),
-        completed_at=progress_data.get("completed_at")
-    )
+    # Hot polling endpoint: progress entries are written by this server and
+    # already match AnalysisStatus, so skip per-request model validation
+    return _orjson_response({
+        "session_id": session_id,
+        "status": progress_data["status"],
+        "progress": progress_data["progress"],
+        "current_stage": progress_data.get("current_stage"),
+        "error": progress_data.get("error"),
+        "started_at": _format_time(progress_data.get("started_at")),
+        "completed_at": _format_time(progress_data.get("completed_at"))
+    })
+
+
+async def _iter_json_object(data: Dict[str, Any]):
+    """Yield a dictionary as JSON, encoding one top-level entry per chunk."""
+    yield b"{"
+    for i, (key, value) in enumerate(data.items()):
+        if i:
+            yield b","
+        yield orjson.dumps(key) + b":" + orjson.dumps(value)
+    yield b"}"
 
 
 @app.get("/api/report/{session_id}")
@@ -193,29 +367,43 @@ async def get_report(session_id: str):
         if not context:
             raise HTTPException(status_code=404, detail="Report not found")
         
-        return JSONResponse(content=context)
+        # Stream one top-level key at a time so large reports are never
+        # encoded into a single buffer
+        return StreamingResponse(
+            _iter_json_object(context),
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to retrieve report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/sessions")
-async def list_sessions():
-    """List all active analysis sessions."""
+@app.get("/api/sessions", response_model=None)
+async def list_sessions(limit: int = 100, offset: int = 0) -> Response:
+    """List active analysis sessions (paginated)."""
     try:
-        sessions = session_manager.list_sessions()
+        all_sessions = session_manager.list_sessions()
+        sessions = all_sessions[offset:offset + limit]
         
-        # Enhance with progress info
-        enhanced_sessions = []
-        for session in sessions:
-            session_info = {
-                **session,
-                "progress_status": analysis_progress.get(session["session_id"], {})
-            }
-            enhanced_sessions.append(session_info)
+        # Enhance with progress info (one batched store lookup)
+        progress_entries = await progress_store.get_many(
+            [session["session_id"] for session in sessions]
+        )
+        # Session dicts are freshly built per call, so annotate them in place
+        for session, progress in zip(sessions, progress_entries):
+            if progress:
+                progress = {
+                    **progress,
+                    "started_at": _format_time(progress.get("started_at")),
+                    "completed_at": _format_time(progress.get("completed_at"))
+                }
+            session["progress_status"] = progress or {}
         
-        return {"sessions": enhanced_sessions}
+        # Progress entries carry whole reports, so encode with orjson
+        return _orjson_response({"sessions": sessions, "total": len(all_sessions)})
         
     except Exception as e:
         logger.error(f"Failed to list sessions: {e}")
@@ -223,14 +411,13 @@ async def list_sessions():
 
 
 @app.delete("/api/session/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(session_id: str) -> Dict[str, str]:
     """Delete a session and its data."""
     try:
         session_manager.clear_session(session_id)
         
         # Remove from progress tracking
-        if session_id in analysis_progress:
-            del analysis_progress[session_id]
+        await progress_store.delete(session_id)
         
         return {"message": "Session deleted successfully"}
         
@@ -240,11 +427,11 @@ async def delete_session(session_id: str):
 
 
 @app.delete("/api/sessions/clear")
-async def clear_all_sessions():
+async def clear_all_sessions() -> Dict[str, str]:
     """Clear all sessions."""
     try:
         session_manager.clear_all()
-        analysis_progress.clear()
+        await progress_store.clear()
         
         return {"message": "All sessions cleared"}
         
@@ -253,33 +440,51 @@ async def clear_all_sessions():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _accel_redirect_uri(file_path: Path) -> str:
+    """Map a report file to its nginx internal location URI."""
+    try:
+        relative = file_path.resolve().relative_to(Config.OUTPUTS_DIR.resolve())
+    except ValueError:
+        relative = Path(file_path.name)
+    return Config.NGINX_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative.as_posix()
+
+
 @app.get("/api/download/{session_id}/{format}")
 async def download_report(session_id: str, format: str):
     """Download report in specified format (json or markdown)."""
     try:
-        # Find the output file
-        output_dir = Config.OUTPUTS_DIR
-        
         if format == "json":
-            pattern = f"*{session_id[:8]}*_report.json"
+            fmt, media_type = "json", "application/json"
         elif format == "markdown" or format == "md":
-            pattern = f"*{session_id[:8]}*_report.md"
+            fmt, media_type = "md", "text/markdown"
         else:
             raise HTTPException(status_code=400, detail="Format must be 'json' or 'markdown'")
         
-        files = list(output_dir.glob(pattern))
+        # Report paths are recorded when the analysis completes
+        path = await progress_store.get_report_path(session_id, fmt)
+        file_path = Path(path) if path else None
         
-        if not files:
+        if file_path is None or not file_path.exists():
             raise HTTPException(status_code=404, detail="Report file not found")
         
-        file_path = files[0]
+        # Behind nginx, let it serve the file with sendfile
+        if Config.NGINX_ACCEL_REDIRECT_PREFIX:
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": _accel_redirect_uri(file_path),
+                    "Content-Disposition": f'attachment; filename="{file_path.name}"'
+                }
+            )
         
         return FileResponse(
             path=file_path,
             filename=file_path.name,
-            media_type="application/octet-stream"
+            media_type=media_type
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to download report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -292,4 +497,14 @@ if __name__ == "__main__":
     print("📖 API Documentation: http://localhost:8000/docs")
     print("🔍 Health Check: http://localhost:8000/")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard], non-Windows).
+    # Reload mode is for development and runs a single worker.
+    uvicorn.run(
+        "api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=1 if Config.API_RELOAD else Config.API_WORKERS,
+        loop="auto",
+        http="auto",
+        reload=Config.API_RELOAD
+    )
@@ -0,0 +1,104 @@
+"""
+Celery tasks for ScholarLens.
+
+Durable analysis jobs dispatched through a Redis broker, so queued work
+survives API restarts and concurrency is bounded by the worker pool.
+Enabled when CELERY_BROKER_URL is set. Workers need access to the upload
+directory and should share REDIS_URL with the API for progress tracking.
+Sessions stay in the worker, so GET /api/report and the session list only
+cover in-process analyses; Celery results are served through the progress
+entry and the download endpoint. For the same reason re-uploads of a paper
+analyzed here are analyzed again rather than reused.
+
+Run workers with:
+    celery -A api.tasks worker --concurrency=4
+"""
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from celery import Celery
+
+from src.orchestrator import analyze_paper_in_worker
+from src.memory import create_progress_store
+from src.utils import get_logger, Config
+
+logger = get_logger("tasks")
+
+# Progress written by workers must reach the API; the in-memory fallback
+# store would leave every job "queued" as far as clients can tell
+if not Config.REDIS_URL:
+    raise RuntimeError("CELERY_BROKER_URL requires REDIS_URL for shared progress tracking")
+
+celery_app = Celery("scholarlens", broker=Config.CELERY_BROKER_URL)
+celery_app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=1
+)
+
+
+def _update_progress(
+    session_id: str,
+    report_paths=None,
+    **fields
+) -> None:
+    """Update the shared progress entry (and report paths) for a session."""
+    async def _update():
+        store = create_progress_store(Config.REDIS_URL, ttl=Config.PROGRESS_TTL_SECONDS)
+        try:
+            await store.update_progress(session_id, **fields)
+            if report_paths:
+                await store.set_report_paths(session_id, report_paths)
+        finally:
+            await store.close()
+    
+    asyncio.run(_update())
+
+
+@celery_app.task(name="scholarlens.analyze_paper")
+def analyze_paper_task(session_id: str, pdf_path: str) -> None:
+    """
+    Run paper analysis in a Celery worker.
+    
+    Args:
+        session_id: Session ID
+        pdf_path: Path to uploaded PDF
+    """
+    try:
+        _update_progress(
+            session_id,
+            status="processing",
+            progress=10,
+            current_stage="Document Extraction"
+        )
+        
+        logger.info(f"Starting analysis for session: {session_id}")
+        
+        result, _ = analyze_paper_in_worker(pdf_path, session_id)
+        
+        _update_progress(
+            session_id,
+            status="completed",
+            progress=100,
+            current_stage="Complete",
+            completed_at=time.time_ns(),
+            result=result,
+            report_paths=result.get('execution_metadata', {}).get('output_files', {})
+        )
+        
+        logger.info(f"Analysis completed for session: {session_id}")
+    
+    except Exception as e:
+        logger.error(f"Analysis failed for {session_id}: {e}")
+        _update_progress(
+            session_id,
+            status="failed",
+            error=str(e),
+            completed_at=time.time_ns()
+        )
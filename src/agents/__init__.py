@@ -4,6 +4,7 @@ from .base_agent import (
     BaseAgent,
     AgentInput,
     AgentOutput,
+    AgentOutputDict,
     DocumentInput,
     DocumentOutput,
     SummaryInput,
@@ -35,6 +36,7 @@ __all__ = [
     'BaseAgent',
     'AgentInput',
     'AgentOutput',
+    'AgentOutputDict',
     'DocumentInput',
     'DocumentOutput',
     'SummaryInput',
@@ -5,6 +5,7 @@ Synthesizes outputs from all specialized agents into a cohesive
 research report with both structured data and markdown format.
 """
 
+import io
 import time
 from typing import Dict, Any, List
 from datetime import datetime
@@ -16,6 +17,8 @@ from src.utils import get_logger, dict_to_markdown
 class AggregatorAgent(BaseAgent):
     """Aggregates all agent outputs into final research report."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize AggregatorAgent.
@@ -51,6 +54,12 @@ class AggregatorAgent(BaseAgent):
             # Build final report structure
             report = self._build_report_structure(agent_outputs)
             
+            # Bound report size before rendering
+            report = self._limit_items(
+                report,
+                self._get_setting('MAX_ITEMS_PER_SECTION', 50)
+            )
+            
             # Generate markdown representation
             markdown = self._generate_markdown(report)
             report['final_markdown'] = markdown
@@ -146,15 +155,21 @@ class AggregatorAgent(BaseAgent):
         Returns:
             Metadata dictionary
         """
+        meta = document.get('metadata') or {}
+        sections = document.get('sections') or ()
+        equations = document.get('equations') or ()
+        figures = document.get('figures') or ()
+        references = document.get('references') or ()
+        
         return {
             'title': document.get('title', 'Unknown'),
-            'authors': document.get('authors', []),
+            'authors': document.get('authors') or [],
             'abstract': document.get('abstract', ''),
-            'num_pages': document.get('metadata', {}).get('num_pages', 0),
-            'num_sections': len(document.get('sections', [])),
-            'num_equations': len(document.get('equations', [])),
-            'num_figures': len(document.get('figures', [])),
-            'num_references': len(document.get('references', []))
+            'num_pages': meta.get('num_pages', 0),
+            'num_sections': len(sections),
+            'num_equations': len(equations),
+            'num_figures': len(figures),
+            'num_references': len(references)
         }
     
     def _synthesize_insights(
@@ -206,6 +221,30 @@ Provide:
             ]
         }
     
+    def _limit_items(self, value: Any, limit: int) -> Any:
+        """
+        Truncate lists anywhere in the report to a maximum length.
+        
+        Args:
+            value: Report (or nested value)
+            limit: Maximum items kept per list
+            
+        Returns:
+            Value with long lists cut to limit items; a list under key
+            <name> gets a sibling <name>_truncated holding the number of
+            dropped items, so list item types are unchanged
+        """
+        if isinstance(value, dict):
+            limited = {}
+            for key, item in value.items():
+                limited[key] = self._limit_items(item, limit)
+                if isinstance(item, list) and len(item) > limit:
+                    limited[f"{key}_truncated"] = len(item) - limit
+            return limited
+        if isinstance(value, list):
+            return [self._limit_items(item, limit) for item in value[:limit]]
+        return value
+    
     def _generate_markdown(self, report: Dict[str, Any]) -> str:
         """
         Generate markdown representation of report.
@@ -235,53 +274,50 @@ Provide:
         Returns:
             Simple markdown string
         """
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
         
         # Title
-        title = report.get('metadata', {}).get('title', 'Research Paper Analysis')
-        lines.append(f"# {title}\n")
-        lines.append("---\n")
+        metadata = report.get('metadata', {})
+        title = metadata.get('title', 'Research Paper Analysis')
+        w(f"# {title}\n---\n")
         
         # Metadata
-        metadata = report.get('metadata', {})
-        if metadata.get('authors'):
-            authors = ', '.join(metadata['authors'])
-            lines.append(f"**Authors:** {authors}\n")
-        lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        lines.append("\n---\n")
+        authors = metadata.get('authors')
+        if authors:
+            w(f"**Authors:** {', '.join(authors)}\n")
+        w(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n---\n")
         
         # Summaries
         summaries = report.get('summaries', {})
         if summaries:
-            lines.append("\n## Summaries\n")
+            w("\n## Summaries\n")
             if summaries.get('tldr'):
-                lines.append(f"\n### TL;DR\n{summaries['tldr']}\n")
+                w(f"\n### TL;DR\n{summaries['tldr']}\n")
             if summaries.get('paragraph_summary'):
-                lines.append(f"\n### Paragraph Summary\n{summaries['paragraph_summary']}\n")
+                w(f"\n### Paragraph Summary\n{summaries['paragraph_summary']}\n")
         
         # Methodology
         methodology = report.get('methodology', {})
         if methodology:
-            lines.append("\n## Methodology\n")
+            w("\n## Methodology\n")
             if methodology.get('approach'):
-                lines.append(f"\n{methodology['approach']}\n")
+                w(f"\n{methodology['approach']}\n")
         
         # Critique
         critique = report.get('critique', {})
         if critique:
-            lines.append("\n## Critical Analysis\n")
+            w("\n## Critical Analysis\n")
             if critique.get('assumptions'):
-                lines.append("\n### Assumptions\n")
-                for assumption in critique['assumptions'][:5]:
-                    lines.append(f"- {assumption}\n")
+                w("\n### Assumptions\n")
+                w("".join(f"- {a}\n" for a in critique['assumptions'][:5]))
         
         # Implementation
         implementation = report.get('implementation', {})
         if implementation and implementation.get('recommendations'):
-            lines.append("\n## Implementation Recommendations\n")
-            for rec in implementation['recommendations'][:5]:
-                lines.append(f"- {rec}\n")
+            w("\n## Implementation Recommendations\n")
+            w("".join(f"- {r}\n" for r in implementation['recommendations'][:5]))
         
-        lines.append(f"\n---\n*Generated by ScholarLens*\n")
+        w("\n---\n*Generated by ScholarLens*\n")
         
-        return ''.join(lines)
+        return buf.getvalue()
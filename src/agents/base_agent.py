@@ -5,12 +5,21 @@ Defines abstract base agent, Pydantic models for input/output,
 and common agent functionality.
 """
 
+import os
+import re
+import json
+import time
+import asyncio
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, TypedDict, Union
 from pydantic import BaseModel, Field
 from pathlib import Path
 
+from src.utils import format_timestamp
+
 
 # ============================================================================
 # Pydantic Schemas for Agent Input/Output
@@ -26,12 +35,30 @@ class AgentOutput(BaseModel):
     """Base output schema for all agents."""
     agent_name: str = Field(..., description="Name of the agent")
     status: str = Field(..., description="Status: success, error, partial")
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = Field(
+        default_factory=lambda: format_timestamp(time.time_ns()),
+        description="Local ISO 8601 time"
+    )
     result: Dict[str, Any] = Field(default_factory=dict, description="Agent results")
     errors: List[str] = Field(default_factory=list, description="Error messages if any")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Execution metadata")
 
 
+class AgentOutputDict(TypedDict):
+    """
+    Plain-dict form of AgentOutput returned by agents.
+    
+    Agents pass outputs as dictionaries, which avoids model construction
+    and validation on every call; this type documents their shape.
+    """
+    agent_name: str
+    status: str
+    timestamp: str
+    result: Dict[str, Any]
+    errors: List[str]
+    metadata: Dict[str, Any]
+
+
 class DocumentInput(AgentInput):
     """Input for DocumentExtractorAgent."""
     file_path: str = Field(..., description="Path to PDF file")
@@ -161,9 +188,19 @@ class AggregatorOutput(AgentOutput):
 # Base Agent Class
 # ============================================================================
 
+# Outermost JSON object in an LLM response
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# In-flight async LLM calls, keyed by event loop and request, so
+# concurrent identical prompts share one API call
+_INFLIGHT: Dict[Tuple, "asyncio.Future"] = {}
+
+
 class BaseAgent(ABC):
     """Abstract base class for all agents."""
     
+    __slots__ = ('name', 'logger', 'config', 'stats')
+    
     def __init__(
         self,
         name: str,
@@ -181,9 +218,10 @@ class BaseAgent(ABC):
         self.name = name
         self.logger = logger
         self.config = config
+        self.stats: Dict[str, int] = {'llm_cache_hits': 0, 'llm_cache_misses': 0}
     
     @abstractmethod
-    def run(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def run(self, data: Dict[str, Any]) -> AgentOutputDict:
         """
         Main execution method for the agent.
         
@@ -195,6 +233,120 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def arun(self, data: Dict[str, Any]) -> AgentOutputDict:
+        """
+        Async execution method for the agent.
+        
+        Runs the synchronous run() in a worker thread; agents with
+        concurrent LLM calls override this.
+        
+        Args:
+            data: Input data dictionary
+            
+        Returns:
+            Output data dictionary
+        """
+        return await asyncio.to_thread(self.run, data)
+    
+    async def run_batch_async(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[AgentOutputDict]:
+        """
+        Run the agent over several inputs concurrently.
+        
+        Args:
+            items: Input data dictionaries
+            max_concurrency: Maximum number of items processed at once
+            
+        Returns:
+            Output dictionaries in input order; failed items get an
+            error output
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(item: Dict[str, Any]) -> AgentOutputDict:
+            async with semaphore:
+                return await self.arun(item)
+        
+        results = await asyncio.gather(
+            *(run_one(item) for item in items),
+            return_exceptions=True
+        )
+        
+        outputs = []
+        for result in results:
+            if isinstance(result, Exception):
+                self._log_error(result)
+                result = self._create_output(
+                    status="error",
+                    result={},
+                    errors=[str(result)]
+                )
+            outputs.append(result)
+        
+        return outputs
+    
+    async def _gather_limited(self, *aws, limit: Optional[int] = None) -> List[Any]:
+        """
+        Await several LLM-bound coroutines concurrently.
+        
+        Args:
+            *aws: Coroutines to run
+            limit: Maximum number running at once (LLM_MAX_CONCURRENCY by default)
+            
+        Returns:
+            Results in argument order
+        """
+        semaphore = asyncio.Semaphore(limit or self._get_setting('LLM_MAX_CONCURRENCY', 8))
+        
+        async def run_one(aw):
+            async with semaphore:
+                return await aw
+        
+        return await asyncio.gather(*(run_one(aw) for aw in aws))
+    
+    def run_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[AgentOutputDict]:
+        """
+        Synchronous wrapper around run_batch_async.
+        
+        Args:
+            items: Input data dictionaries
+            max_concurrency: Maximum number of items processed at once
+            
+        Returns:
+            Output dictionaries in input order
+        """
+        return self._run_sync(self.run_batch_async(items, max_concurrency))
+    
+    @staticmethod
+    def _run_sync(coro) -> Any:
+        """
+        Run a coroutine to completion from synchronous code.
+        
+        asyncio.run refuses to start inside a running event loop, so when
+        run() is called from async code the coroutine gets its own loop in
+        a helper thread instead.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            Coroutine result
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+    
     def _validate_input(self, data: Dict[str, Any], required_fields: List[str]) -> bool:
         """
         Validate input data has required fields.
@@ -211,13 +363,33 @@ class BaseAgent(ABC):
             raise ValueError(f"Missing required fields: {missing_fields}")
         return True
     
+    def _build_section_index(self, document: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Lowercase section titles once for repeated name lookups."""
+        return [
+            (section.get('title', '').lower(), section.get('content', ''))
+            for section in document.get('sections', [])
+        ]
+    
+    def _get_section_content(
+        self,
+        section_index: List[Tuple[str, str]],
+        names: List[str]
+    ) -> str:
+        """Get section content by matching names."""
+        pattern = _name_pattern(tuple(names))
+        return "\n\n".join(
+            content
+            for title_lower, content in section_index
+            if pattern.search(title_lower)
+        )
+    
     def _create_output(
         self,
         status: str,
         result: Dict[str, Any],
         errors: Optional[List[str]] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> AgentOutputDict:
         """
         Create standardized output dictionary.
         
@@ -230,14 +402,29 @@ class BaseAgent(ABC):
         Returns:
             Output dictionary
         """
-        return {
-            "agent_name": self.name,
-            "status": status,
-            "timestamp": datetime.now().isoformat(),
-            "result": result,
-            "errors": errors or [],
-            "metadata": metadata or {}
-        }
+        return AgentOutputDict(
+            agent_name=self.name,
+            status=status,
+            # Read the clock as an int and reuse the string formatted for
+            # the same millisecond
+            timestamp=format_timestamp(time.time_ns()),
+            result=result,
+            errors=errors or [],
+            metadata=metadata or {}
+        )
+    
+    def _get_setting(self, name: str, default: Any) -> Any:
+        """
+        Read a setting from the agent config.
+        
+        Args:
+            name: Config attribute name
+            default: Value used when no config (or attribute) is available
+            
+        Returns:
+            Setting value
+        """
+        return getattr(self.config, name, default)
     
     def _log_start(self, input_data: Dict[str, Any]) -> None:
         """Log agent start."""
@@ -254,11 +441,192 @@ class BaseAgent(ABC):
         if self.logger:
             self.logger.log_agent_error(self.name, error)
     
+    def _get_api_key(self) -> Optional[str]:
+        """
+        Get the configured Gemini API key.
+        
+        Returns:
+            API key, or None if not configured
+        """
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key or api_key == "your_api_key_here" or not api_key.strip():
+            return None
+        return api_key
+    
+    @property
+    def llm_enabled(self) -> bool:
+        """Whether LLM calls reach the model instead of returning placeholders."""
+        return self._get_api_key() is not None
+    
+    def _placeholder_response(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Return placeholder text when no API key is configured."""
+        if self.logger:
+            self.logger.info(
+                f"LLM call placeholder (no API key)",
+                agent=self.name,
+                prompt_length=len(prompt),
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        return f"[LLM Response Placeholder for {self.name} - Set GEMINI_API_KEY to enable AI]"
+    
+    def _get_model(self, api_key: str):
+        """
+        Create the Gemini model client.
+        
+        Args:
+            api_key: Gemini API key
+            
+        Returns:
+            GenerativeModel instance
+        """
+        import google.generativeai as genai
+        
+        genai.configure(api_key=api_key)
+        
+        # Get model name from config
+        from src.utils import Config
+        model_name = Config.GEMINI_MODEL_NAME
+        
+        # Configure safety settings to be more permissive for academic content
+        safety_settings = [
+            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+        ]
+        
+        return genai.GenerativeModel(
+            model_name,
+            safety_settings=safety_settings
+        )
+    
+    def _response_text(self, response, prompt: str) -> str:
+        """
+        Extract text from a Gemini response.
+        
+        Args:
+            response: Gemini response
+            prompt: Prompt that produced the response
+            
+        Returns:
+            Response text, or a marker if the response was blocked
+        """
+        # Check if response was blocked
+        if not response.candidates or not response.candidates[0].content.parts:
+            finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
+            if self.logger:
+                self.logger.warning(f"Response blocked or empty. Finish reason: {finish_reason}")
+            return f"[Response blocked by safety filters - finish_reason: {finish_reason}]"
+        
+        if self.logger:
+            self.logger.info(
+                f"LLM call successful",
+                agent=self.name,
+                prompt_length=len(prompt),
+                response_length=len(response.text)
+            )
+        
+        return response.text
+    
+    def _llm_error(self, error: Exception) -> str:
+        """Log an LLM failure and return an error marker."""
+        if isinstance(error, ImportError):
+            if self.logger:
+                self.logger.warning("google-generativeai not installed. Run: pip install google-generativeai")
+            return f"[LLM Error: google-generativeai not installed]"
+        if self.logger:
+            self.logger.error(f"LLM call failed: {error}")
+        return f"[LLM Error: {str(error)}]"
+    
+    def _get_prompt_cache(self):
+        """
+        Get the LLM response cache configured for this agent.
+        
+        Returns:
+            TieredCache, or None if caching is disabled
+        """
+        if not self._get_setting('LLM_CACHE_ENABLED', False):
+            return None
+        
+        from src.utils import get_prompt_cache
+        return get_prompt_cache(
+            self._get_setting('LLM_CACHE_PATH', None),
+            ttl=self._get_setting('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600),
+            max_entries=self._get_setting('LLM_CACHE_MAX_ENTRIES', 10000),
+            memory_entries=self._get_setting('LLM_CACHE_MEMORY_ENTRIES', 512)
+        )
+    
+    def _get_rate_limiter(self):
+        """
+        Get the client-side rate limiter for async LLM calls.
+        
+        Returns:
+            RateLimiter, or None if rate limiting is disabled
+        """
+        if not self._get_setting('LLM_RATE_LIMIT_ENABLED', False):
+            return None
+        
+        from src.utils import get_rate_limiter
+        return get_rate_limiter(
+            max_concurrency=self._get_setting('LLM_RATE_LIMIT_CONCURRENCY', 4),
+            tokens_per_minute=self._get_setting('LLM_TOKENS_PER_MINUTE', 0)
+        )
+    
+    def _cache_lookup(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_output: bool
+    ):
+        """
+        Look up a prompt in the LLM response cache.
+        
+        Only near-deterministic calls (temperature at or below
+        LLM_CACHE_MAX_TEMPERATURE) are cached.
+        
+        Args:
+            prompt: Prompt text
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_output: Whether a JSON response is requested
+            
+        Returns:
+            Tuple of (cache, key, cached response); cache is None when
+            the call is not cacheable
+        """
+        if temperature > self._get_setting('LLM_CACHE_MAX_TEMPERATURE', 0.3):
+            return None, None, None
+        cache = self._get_prompt_cache()
+        if cache is None:
+            return None, None, None
+        
+        cache_key = cache.make_key(
+            f"{self.name}:json" if json_output else self.name,
+            prompt,
+            temperature,
+            max_tokens,
+            model=self._get_setting('GEMINI_MODEL_NAME', '')
+        )
+        cached = cache.get(cache_key)
+        if cached is None:
+            self.stats['llm_cache_misses'] += 1
+        else:
+            self.stats['llm_cache_hits'] += 1
+        return cache, cache_key, cached
+    
     def _call_llm(
         self,
         prompt: str,
         temperature: float = 0.3,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        json_output: bool = False
     ) -> str:
         """
         Call LLM with prompt (placeholder for Gemini integration).
@@ -267,103 +635,246 @@ class BaseAgent(ABC):
             prompt: Prompt text
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            json_output: Ask the model to respond with JSON
             
         Returns:
             Generated text
         """
-        import os
-        
-        api_key = os.getenv("GEMINI_API_KEY")
+        api_key = self._get_api_key()
         
         # Check if API key is configured
-        if not api_key or api_key == "your_api_key_here" or not api_key.strip():
-            if self.logger:
-                self.logger.info(
-                    f"LLM call placeholder (no API key)",
-                    agent=self.name,
-                    prompt_length=len(prompt),
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                )
-            return f"[LLM Response Placeholder for {self.name} - Set GEMINI_API_KEY to enable AI]"
+        if api_key is None:
+            return self._placeholder_response(prompt, temperature, max_tokens)
+        
+        # Serve repeated prompts from the response cache
+        cache, cache_key, cached = self._cache_lookup(prompt, temperature, max_tokens, json_output)
+        if cached is not None:
+            return cached
         
         # Make real Gemini API call
         try:
-            import google.generativeai as genai
-            
-            genai.configure(api_key=api_key)
-            
-            # Get model name from config
-            from src.utils import Config
-            model_name = Config.GEMINI_MODEL_NAME
-            
-            # Configure safety settings to be more permissive for academic content
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            ]
-            
-            model = genai.GenerativeModel(
-                model_name,
-                safety_settings=safety_settings
-            )
+            model = self._get_model(api_key)
             
             generation_config = {
                 "temperature": temperature,
                 "max_output_tokens": max_tokens,
             }
+            if json_output:
+                generation_config["response_mime_type"] = "application/json"
             
             response = model.generate_content(
                 prompt,
                 generation_config=generation_config
             )
             
-            # Check if response was blocked
-            if not response.candidates or not response.candidates[0].content.parts:
-                finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
-                if self.logger:
-                    self.logger.warning(f"Response blocked or empty. Finish reason: {finish_reason}")
-                return f"[Response blocked by safety filters - finish_reason: {finish_reason}]"
+            text = self._response_text(response, prompt)
             
-            if self.logger:
-                self.logger.info(
-                    f"LLM call successful",
-                    agent=self.name,
-                    prompt_length=len(prompt),
-                    response_length=len(response.text)
-                )
+        except Exception as e:
+            return self._llm_error(e)
+        
+        # Blocked responses are reported with a bracketed marker; don't cache them
+        if cache is not None and not text.startswith("[Response blocked"):
+            cache.set(cache_key, text)
+        
+        return text
+    
+    async def _call_llm_async(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2048,
+        json_output: bool = False
+    ) -> str:
+        """
+        Call LLM with prompt without blocking the event loop.
+        
+        Args:
+            prompt: Prompt text
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_output: Ask the model to respond with JSON
             
-            return response.text
+        Returns:
+            Generated text
+        """
+        api_key = self._get_api_key()
+        
+        # Check if API key is configured
+        if api_key is None:
+            return self._placeholder_response(prompt, temperature, max_tokens)
+        
+        # Serve repeated prompts from the response cache
+        cache, cache_key, cached = self._cache_lookup(prompt, temperature, max_tokens, json_output)
+        if cached is not None:
+            return cached
+        
+        # Join an identical call already in flight instead of sending another
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, prompt, temperature, max_tokens, json_output)
+        task = _INFLIGHT.get(inflight_key)
+        if task is None:
+            task = loop.create_task(self._generate_async(
+                api_key, prompt, temperature, max_tokens, json_output, cache, cache_key
+            ))
+            _INFLIGHT[inflight_key] = task
+            task.add_done_callback(lambda _: _INFLIGHT.pop(inflight_key, None))
+        
+        # Shield so one caller's cancellation doesn't cancel the others
+        return await asyncio.shield(task)
+    
+    async def _generate_async(
+        self,
+        api_key: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_output: bool,
+        cache,
+        cache_key: Optional[str]
+    ) -> str:
+        """
+        Make the Gemini API call for _call_llm_async and cache the response.
+        
+        Args:
+            api_key: Gemini API key
+            prompt: Prompt text
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_output: Ask the model to respond with JSON
+            cache: Response cache, or None if the call is not cacheable
+            cache_key: Cache key for the call
+            
+        Returns:
+            Generated text
+        """
+        try:
+            model = self._get_model(api_key)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            if json_output:
+                generation_config["response_mime_type"] = "application/json"
+            
+            response = await self._generate_limited(model, prompt, generation_config)
+            
+            text = self._response_text(response, prompt)
             
-        except ImportError:
-            if self.logger:
-                self.logger.warning("google-generativeai not installed. Run: pip install google-generativeai")
-            return f"[LLM Error: google-generativeai not installed]"
         except Exception as e:
-            if self.logger:
-                self.logger.error(f"LLM call failed: {e}")
-            return f"[LLM Error: {str(e)}]"
+            return self._llm_error(e)
+        
+        # Blocked responses are reported with a bracketed marker; don't cache them
+        if cache is not None and not text.startswith("[Response blocked"):
+            cache.set(cache_key, text)
+        
+        return text
     
-    def _format_prompt(self, template: str, **kwargs) -> str:
+    async def _generate_limited(self, model, prompt: str, generation_config: Dict[str, Any]):
+        """
+        Send a generate request through the rate limiter.
+        
+        Rate-limit (429) errors open a jittered back-off window shared by
+        all callers and the request is retried up to MAX_RETRIES times.
+        
+        Args:
+            model: GenerativeModel instance
+            prompt: Prompt text
+            generation_config: Gemini generation settings
+            
+        Returns:
+            Gemini response
+        """
+        limiter = self._get_rate_limiter()
+        if limiter is None:
+            return await model.generate_content_async(
+                prompt,
+                generation_config=generation_config
+            )
+        
+        # Rough token estimate: ~4 characters per input token plus the output cap
+        tokens = len(prompt) // 4 + generation_config["max_output_tokens"]
+        max_retries = self._get_setting('MAX_RETRIES', 3)
+        attempt = 0
+        while True:
+            try:
+                async with limiter.reserve(tokens):
+                    response = await model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config
+                    )
+            except Exception as e:
+                if attempt >= max_retries or not _is_rate_limit_error(e):
+                    raise
+                attempt += 1
+                delay = limiter.register_429()
+                if self.logger:
+                    self.logger.warning(f"LLM rate limited, retrying in {delay:.1f}s")
+                continue
+            limiter.register_success()
+            return response
+    
+    @staticmethod
+    def _parse_json_object(response: str) -> Dict[str, Any]:
+        """
+        Parse the JSON object in an LLM response.
+        
+        Args:
+            response: Raw LLM response text (may wrap the JSON in a code fence)
+            
+        Returns:
+            Parsed object, or an empty dict if none could be parsed
+        """
+        match = _JSON_OBJECT_RE.search(response or '')
+        if not match:
+            return {}
+        try:
+            parsed = json.loads(match.group(0))
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    
+    def _format_prompt(self, template: Union[Template, str], **kwargs) -> str:
         """
         Format prompt template with variables.
         
         Args:
-            template: Prompt template string
+            template: Prompt Template, or a string using $-placeholders
+                (compiled once and reused)
             **kwargs: Variables to fill in template
             
         Returns:
             Formatted prompt
         """
-        return template.format(**kwargs)
+        if isinstance(template, str):
+            template = _compile_template(template)
+        return template.substitute(kwargs)
 
 
 # ============================================================================
 # Utility Functions
 # ============================================================================
 
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an API error is a rate-limit (HTTP 429) response."""
+    return (
+        getattr(error, 'code', None) == 429
+        or type(error).__name__ in ('ResourceExhausted', 'TooManyRequests')
+    )
+
+
+@lru_cache(maxsize=64)
+def _name_pattern(names: Tuple[str, ...]) -> "re.Pattern":
+    """Compile a substring alternation over section names once."""
+    return re.compile('|'.join(map(re.escape, names)))
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Template:
+    """Compile a prompt template string once."""
+    return Template(template)
+
+
 def create_agent_input(
     agent_type: str,
     session_id: str,
@@ -394,7 +905,7 @@ def create_agent_input(
     return input_class(session_id=session_id, **kwargs)
 
 
-def validate_agent_output(output: Dict[str, Any]) -> bool:
+def validate_agent_output(output: AgentOutputDict) -> bool:
     """
     Validate agent output has required fields.
     
@@ -6,15 +6,142 @@ assumptions, limitations, biases, and reproducibility assessment.
 """
 
 import time
-from typing import Dict, Any, List
+from string import Template
+from typing import Dict, Any, List, Tuple
 
 from src.agents.base_agent import BaseAgent
 from src.utils import get_logger
 
 
+# Static instruction prefixes. Prompts put these first and the
+# paper-specific fields last, so identical prefixes are shared across
+# papers by prefix-caching LLM servers.
+_ASSUMPTIONS_INSTRUCTIONS = """
+Identify key assumptions (both explicit and implicit) in this research.
+
+List 4-6 major assumptions, including:
+- Data assumptions
+- Theoretical assumptions
+- Methodological assumptions
+- Simplifying assumptions
+"""
+
+_LIMITATIONS_INSTRUCTIONS = """
+Identify key limitations of this research.
+
+List 4-6 important limitations, including:
+- Methodological limitations
+- Data limitations
+- Scope limitations
+- Practical limitations
+"""
+
+_BIASES_INSTRUCTIONS = """
+Identify potential biases in this research.
+
+Consider:
+- Selection bias
+- Confirmation bias
+- Publication bias
+- Dataset bias
+- Algorithmic bias
+- Reporting bias
+
+List 3-5 potential biases with brief explanations.
+"""
+
+_GENERALIZABILITY_INSTRUCTIONS = """
+Assess the generalizability of findings in this research.
+
+Consider:
+- Range of datasets/domains tested
+- Diversity of experimental conditions
+- Scope of claims vs. evidence
+
+Provide a brief assessment (3-4 sentences).
+"""
+
+# All four qualitative checks share one prompt (and one copy of the paper
+# context), answered as a single JSON object
+_CRITIQUE_TEMPLATE = Template(
+    "Critically analyze this research. Answer each task below.\n"
+    "\nTask 1 (assumptions):" + _ASSUMPTIONS_INSTRUCTIONS +
+    "\nTask 2 (limitations):" + _LIMITATIONS_INSTRUCTIONS +
+    "\nTask 3 (biases):" + _BIASES_INSTRUCTIONS +
+    "\nTask 4 (generalizability):" + _GENERALIZABILITY_INSTRUCTIONS + """
+Respond with a JSON object with keys "assumptions", "limitations" and
+"biases" (lists of strings) and "generalizability" (a string).
+
+Title: $title
+Abstract: $abstract
+Methodology: $method_section
+Discussion/Limitations: $limitations_section
+""")
+
+# Reproducibility keywords mapped to the indicator they satisfy
+_REPRO_KEYWORDS = {
+    'github': 'code_available',
+    'code available': 'code_available',
+    'open source': 'code_available',
+    'dataset available': 'data_available',
+    'data available': 'data_available',
+    'hyperparameter': 'hyperparameters_specified',
+    'learning rate': 'hyperparameters_specified',
+    'random seed': 'random_seed_mentioned',
+    'reproducibility': 'random_seed_mentioned'
+}
+
+# Reproducibility feature weights (points out of 10)
+_REPRO_WEIGHTS = {
+    'code_available': 2.0,
+    'data_available': 2.0,
+    'detailed_methodology': 2.0,
+    'hyperparameters_specified': 2.0,
+    'random_seed_mentioned': 2.0
+}
+
+
+def _string_list(value: Any) -> List[str]:
+    """Normalize an LLM JSON field to a list of non-empty strings."""
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def _score_reproducibility(features: Dict[str, float]) -> float:
+    """
+    Score reproducibility features on a 0-10 scale.
+    
+    Pure function of the feature values so new features only need a
+    weight here and an extractor in CritiqueAgent.
+    
+    Args:
+        features: Feature values keyed by _REPRO_WEIGHTS names
+        
+    Returns:
+        Reproducibility score (0-10)
+    """
+    score = sum(weight * features.get(name, 0.0) for name, weight in _REPRO_WEIGHTS.items())
+    return round(min(score, 10.0), 1)
+
+
+# Ethics keywords mapped to the concern they raise (in report order)
+_ETHICAL_MAP = {
+    'privacy': "Privacy considerations regarding data collection and usage",
+    'personal data': "Privacy considerations regarding data collection and usage",
+    'bias': "Potential fairness and bias implications of the approach",
+    'fairness': "Potential fairness and bias implications of the approach",
+    'human subject': "Human subjects research with appropriate ethical oversight",
+    'irb': "Human subjects research with appropriate ethical oversight"
+}
+_ETHICAL_CONCERNS = list(dict.fromkeys(_ETHICAL_MAP.values()))
+
+
 class CritiqueAgent(BaseAgent):
     """Performs critical analysis of research papers."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize CritiqueAgent.
@@ -32,6 +159,18 @@ class CritiqueAgent(BaseAgent):
         """
         Perform critical analysis of the paper.
         
+        Args:
+            data: Must contain 'document' and 'full_text'
+            
+        Returns:
+            Dictionary with assumptions, limitations, biases, reproducibility_score
+        """
+        return self._run_sync(self.arun(data))
+    
+    async def arun(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Perform critical analysis with the LLM-backed checks run concurrently.
+        
         Args:
             data: Must contain 'document' and 'full_text'
             
@@ -48,14 +187,51 @@ class CritiqueAgent(BaseAgent):
             document = data['document']
             full_text = data.get('full_text', document.get('full_text', ''))
             
+            # Skip analysis of documents that failed to parse upstream
+            text_len = len(full_text) + sum(
+                len(section.get('content', ''))
+                for section in document.get('sections', [])
+            )
+            if text_len < self._get_setting('MIN_TEXT_LEN', 500):
+                if self.logger:
+                    self.logger.warning(f"Skipping critique: only {text_len} characters of text")
+                return self._create_output(
+                    status="partial",
+                    result={},
+                    errors=["Insufficient document text"]
+                )
+            # Case-fold once; keyword checks are substring searches on it
+            full_text_lower = full_text.lower()
+            section_index = self._build_section_index(document)
+            
+            # Slice prompt context once and share it across the checks
+            title = document.get('title', '')
+            abstract = document.get('abstract', '')[:500]
+            method_section = self._get_section_content(
+                section_index,
+                ['method', 'approach']
+            )[:2000]
+            limitations_section = self._get_section_content(
+                section_index,
+                ['limitation', 'discussion', 'conclusion']
+            )[:2000]
+            
+            # One structured LLM call answers all qualitative checks
+            llm_critique = await self._run_llm_critique(
+                title,
+                abstract,
+                method_section,
+                limitations_section
+            )
+            
             # Perform critical analysis
             critique = {
-                'assumptions': self._identify_assumptions(document, full_text),
-                'limitations': self._identify_limitations(document, full_text),
-                'biases': self._identify_biases(document, full_text),
-                'reproducibility_score': self._assess_reproducibility(document, full_text),
-                'generalizability': self._assess_generalizability(document, full_text),
-                'ethical_considerations': self._identify_ethical_issues(document, full_text)
+                'assumptions': self._identify_assumptions(llm_critique),
+                'limitations': self._identify_limitations(llm_critique),
+                'biases': self._identify_biases(llm_critique),
+                'reproducibility_score': self._assess_reproducibility(document, full_text_lower, section_index),
+                'generalizability': self._assess_generalizability(llm_critique),
+                'ethical_considerations': self._identify_ethical_issues(document, full_text_lower)
             }
             
             # Create output
@@ -80,39 +256,56 @@ class CritiqueAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _identify_assumptions(
+    async def _run_llm_critique(
         self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> List[str]:
+        title: str,
+        abstract: str,
+        method_section: str,
+        limitations_section: str
+    ) -> Dict[str, Any]:
         """
-        Identify explicit and implicit assumptions.
+        Run the combined assumptions/limitations/biases/generalizability prompt.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            title: Paper title
+            abstract: Abstract, truncated for the prompt
+            method_section: Methodology text, truncated for the prompt
+            limitations_section: Discussion/limitations text, truncated for the prompt
             
         Returns:
-            List of assumptions
+            Parsed JSON response (empty if the response was not valid JSON)
         """
-        method_section = self._get_section_content(document, ['method', 'approach'])
+        prompt = self._format_prompt(
+            _CRITIQUE_TEMPLATE,
+            title=title,
+            abstract=abstract,
+            method_section=method_section,
+            limitations_section=limitations_section
+        )
         
-        prompt = f"""
-Identify key assumptions (both explicit and implicit) in this research:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')[:500]}
-Methodology: {method_section[:2000]}
-
-List 4-6 major assumptions, including:
-- Data assumptions
-- Theoretical assumptions
-- Methodological assumptions
-- Simplifying assumptions
-"""
+        # Structured output: a low temperature keeps the JSON well-formed and
+        # lets the response cache (LLM_CACHE_MAX_TEMPERATURE) serve repeats
+        llm_response = await self._call_llm_async(
+            prompt,
+            temperature=0.3,
+            max_tokens=2000,
+            json_output=True
+        )
+        return self._parse_json_object(llm_response)
+    
+    def _identify_assumptions(self, llm_critique: Dict[str, Any]) -> List[str]:
+        """
+        Identify explicit and implicit assumptions.
         
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.7, max_tokens=600)
+        Args:
+            llm_critique: Parsed combined critique response
+            
+        Returns:
+            List of assumptions
+        """
+        assumptions = _string_list(llm_critique.get('assumptions'))
+        if assumptions:
+            return assumptions
         
         # Placeholder response
         return [
@@ -123,43 +316,19 @@ List 4-6 major assumptions, including:
             "External validity is assumed to hold across different domains"
         ]
     
-    def _identify_limitations(
-        self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> List[str]:
+    def _identify_limitations(self, llm_critique: Dict[str, Any]) -> List[str]:
         """
         Identify research limitations.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            llm_critique: Parsed combined critique response
             
         Returns:
             List of limitations
         """
-        # Check if paper explicitly discusses limitations
-        limitations_section = self._get_section_content(
-            document,
-            ['limitation', 'discussion', 'conclusion']
-        )
-        
-        prompt = f"""
-Identify key limitations of this research:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')[:500]}
-Discussion/Limitations: {limitations_section[:2000]}
-
-List 4-6 important limitations, including:
-- Methodological limitations
-- Data limitations
-- Scope limitations
-- Practical limitations
-"""
-        
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.7, max_tokens=600)
+        limitations = _string_list(llm_critique.get('limitations'))
+        if limitations:
+            return limitations
         
         # Placeholder response
         return [
@@ -170,40 +339,19 @@ List 4-6 important limitations, including:
             "Long-term effects and stability have not been thoroughly investigated"
         ]
     
-    def _identify_biases(
-        self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> List[str]:
+    def _identify_biases(self, llm_critique: Dict[str, Any]) -> List[str]:
         """
         Identify potential biases in the research.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            llm_critique: Parsed combined critique response
             
         Returns:
             List of potential biases
         """
-        prompt = f"""
-Identify potential biases in this research:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')[:500]}
-
-Consider:
-- Selection bias
-- Confirmation bias
-- Publication bias
-- Dataset bias
-- Algorithmic bias
-- Reporting bias
-
-List 3-5 potential biases with brief explanations.
-"""
-        
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.7, max_tokens=500)
+        biases = _string_list(llm_critique.get('biases'))
+        if biases:
+            return biases
         
         # Placeholder response
         return [
@@ -215,86 +363,66 @@ List 3-5 potential biases with brief explanations.
     def _assess_reproducibility(
         self,
         document: Dict[str, Any],
-        full_text: str
+        full_text_lower: str,
+        section_index: List[Tuple[str, str]]
     ) -> float:
         """
         Assess reproducibility of the research (0-10 scale).
         
         Args:
             document: Document dictionary
-            full_text: Full paper text
+            full_text_lower: Lowercased full paper text
+            section_index: (lowercased title, content) pairs
             
         Returns:
             Reproducibility score (0-10)
         """
-        # Check for reproducibility indicators
-        indicators = {
-            'code_available': False,
-            'data_available': False,
-            'detailed_methodology': False,
-            'hyperparameters_specified': False,
-            'random_seed_mentioned': False
-        }
-        
-        full_text_lower = full_text.lower()
+        features = self._reproducibility_features(full_text_lower, section_index)
+        return _score_reproducibility(features)
+    
+    def _reproducibility_features(
+        self,
+        full_text_lower: str,
+        section_index: List[Tuple[str, str]]
+    ) -> Dict[str, float]:
+        """
+        Extract reproducibility indicators as numeric features.
         
-        # Check for code availability
-        if 'github' in full_text_lower or 'code available' in full_text_lower or 'open source' in full_text_lower:
-            indicators['code_available'] = True
+        Args:
+            full_text_lower: Lowercased full paper text
+            section_index: (lowercased title, content) pairs
+            
+        Returns:
+            Feature values keyed by name (see _REPRO_WEIGHTS)
+        """
+        features = dict.fromkeys(_REPRO_WEIGHTS, 0.0)
         
-        # Check for data availability
-        if 'dataset available' in full_text_lower or 'data available' in full_text_lower:
-            indicators['data_available'] = True
+        # Check code/data availability, hyperparameters and random seed,
+        # skipping keywords whose indicator is already set
+        for keyword, bucket in _REPRO_KEYWORDS.items():
+            if not features[bucket] and keyword in full_text_lower:
+                features[bucket] = 1.0
         
         # Check for detailed methodology
-        method_section = self._get_section_content(document, ['method', 'experiment'])
+        method_section = self._get_section_content(section_index, ['method', 'experiment'])
         if len(method_section) > 1000:
-            indicators['detailed_methodology'] = True
-        
-        # Check for hyperparameters
-        if 'hyperparameter' in full_text_lower or 'learning rate' in full_text_lower:
-            indicators['hyperparameters_specified'] = True
-        
-        # Check for random seed
-        if 'random seed' in full_text_lower or 'reproducibility' in full_text_lower:
-            indicators['random_seed_mentioned'] = True
-        
-        # Calculate score (2 points each)
-        score = sum(2.0 for v in indicators.values() if v)
+            features['detailed_methodology'] = 1.0
         
-        return round(score, 1)
+        return features
     
-    def _assess_generalizability(
-        self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> str:
+    def _assess_generalizability(self, llm_critique: Dict[str, Any]) -> str:
         """
         Assess generalizability of findings.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            llm_critique: Parsed combined critique response
             
         Returns:
             Generalizability assessment
         """
-        prompt = f"""
-Assess the generalizability of findings in this research:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')[:500]}
-
-Consider:
-- Range of datasets/domains tested
-- Diversity of experimental conditions
-- Scope of claims vs. evidence
-
-Provide a brief assessment (3-4 sentences).
-"""
-        
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.7, max_tokens=300)
+        generalizability = llm_critique.get('generalizability')
+        if isinstance(generalizability, str) and generalizability.strip():
+            return generalizability.strip()
         
         # Placeholder response
         return "The findings appear to be reasonably generalizable within the specific domain studied. However, broader generalization to other domains would require additional validation. The scope of experimental evaluation provides moderate confidence in the robustness of results."
@@ -302,44 +430,28 @@ Provide a brief assessment (3-4 sentences).
     def _identify_ethical_issues(
         self,
         document: Dict[str, Any],
-        full_text: str
+        full_text_lower: str
     ) -> List[str]:
         """
         Identify potential ethical considerations.
         
         Args:
             document: Document dictionary
-            full_text: Full paper text
+            full_text_lower: Lowercased full paper text
             
         Returns:
             List of ethical considerations
         """
-        # Check for common ethical keywords
-        full_text_lower = full_text.lower()
-        ethical_concerns = []
-        
-        if 'privacy' in full_text_lower or 'personal data' in full_text_lower:
-            ethical_concerns.append("Privacy considerations regarding data collection and usage")
+        # Check for common ethical keywords (substring match, so
+        # "biased"/"subjects" count), skipping concerns already found
+        found = set()
+        for keyword, concern in _ETHICAL_MAP.items():
+            if concern not in found and keyword in full_text_lower:
+                found.add(concern)
         
-        if 'bias' in full_text_lower or 'fairness' in full_text_lower:
-            ethical_concerns.append("Potential fairness and bias implications of the approach")
-        
-        if 'human subject' in full_text_lower or 'irb' in full_text_lower:
-            ethical_concerns.append("Human subjects research with appropriate ethical oversight")
+        ethical_concerns = [concern for concern in _ETHICAL_CONCERNS if concern in found]
         
         if not ethical_concerns:
             ethical_concerns.append("No major ethical concerns explicitly identified in the paper")
         
         return ethical_concerns
-    
-    def _get_section_content(self, document: Dict[str, Any], names: List[str]) -> str:
-        """Get section content by matching names."""
-        sections = document.get('sections', [])
-        matching_texts = []
-        
-        for section in sections:
-            title_lower = section.get('title', '').lower()
-            if any(name in title_lower for name in names):
-                matching_texts.append(section.get('content', ''))
-        
-        return "\n\n".join(matching_texts)
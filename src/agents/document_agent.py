@@ -5,18 +5,117 @@ Extracts structured content from research paper PDFs including
 title, authors, abstract, sections, equations, and metadata.
 """
 
+import os
 import time
-from typing import Dict, Any, List
+import atexit
+import pickle
+import threading
+import multiprocessing
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 
 from src.agents.base_agent import BaseAgent
-from src.tools import parse_pdf, clean_text
-from src.utils import get_logger
+from src.tools import parse_pdf_streaming, clean_text, Section
+from src.utils import get_logger, file_sha256
+
+# Bump when parsing or cleaning changes so cached documents are rebuilt
+_CACHE_VERSION = "2"
+
+# Process pool for cleaning large documents, shared by every agent in the
+# process and created on first use
+_clean_pool: Optional[ProcessPoolExecutor] = None
+_clean_pool_lock = threading.Lock()
+
+
+def _get_clean_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for cleaning large documents.
+    
+    Args:
+        max_workers: Worker count, used when the pool is created
+        
+    Returns:
+        Process pool (shut down at interpreter exit)
+    """
+    global _clean_pool
+    with _clean_pool_lock:
+        if _clean_pool is None:
+            # Spawned workers don't inherit this process's threads and locks
+            _clean_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_clean_pool.shutdown)
+        return _clean_pool
+
+
+def _clean_section_worker(content: str) -> str:
+    """Clean one section's content (module-level so it can be pickled)."""
+    return clean_text(
+        content,
+        remove_latex=False,
+        normalize_unicode=True,
+        normalize_whitespace=True
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class CleanedSection:
+    """A cleaned paper section."""
+    title: str
+    content: str
+    start_page: int
+    end_page: int
+    level: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert section to dictionary."""
+        return {
+            'title': self.title,
+            'content': self.content,
+            'start_page': self.start_page,
+            'end_page': self.end_page,
+            'level': self.level
+        }
+
+
+@dataclass(slots=True)
+class CleanedDocument:
+    """Cleaned document passed between extraction steps."""
+    title: str
+    authors: List[str]
+    abstract: str
+    sections: List[CleanedSection]
+    equations: List[str]
+    figures: List[str]
+    tables: List[str]
+    references: List[str]
+    full_text: str
+    metadata: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert document to the dictionary passed to downstream agents."""
+        return {
+            'title': self.title,
+            'authors': self.authors,
+            'abstract': self.abstract,
+            'sections': [section.to_dict() for section in self.sections],
+            'equations': self.equations,
+            'figures': self.figures,
+            'tables': self.tables,
+            'references': self.references,
+            'full_text': self.full_text,
+            'metadata': self.metadata
+        }
 
 
 class DocumentExtractorAgent(BaseAgent):
     """Extracts and structures content from research papers."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize DocumentExtractorAgent.
@@ -30,12 +129,17 @@ class DocumentExtractorAgent(BaseAgent):
         if logger is None:
             self.logger = get_logger("DocumentExtractorAgent")
     
+    def _get_clean_pool(self) -> ProcessPoolExecutor:
+        """Get the process pool used for cleaning large documents."""
+        return _get_clean_pool(self._get_setting('CLEAN_WORKERS', 4))
+    
     def run(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract content from PDF.
         
         Args:
-            data: Must contain 'file_path' key
+            data: Must contain 'file_path' key; may contain 'content_hash',
+                the SHA-256 of the file if the caller already computed it
             
         Returns:
             Dictionary with extracted document structure
@@ -51,30 +155,46 @@ class DocumentExtractorAgent(BaseAgent):
             extract_images = data.get('extract_images', False)
             extract_tables = data.get('extract_tables', True)
             
-            # Parse PDF
-            self.logger.info(f"Parsing PDF: {file_path}")
-            document = parse_pdf(
+            # Reuse a previous extraction of the same file content
+            cache_path = self._cache_path(
                 file_path,
-                extract_images=extract_images,
-                extract_tables=extract_tables
+                extract_images,
+                extract_tables,
+                data.get('content_hash')
             )
+            cleaned_doc = self._load_cached(cache_path)
             
-            # Clean and structure content
-            cleaned_doc = self._clean_document(document)
+            if cleaned_doc is None:
+                # Parse PDF, cleaning each section as it is extracted
+                self.logger.info(f"Parsing PDF: {file_path}")
+                document = self._parse_and_clean_sections(
+                    file_path,
+                    extract_images=extract_images,
+                    extract_tables=extract_tables
+                )
+                
+                # Clean and structure content
+                cleaned_doc = self._clean_document(document)
+                
+                # Cache before enhancement: LLM metadata depends on the API
+                # key and is served by the LLM response cache instead
+                self._store_cached(cache_path, cleaned_doc)
+            else:
+                self.logger.info(f"Using cached extraction for: {file_path}")
             
             # Enhance with LLM analysis (placeholder)
             enhanced_doc = self._enhance_metadata(cleaned_doc)
             
-            # Create output
-            result = enhanced_doc
+            # Create output (converted to a dictionary once, at the agent boundary)
+            result = enhanced_doc.to_dict()
             output = self._create_output(
                 status="success",
                 result=result,
                 metadata={
                     "file_path": file_path,
-                    "num_pages": document.metadata.get('num_pages', 0),
-                    "num_sections": len(document.sections),
-                    "num_equations": len(document.equations)
+                    "num_pages": enhanced_doc.metadata.get('num_pages', 0),
+                    "num_sections": len(enhanced_doc.sections),
+                    "num_equations": len(enhanced_doc.equations)
                 }
             )
             
@@ -91,69 +211,170 @@ class DocumentExtractorAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _clean_document(self, document) -> Dict[str, Any]:
+    def _cache_path(
+        self,
+        file_path: str,
+        extract_images: bool,
+        extract_tables: bool,
+        content_hash: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Get the cache file for a PDF's extracted document.
+        
+        Args:
+            file_path: Path to PDF file
+            extract_images: Whether image metadata is extracted
+            extract_tables: Whether table information is extracted
+            content_hash: SHA-256 of the file (computed here if not given)
+            
+        Returns:
+            Cache file path, or None if caching is disabled
+        """
+        cache_dir = self._get_setting('CACHE_DIR', None)
+        if cache_dir is None or not self._get_setting('DOCUMENT_CACHE_ENABLED', False):
+            return None
+        
+        if content_hash is None:
+            content_hash = file_sha256(file_path)
+        
+        # Named by content hash so entries match upload and session digests
+        options = f"{int(extract_images)}{int(extract_tables)}"
+        return Path(cache_dir) / "documents" / f"{content_hash}.v{_CACHE_VERSION}.{options}.pkl"
+    
+    def _load_cached(self, cache_path: Optional[Path]) -> Optional[CleanedDocument]:
+        """Load a cached document, or None on a miss or unreadable entry."""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable document cache {cache_path}: {e}")
+            return None
+    
+    def _store_cached(self, cache_path: Optional[Path], document: CleanedDocument) -> None:
+        """Write a document to the cache (atomically, via a temp file)."""
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to write document cache {cache_path}: {e}")
+    
+    def _parse_and_clean_sections(
+        self,
+        file_path: str,
+        extract_images: bool = False,
+        extract_tables: bool = True
+    ):
+        """
+        Parse a PDF, cleaning section text as each section is extracted.
+        
+        Sections are cleaned inline until the running total of section text
+        passes PARALLEL_CLEAN_MIN_CHARS; later sections are submitted to the
+        process pool so cleaning overlaps with the rest of parsing.
+        
+        Args:
+            file_path: Path to PDF file
+            extract_images: Whether to extract image metadata
+            extract_tables: Whether to extract table information
+            
+        Returns:
+            Document object with cleaned sections
+        """
+        threshold = self._get_setting('PARALLEL_CLEAN_MIN_CHARS', 200_000)
+        seen_chars = 0
+        pending = []
+        
+        def on_section(section: Section) -> Section:
+            nonlocal seen_chars
+            seen_chars += len(section.content)
+            if seen_chars >= threshold:
+                future = self._get_clean_pool().submit(_clean_section_worker, section.content)
+                pending.append((section, future))
+            else:
+                section.content = _clean_section_worker(section.content)
+            return section
+        
+        document = parse_pdf_streaming(
+            file_path,
+            on_section,
+            extract_images=extract_images,
+            extract_tables=extract_tables
+        )
+        
+        for section, future in pending:
+            section.content = future.result()
+        
+        return document
+    
+    def _clean_document(self, document) -> CleanedDocument:
         """
         Clean and structure document content.
         
         Args:
-            document: Document object from parser
+            document: Document object from parser (sections already cleaned)
             
         Returns:
-            Cleaned document dictionary
+            Cleaned document
         """
-        # Clean full text
-        cleaned_full_text = clean_text(
-            document.full_text,
+        full_text_options = dict(
             remove_latex=False,  # Keep LaTeX for equations
             normalize_unicode=True,
             normalize_whitespace=True,
             fix_line_breaks=True
         )
-        
-        # Clean abstract
-        cleaned_abstract = clean_text(
-            document.abstract,
+        abstract_options = dict(
             remove_latex=True,
             normalize_unicode=True,
             normalize_whitespace=True
         )
+        # Large documents: clean full text and abstract concurrently across
+        # processes; small ones aren't worth the pickling overhead
+        if len(document.full_text) >= self._get_setting('PARALLEL_CLEAN_MIN_CHARS', 200_000):
+            pool = self._get_clean_pool()
+            full_text_future = pool.submit(clean_text, document.full_text, **full_text_options)
+            cleaned_abstract = clean_text(document.abstract, **abstract_options)
+            cleaned_full_text = full_text_future.result()
+        else:
+            cleaned_full_text = clean_text(document.full_text, **full_text_options)
+            cleaned_abstract = clean_text(document.abstract, **abstract_options)
         
-        # Clean sections
-        cleaned_sections = []
-        for section in document.sections:
-            cleaned_content = clean_text(
+        # Sections were cleaned during parsing
+        cleaned_sections = [
+            CleanedSection(
+                section.title,
                 section.content,
-                remove_latex=False,
-                normalize_unicode=True,
-                normalize_whitespace=True
+                section.start_page,
+                section.end_page,
+                section.level
             )
-            cleaned_sections.append({
-                'title': section.title,
-                'content': cleaned_content,
-                'start_page': section.start_page,
-                'end_page': section.end_page,
-                'level': section.level
-            })
+            for section in document.sections
+        ]
         
-        return {
-            'title': document.title,
-            'authors': document.authors,
-            'abstract': cleaned_abstract,
-            'sections': cleaned_sections,
-            'equations': document.equations,
-            'figures': document.figures,
-            'tables': document.tables,
-            'references': document.references,
-            'full_text': cleaned_full_text,
-            'metadata': document.metadata
-        }
+        return CleanedDocument(
+            title=document.title,
+            authors=document.authors,
+            abstract=cleaned_abstract,
+            sections=cleaned_sections,
+            equations=document.equations,
+            figures=document.figures,
+            tables=document.tables,
+            references=document.references,
+            full_text=cleaned_full_text,
+            metadata=document.metadata
+        )
     
-    def _enhance_metadata(self, document: Dict[str, Any]) -> Dict[str, Any]:
+    def _enhance_metadata(self, document: CleanedDocument) -> CleanedDocument:
         """
         Enhance document metadata using LLM.
         
         Args:
-            document: Document dictionary
+            document: Cleaned document
             
         Returns:
             Enhanced document
@@ -164,11 +385,16 @@ class DocumentExtractorAgent(BaseAgent):
         # - Paper type (theoretical, empirical, survey)
         # - Year, venue from text if not in metadata
         
+        # Too little text (e.g. a failed parse) for a useful LLM answer
+        if len(document.full_text) < self._get_setting('MIN_TEXT_LEN', 500):
+            document.metadata['extracted_at'] = time.time()
+            return document
+        
         prompt = f"""
 Analyze this research paper and extract metadata:
 
-Title: {document['title']}
-Abstract: {document['abstract'][:500]}
+Title: {document.title}
+Abstract: {document.abstract[:500]}
 
 Extract:
 1. Research field/domain
@@ -176,15 +402,34 @@ Extract:
 3. Key contributions (1-2 sentences)
 4. Main research question
 
-Format as JSON.
+Format as JSON with keys: research_field, paper_type, key_contributions, research_question.
 """
         
-        # Placeholder: In production, call Gemini here
-        llm_response = self._call_llm(prompt, temperature=0.1, max_tokens=500)
+        llm_response = self._call_llm(prompt, temperature=0.1, max_tokens=500, json_output=True)
         
-        # For now, add basic enhancements
-        document['metadata']['research_field'] = "Computer Science"  # Placeholder
-        document['metadata']['paper_type'] = "empirical"  # Placeholder
-        document['metadata']['extracted_at'] = time.time()
+        # Keep values the source already supplied; fill the rest from the response
+        for key, value in self._parse_metadata_response(llm_response).items():
+            document.metadata.setdefault(key, value)
+        
+        # Fall back to basic defaults when the response could not be parsed
+        document.metadata.setdefault('research_field', "Computer Science")  # Placeholder
+        document.metadata.setdefault('paper_type', "empirical")  # Placeholder
+        document.metadata['extracted_at'] = time.time()
         
         return document
+    
+    def _parse_metadata_response(self, response: str) -> Dict[str, Any]:
+        """
+        Parse the JSON object in an LLM metadata response.
+        
+        Args:
+            response: Raw LLM response text
+            
+        Returns:
+            Metadata fields with non-empty values (empty if unparseable)
+        """
+        return {
+            key.strip().lower().replace(' ', '_'): value
+            for key, value in self._parse_json_object(response).items()
+            if isinstance(key, str) and value
+        }
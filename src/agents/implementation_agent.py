@@ -5,6 +5,7 @@ Provides implementation guidance including pseudo-code generation,
 complexity analysis, and practical recommendations.
 """
 
+import re
 import time
 from typing import Dict, Any, List
 
@@ -13,9 +14,84 @@ from src.utils import get_logger
 from src.tools import CodeExecutor
 
 
+# Static instruction prefixes. Prompts put these first and the
+# paper-specific fields last, so identical prefixes are shared across
+# papers by prefix-caching LLM servers.
+_PSEUDOCODE_INSTRUCTIONS = """
+Generate pseudo-code for the main algorithms described in this research.
+
+Create 2-3 pseudo-code blocks for the core algorithms.
+Use clear, language-agnostic pseudo-code with proper indentation.
+Start each block with a line of the form "### <block title>".
+"""
+
+_COMPLEXITY_INSTRUCTIONS = """
+Analyze the computational complexity of the algorithms.
+
+Provide:
+1. Time complexity (Big-O notation)
+2. Space complexity (Big-O notation)
+3. Dominant operations
+4. Scalability considerations
+"""
+
+_RECOMMENDATIONS_INSTRUCTIONS = """
+Provide practical implementation recommendations for this algorithm.
+
+Suggest:
+1. Best practices for implementation
+2. Common pitfalls to avoid
+3. Optimization strategies
+4. Library/framework recommendations
+5. Testing approaches
+"""
+
+# Keywords and structure marks expected in well-formed pseudo-code
+_PSEUDO_KEYWORD_RE = re.compile(r'input|output|for|while|if|return|algorithm', re.IGNORECASE)
+_PSEUDO_STRUCTURE_RE = re.compile(r'[:=]')
+
+# Notes appended to every implementation guide
+_GENERAL_NOTES = (
+    "**Dependencies**: Ensure all required libraries are installed with compatible versions",
+    "**Hardware Requirements**: Consider GPU acceleration for large-scale experiments",
+    "**Reproducibility**: Set random seeds and document all hyperparameters"
+)
+
+
+def _parse_pseudocode_blocks(text: str) -> List[Dict[str, str]]:
+    """
+    Parse "### <title>" pseudo-code blocks from LLM text.
+    
+    Text before the first header and code fence lines are ignored.
+    
+    Args:
+        text: Response text
+        
+    Returns:
+        Pseudo-code block dictionaries (title, code, language)
+    """
+    blocks = []
+    title = None
+    lines: List[str] = []
+    
+    for line in text.split('\n'):
+        if line.startswith('### '):
+            if title is not None:
+                blocks.append({'title': title, 'code': '\n'.join(lines).strip('\n'), 'language': 'pseudocode'})
+            title, lines = line[4:].strip(), []
+        elif title is not None and not line.startswith('```'):
+            lines.append(line)
+    
+    if title is not None:
+        blocks.append({'title': title, 'code': '\n'.join(lines).strip('\n'), 'language': 'pseudocode'})
+    return blocks
+
+
 class ImplementationAgent(BaseAgent):
     """Generates implementation guidance and pseudo-code."""
     
+    __slots__ = ('code_executor',)
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize ImplementationAgent.
@@ -35,6 +111,18 @@ class ImplementationAgent(BaseAgent):
         """
         Generate implementation guidance.
         
+        Args:
+            data: Must contain 'methodology' and 'algorithms_text'
+            
+        Returns:
+            Dictionary with pseudocode, complexity, recommendations
+        """
+        return self._run_sync(self.arun(data))
+    
+    async def arun(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate implementation guidance with the LLM calls run concurrently.
+        
         Args:
             data: Must contain 'methodology' and 'algorithms_text'
             
@@ -50,11 +138,19 @@ class ImplementationAgent(BaseAgent):
             algorithms_text = data.get('algorithms_text', '')
             document = data.get('document', {})
             
-            # Generate implementation components
+            # Truncate the prompt input once for the shorter prompts
+            algorithms_short = algorithms_text[:1500]
+            
+            # Generate implementation components (independent LLM calls)
+            pseudocode, complexity, recommendations = await self._gather_limited(
+                self._generate_pseudocode(methodology, algorithms_text[:2000]),
+                self._analyze_complexity(methodology, algorithms_short),
+                self._generate_recommendations(methodology, algorithms_short)
+            )
             implementation = {
-                'pseudocode': self._generate_pseudocode(methodology, algorithms_text),
-                'complexity': self._analyze_complexity(methodology, algorithms_text),
-                'recommendations': self._generate_recommendations(methodology, algorithms_text),
+                'pseudocode': pseudocode,
+                'complexity': complexity,
+                'recommendations': recommendations,
                 'implementation_notes': self._generate_implementation_notes(methodology)
             }
             
@@ -80,7 +176,7 @@ class ImplementationAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _generate_pseudocode(
+    async def _generate_pseudocode(
         self,
         methodology: Dict[str, Any],
         algorithms_text: str
@@ -90,27 +186,18 @@ class ImplementationAgent(BaseAgent):
         
         Args:
             methodology: Methodology dictionary
-            algorithms_text: Text describing algorithms
+            algorithms_text: Text describing algorithms, truncated for the prompt
             
         Returns:
             List of pseudo-code blocks
         """
-        approach = methodology.get('approach', '')
-        pipeline_stages = methodology.get('pipeline_stages', [])
+        prompt = self._pseudocode_prompt(methodology, algorithms_text)
         
-        prompt = f"""
-Generate pseudo-code for the main algorithms described in this research:
-
-Approach: {approach}
-Pipeline Stages: {', '.join(pipeline_stages)}
-Algorithm Description: {algorithms_text[:2000]}
-
-Create 2-3 pseudo-code blocks for the core algorithms.
-Use clear, language-agnostic pseudo-code with proper indentation.
-"""
+        llm_response = await self._call_llm_async(prompt, temperature=0.5, max_tokens=1500)
         
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.5, max_tokens=1500)
+        pseudocode_blocks = _parse_pseudocode_blocks(llm_response)
+        if pseudocode_blocks:
+            return pseudocode_blocks
         
         # Placeholder response
         pseudocode_blocks = [
@@ -150,7 +237,22 @@ Algorithm: OptimizationStep(parameters, gradients, learning_rate)
         
         return pseudocode_blocks
     
-    def _analyze_complexity(
+    def _pseudocode_prompt(
+        self,
+        methodology: Dict[str, Any],
+        algorithms_text: str
+    ) -> str:
+        """Build the pseudo-code generation prompt."""
+        approach = methodology.get('approach', '')
+        pipeline_stages = methodology.get('pipeline_stages', [])
+        
+        return f"""{_PSEUDOCODE_INSTRUCTIONS}
+Approach: {approach}
+Pipeline Stages: {', '.join(pipeline_stages)}
+Algorithm Description: {algorithms_text}
+"""
+    
+    async def _analyze_complexity(
         self,
         methodology: Dict[str, Any],
         algorithms_text: str
@@ -160,25 +262,17 @@ Algorithm: OptimizationStep(parameters, gradients, learning_rate)
         
         Args:
             methodology: Methodology dictionary
-            algorithms_text: Text describing algorithms
+            algorithms_text: Text describing algorithms, truncated for the prompt
             
         Returns:
             Dictionary with complexity analysis
         """
-        prompt = f"""
-Analyze the computational complexity of the algorithms:
-
-Algorithm Description: {algorithms_text[:1500]}
-
-Provide:
-1. Time complexity (Big-O notation)
-2. Space complexity (Big-O notation)
-3. Dominant operations
-4. Scalability considerations
+        prompt = f"""{_COMPLEXITY_INSTRUCTIONS}
+Algorithm Description: {algorithms_text}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=500)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=500)
         
         # Placeholder response
         return {
@@ -189,7 +283,7 @@ Provide:
             'bottlenecks': 'Memory usage for large datasets; gradient computation for high-dimensional features'
         }
     
-    def _generate_recommendations(
+    async def _generate_recommendations(
         self,
         methodology: Dict[str, Any],
         algorithms_text: str
@@ -199,27 +293,18 @@ Provide:
         
         Args:
             methodology: Methodology dictionary
-            algorithms_text: Text describing algorithms
+            algorithms_text: Text describing algorithms, truncated for the prompt
             
         Returns:
             List of recommendations
         """
-        prompt = f"""
-Provide practical implementation recommendations for this algorithm:
-
+        prompt = f"""{_RECOMMENDATIONS_INSTRUCTIONS}
 Methodology: {methodology.get('approach', '')}
-Algorithm: {algorithms_text[:1500]}
-
-Suggest:
-1. Best practices for implementation
-2. Common pitfalls to avoid
-3. Optimization strategies
-4. Library/framework recommendations
-5. Testing approaches
+Algorithm: {algorithms_text}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.5, max_tokens=600)
+        llm_response = await self._call_llm_async(prompt, temperature=0.5, max_tokens=600)
         
         # Placeholder response
         return [
@@ -249,22 +334,19 @@ Suggest:
         validation = methodology.get('validation', '')
         data_collection = methodology.get('data_collection', '')
         
-        notes = []
-        
-        # Data handling notes
-        if data_collection:
-            notes.append(f"**Data Handling**: {data_collection[:200]}")
-        
-        # Validation notes
-        if validation:
-            notes.append(f"**Validation Strategy**: {validation[:200]}")
-        
-        # General implementation notes
-        notes.append("**Dependencies**: Ensure all required libraries are installed with compatible versions")
-        notes.append("**Hardware Requirements**: Consider GPU acceleration for large-scale experiments")
-        notes.append("**Reproducibility**: Set random seeds and document all hyperparameters")
+        def notes():
+            # Data handling notes
+            if data_collection:
+                yield f"**Data Handling**: {data_collection[:200]}"
+            
+            # Validation notes
+            if validation:
+                yield f"**Validation Strategy**: {validation[:200]}"
+            
+            # General implementation notes
+            yield from _GENERAL_NOTES
         
-        return "\n\n".join(notes)
+        return "\n\n".join(notes())
     
     def _validate_pseudocode(self, pseudocode: str) -> bool:
         """
@@ -276,11 +358,8 @@ Suggest:
         Returns:
             True if structure looks valid
         """
-        # Basic validation: check for common keywords
-        keywords = ['input', 'output', 'for', 'while', 'if', 'return', 'algorithm']
-        pseudocode_lower = pseudocode.lower()
-        
-        has_keywords = any(keyword in pseudocode_lower for keyword in keywords)
-        has_structure = ':' in pseudocode or '=' in pseudocode
+        # Basic validation: check for common keywords and structure
+        has_keywords = _PSEUDO_KEYWORD_RE.search(pseudocode) is not None
+        has_structure = _PSEUDO_STRUCTURE_RE.search(pseudocode) is not None
         
         return has_keywords and has_structure
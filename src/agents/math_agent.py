@@ -5,17 +5,70 @@ Interprets mathematical equations, explains their purpose and intuition,
 and connects formal math to conceptual understanding.
 """
 
+import re
 import time
-from typing import Dict, Any, List
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Tuple
 
 from src.agents.base_agent import BaseAgent
 from src.utils import get_logger
-from src.tools import clean_text
+from src.tools import clean_text, TextCleaner
+
+
+# Shared cleaner (stateless)
+_CLEANER = TextCleaner()
+
+# Maximum number of equations interpreted per paper
+_MAX_EQUATIONS = 20
+
+# Greek letter commands (group 1) or standalone single-letter variables
+_VAR_RE = re.compile(
+    r'\\(alpha|beta|gamma|delta|epsilon|theta|lambda|mu|sigma|pi|tau|phi|omega)'
+    r'|\b[a-zA-Z]\b'
+)
+
+# Shared instructions first, paper context next and the equation list
+# last, so the prompt prefix is stable across papers
+_INTERPRET_INSTRUCTIONS = """
+Interpret the numbered mathematical equations from a research paper.
+
+For each equation provide:
+1. What the equation represents/calculates ("explanation")
+2. Meaning of each variable/symbol ("variables": list of {"symbol", "meaning"})
+3. Intuitive explanation in plain language ("intuition")
+4. How it relates to the paper's main contribution ("purpose")
+
+Respond with a JSON object {"interpretations": [...]} holding one entry
+per equation with keys "equation_number", "explanation", "variables",
+"intuition" and "purpose".
+"""
+
+
+@lru_cache(maxsize=256)
+def _variable_symbols(equation: str) -> Tuple[str, ...]:
+    """
+    Find variable symbols in an equation (memoized for repeated equations).
+    
+    Args:
+        equation: Equation string
+        
+    Returns:
+        Up to 15 symbols in order of first appearance
+    """
+    # Simple heuristic: single letters and Greek letters, deduplicated
+    variables = dict.fromkeys(
+        f'\\{match.group(1)}' if match.group(1) else match.group(0)
+        for match in _VAR_RE.finditer(equation)
+    )
+    return tuple(variables)[:15]
 
 
 class MathAgent(BaseAgent):
     """Interprets and explains mathematical content."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize MathAgent.
@@ -33,6 +86,18 @@ class MathAgent(BaseAgent):
         """
         Interpret equations and provide explanations.
         
+        Args:
+            data: Must contain 'equations' and 'context'
+            
+        Returns:
+            Dictionary with equation interpretations
+        """
+        return self._run_sync(self.arun(data))
+    
+    async def arun(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Interpret equations with a single batched LLM call.
+        
         Args:
             data: Must contain 'equations' and 'context'
             
@@ -43,30 +108,31 @@ class MathAgent(BaseAgent):
         self._log_start(data)
         
         try:
-            # Validate input
+            # Validate input (equations may be any iterable, e.g. from a streaming parser)
             equations = data.get('equations', [])
             context = data.get('context', '')
             
-            if not equations:
+            remaining = iter(equations)
+            selected = list(islice(remaining, _MAX_EQUATIONS))
+            
+            if not selected:
                 # No equations found
                 result = {
                     'interpretations': [],
                     'note': 'No mathematical equations found in the paper'
                 }
             else:
-                # Interpret each equation
-                interpretations = []
-                for i, equation in enumerate(equations[:20]):  # Limit to 20 equations
-                    interpretation = self._interpret_equation(
-                        equation,
-                        context,
-                        equation_number=i + 1
-                    )
-                    interpretations.append(interpretation)
+                # Interpret all equations with one prompt
+                interpretations = await self._interpret_equations(selected, context)
+                
+                if hasattr(equations, '__len__'):
+                    total_equations = len(equations)
+                else:
+                    total_equations = len(selected) + sum(1 for _ in remaining)
                 
                 result = {
                     'interpretations': interpretations,
-                    'total_equations': len(equations)
+                    'total_equations': total_equations
                 }
             
             # Create output
@@ -91,55 +157,91 @@ class MathAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _interpret_equation(
+    async def _interpret_equations(
         self,
-        equation: str,
-        context: str,
-        equation_number: int
-    ) -> Dict[str, Any]:
+        equations: List[str],
+        context: str
+    ) -> List[Dict[str, Any]]:
         """
-        Interpret a single equation.
+        Interpret several equations with a single LLM call.
         
         Args:
-            equation: LaTeX equation string
+            equations: LaTeX equation strings
             context: Surrounding text context
-            equation_number: Equation number
             
         Returns:
-            Dictionary with equation, explanation, variables, intuition
+            One dictionary per equation with equation, explanation,
+            variables, intuition and purpose
         """
-        # Clean equation
-        from ..tools.text_cleaner import TextCleaner
-        cleaner = TextCleaner()
-        cleaned_eq = cleaner.clean_equation(equation)
+        # Clean equations, numbering repeated ones (e.g. a restated loss) once
+        cleaned_eqs = [_CLEANER.clean_equation(equation) for equation in equations]
+        unique_numbers: Dict[str, int] = {}
+        for cleaned_eq in cleaned_eqs:
+            unique_numbers.setdefault(cleaned_eq, len(unique_numbers) + 1)
         
-        prompt = f"""
-Interpret this mathematical equation from a research paper:
-
-Equation {equation_number}: {cleaned_eq}
-
+        equation_list = "\n".join(
+            f"Equation {number}: {cleaned_eq}"
+            for cleaned_eq, number in unique_numbers.items()
+        )
+        prompt = f"""{_INTERPRET_INSTRUCTIONS}
 Context: {context[:1000]}
 
-Provide:
-1. What the equation represents/calculates
-2. Meaning of each variable/symbol
-3. Intuitive explanation (in plain language)
-4. How it relates to the paper's main contribution
-
-Format as structured text.
+{equation_list}
 """
         
-        # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.2, max_tokens=600)
+        llm_response = await self._call_llm_async(
+            prompt,
+            temperature=0.2,
+            max_tokens=min(600 * len(unique_numbers), 8192),
+            json_output=True
+        )
+        
+        # Route parsed entries back by prompt number, fanning repeats out
+        parsed = {}
+        entries = self._parse_json_object(llm_response).get('interpretations')
+        if isinstance(entries, list):
+            for entry in entries:
+                if isinstance(entry, dict) and isinstance(entry.get('equation_number'), int):
+                    parsed[entry['equation_number']] = entry
+        
+        return [
+            self._build_interpretation(
+                cleaned_eq,
+                number,
+                parsed.get(unique_numbers[cleaned_eq], {})
+            )
+            for number, cleaned_eq in enumerate(cleaned_eqs, start=1)
+        ]
+    
+    def _build_interpretation(
+        self,
+        cleaned_eq: str,
+        equation_number: int,
+        entry: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build the interpretation of one equation.
         
-        # Placeholder response
+        Args:
+            cleaned_eq: Cleaned equation string
+            equation_number: Equation number
+            entry: Parsed LLM entry for the equation (may be empty)
+            
+        Returns:
+            Dictionary with equation, explanation, variables, intuition
+        """
+        variables = entry.get('variables')
+        if not isinstance(variables, list) or not variables:
+            variables = self._extract_variables(cleaned_eq)
+        
+        # Placeholder text where the LLM gave no answer
         return {
             'equation_number': equation_number,
             'equation': cleaned_eq,
-            'explanation': f"This equation defines the core computational relationship in the proposed method. It combines multiple factors to produce the final output.",
-            'variables': self._extract_variables(cleaned_eq),
-            'intuition': "Intuitively, this equation balances different considerations to optimize the desired objective. Each term contributes a specific aspect to the overall computation.",
-            'purpose': "Formalize the mathematical foundation of the proposed approach"
+            'explanation': entry.get('explanation') or "This equation defines the core computational relationship in the proposed method. It combines multiple factors to produce the final output.",
+            'variables': variables,
+            'intuition': entry.get('intuition') or "Intuitively, this equation balances different considerations to optimize the desired objective. Each term contributes a specific aspect to the overall computation.",
+            'purpose': entry.get('purpose') or "Formalize the mathematical foundation of the proposed approach"
         }
     
     def _extract_variables(self, equation: str) -> List[Dict[str, str]]:
@@ -152,29 +254,14 @@ Format as structured text.
         Returns:
             List of variable dictionaries
         """
-        # Simple heuristic: look for common LaTeX variable patterns
-        import re
-        
-        # Find single letters and Greek letters
-        variables = set()
-        
-        # Single letters (a-z, A-Z)
-        single_vars = re.findall(r'\b[a-zA-Z]\b', equation)
-        variables.update(single_vars)
-        
-        # Greek letters
-        greek_vars = re.findall(r'\\(alpha|beta|gamma|delta|epsilon|theta|lambda|mu|sigma|pi|tau|phi|omega)', equation)
-        variables.update([f'\\{g}' for g in greek_vars])
-        
         # Convert to list of dicts with placeholder meanings
-        var_list = []
-        for var in sorted(variables):
-            var_list.append({
+        return [
+            {
                 'symbol': var,
                 'meaning': f"Variable {var} (meaning to be inferred from context)"
-            })
-        
-        return var_list[:15]  # Limit to 15 variables
+            }
+            for var in _variable_symbols(equation)
+        ]
     
     def _get_equation_context(
         self,
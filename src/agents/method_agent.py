@@ -5,16 +5,60 @@ Extracts and explains research methodology, experimental pipeline,
 data collection, and validation approaches.
 """
 
+import re
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from src.agents.base_agent import BaseAgent
 from src.utils import get_logger
 
 
+# Section title keywords that identify the methodology section, matched as
+# substrings (so "Methodology" and "Experiments" count) in one search
+_METHOD_TITLE_RE = re.compile('method|approach|procedure|experiment|design')
+
+# Static instruction prefixes. Prompts put these first and the
+# paper-specific fields last, so identical prefixes are shared across
+# papers by prefix-caching LLM servers.
+_APPROACH_INSTRUCTIONS = """
+Identify the research approach used in this paper.
+
+Classify as: theoretical, empirical, mixed-methods, or survey.
+Explain the approach in 2-3 sentences.
+"""
+
+_PIPELINE_INSTRUCTIONS = """
+Extract the experimental/methodological pipeline stages from this paper.
+
+List the main stages in order (e.g., "1. Data preprocessing", "2. Model training", etc.)
+"""
+
+_DATA_COLLECTION_INSTRUCTIONS = """
+Describe the data collection methodology from this paper.
+
+Explain:
+- Data sources
+- Collection procedures
+- Sample size and characteristics
+- Data quality measures
+"""
+
+_VALIDATION_INSTRUCTIONS = """
+Describe the validation and evaluation approach.
+
+Explain:
+- Evaluation metrics used
+- Baseline comparisons
+- Statistical tests
+- Cross-validation or hold-out strategy
+"""
+
+
 class MethodologyAgent(BaseAgent):
     """Analyzes and explains research methodology."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize MethodologyAgent.
@@ -32,6 +76,18 @@ class MethodologyAgent(BaseAgent):
         """
         Extract and explain methodology.
         
+        Args:
+            data: Must contain 'document' and 'full_text'
+            
+        Returns:
+            Dictionary with approach, pipeline_stages, data_collection, validation
+        """
+        return self._run_sync(self.arun(data))
+    
+    async def arun(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract and explain methodology with the LLM calls run concurrently.
+        
         Args:
             data: Must contain 'document' and 'full_text'
             
@@ -46,14 +102,32 @@ class MethodologyAgent(BaseAgent):
             self._validate_input(data, ['document'])
             
             document = data['document']
-            full_text = data.get('full_text', document.get('full_text', ''))
             
-            # Extract methodology components
+            # Look up the sections the prompts draw on once
+            section_index = self._build_section_index(document)
+            method_section = self._get_methodology_section(document, section_index)
+            results_section = self._get_section_content(
+                section_index,
+                ['result', 'evaluation', 'experiment']
+            )
+            
+            # Truncate prompt inputs once
+            method_long = method_section[:3000]
+            method_medium = method_long[:2000]
+            method_short = method_long[:1500]
+            
+            # Extract methodology components (independent LLM calls)
+            approach, pipeline_stages, data_collection, validation = await self._gather_limited(
+                self._identify_research_approach(document, method_medium),
+                self._extract_pipeline_stages(method_long),
+                self._extract_data_collection(method_medium),
+                self._extract_validation_approach(method_short, results_section[:1500])
+            )
             methodology = {
-                'approach': self._identify_research_approach(document, full_text),
-                'pipeline_stages': self._extract_pipeline_stages(document, full_text),
-                'data_collection': self._extract_data_collection(document, full_text),
-                'validation': self._extract_validation_approach(document, full_text)
+                'approach': approach,
+                'pipeline_stages': pipeline_stages,
+                'data_collection': data_collection,
+                'validation': validation
             }
             
             # Create output
@@ -78,68 +152,49 @@ class MethodologyAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _identify_research_approach(
+    async def _identify_research_approach(
         self,
         document: Dict[str, Any],
-        full_text: str
+        method_section: str
     ) -> str:
         """
         Identify research approach (theoretical/empirical/mixed).
         
         Args:
             document: Document dictionary
-            full_text: Full paper text
+            method_section: Methodology section text, truncated for the prompt
             
         Returns:
             Research approach description
         """
-        # Get methodology section
-        method_section = self._get_methodology_section(document)
-        
-        prompt = f"""
-Identify the research approach used in this paper:
-
+        prompt = f"""{_APPROACH_INSTRUCTIONS}
 Title: {document.get('title', '')}
 Abstract: {document.get('abstract', '')[:500]}
-Methodology Section: {method_section[:2000]}
-
-Classify as: theoretical, empirical, mixed-methods, or survey.
-Explain the approach in 2-3 sentences.
+Methodology Section: {method_section}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=300)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=300)
         
         # Placeholder response
         return "The paper employs an empirical research approach, combining theoretical analysis with experimental validation. The methodology includes both algorithmic development and comprehensive evaluation on benchmark datasets."
     
-    def _extract_pipeline_stages(
-        self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> List[str]:
+    async def _extract_pipeline_stages(self, method_section: str) -> List[str]:
         """
         Extract experimental pipeline stages.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            method_section: Methodology section text, truncated for the prompt
             
         Returns:
             List of pipeline stages
         """
-        method_section = self._get_methodology_section(document)
-        
-        prompt = f"""
-Extract the experimental/methodological pipeline stages from this paper:
-
-Methodology: {method_section[:3000]}
-
-List the main stages in order (e.g., "1. Data preprocessing", "2. Model training", etc.)
+        prompt = f"""{_PIPELINE_INSTRUCTIONS}
+Methodology: {method_section}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=500)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=500)
         
         # Placeholder response
         return [
@@ -151,116 +206,70 @@ List the main stages in order (e.g., "1. Data preprocessing", "2. Model training
             "Statistical analysis and comparison"
         ]
     
-    def _extract_data_collection(
-        self,
-        document: Dict[str, Any],
-        full_text: str
-    ) -> str:
+    async def _extract_data_collection(self, method_section: str) -> str:
         """
         Extract data collection methodology.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            method_section: Methodology section text, truncated for the prompt
             
         Returns:
             Data collection description
         """
-        method_section = self._get_methodology_section(document)
-        
-        prompt = f"""
-Describe the data collection methodology from this paper:
-
-Methodology: {method_section[:2000]}
-
-Explain:
-- Data sources
-- Collection procedures
-- Sample size and characteristics
-- Data quality measures
+        prompt = f"""{_DATA_COLLECTION_INSTRUCTIONS}
+Methodology: {method_section}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=400)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=400)
         
         # Placeholder response
         return "Data was collected from established benchmark datasets in the field. The dataset includes diverse samples ensuring comprehensive coverage. Quality control measures were applied to ensure data integrity and reliability."
     
-    def _extract_validation_approach(
+    async def _extract_validation_approach(
         self,
-        document: Dict[str, Any],
-        full_text: str
+        method_section: str,
+        results_section: str
     ) -> str:
         """
         Extract validation and evaluation approach.
         
         Args:
-            document: Document dictionary
-            full_text: Full paper text
+            method_section: Methodology section text, truncated for the prompt
+            results_section: Results/evaluation section text, truncated for the prompt
             
         Returns:
             Validation approach description
         """
-        method_section = self._get_methodology_section(document)
-        results_section = self._get_section_by_name(document, ['result', 'evaluation', 'experiment'])
-        
-        prompt = f"""
-Describe the validation and evaluation approach:
-
-Methodology: {method_section[:1500]}
-Results/Evaluation: {results_section[:1500]}
-
-Explain:
-- Evaluation metrics used
-- Baseline comparisons
-- Statistical tests
-- Cross-validation or hold-out strategy
+        prompt = f"""{_VALIDATION_INSTRUCTIONS}
+Methodology: {method_section}
+Results/Evaluation: {results_section}
 """
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=400)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=400)
         
         # Placeholder response
         return "The approach is validated using standard evaluation metrics including accuracy, precision, and recall. Results are compared against established baseline methods. Statistical significance testing ensures robustness of findings."
     
-    def _get_methodology_section(self, document: Dict[str, Any]) -> str:
+    def _get_methodology_section(
+        self,
+        document: Dict[str, Any],
+        section_index: List[Tuple[str, str]]
+    ) -> str:
         """
         Get methodology section content.
         
         Args:
             document: Document dictionary
+            section_index: (lowercased title, content) pairs
             
         Returns:
             Methodology section text
         """
-        sections = document.get('sections', [])
-        method_keywords = ['method', 'approach', 'procedure', 'experiment', 'design']
-        
-        for section in sections:
-            title_lower = section.get('title', '').lower()
-            if any(keyword in title_lower for keyword in method_keywords):
-                return section.get('content', '')
+        for title_lower, content in section_index:
+            if _METHOD_TITLE_RE.search(title_lower):
+                return content
         
         # Fallback: return abstract or empty
         return document.get('abstract', '')
-    
-    def _get_section_by_name(self, document: Dict[str, Any], names: List[str]) -> str:
-        """
-        Get section content by matching name.
-        
-        Args:
-            document: Document dictionary
-            names: List of section names to match
-            
-        Returns:
-            Combined section text
-        """
-        sections = document.get('sections', [])
-        matching_texts = []
-        
-        for section in sections:
-            title_lower = section.get('title', '').lower()
-            if any(name in title_lower for name in names):
-                matching_texts.append(section.get('content', ''))
-        
-        return "\n\n".join(matching_texts)
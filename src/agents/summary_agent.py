@@ -5,16 +5,83 @@ Generates multi-level summaries (TL;DR, paragraph, detailed)
 and extracts key findings from research papers.
 """
 
+import io
+import re
 import time
-from typing import Dict, Any, List
+from string import Template
+from typing import Dict, Any, Coroutine, List, Tuple
 
 from src.agents.base_agent import BaseAgent
 from src.utils import get_logger, chunk_text
 
 
+# Section title keywords, matched as substrings of the lowercased title
+# in one search
+_KEY_SECTION_RE = re.compile('introduction|method|result|conclusion|discussion')
+_FINDINGS_SECTION_RE = re.compile('result|conclusion|discussion')
+
+# Default character budgets for document text placed in prompts
+_PROMPT_BUDGETS = {
+    'tldr_abstract': 1000,
+    'para_abstract': 2000,
+    'detailed_abstract': 2000,
+    'detailed_sections': 3000,
+    'findings_abstract': 2000,
+    'findings_results': 2000
+}
+
+# Prompt templates, compiled once at import
+_TLDR_TEMPLATE = Template("""
+Create a TL;DR (2-3 sentences) for this research paper:
+
+Title: $title
+Abstract: $abstract
+
+TL;DR should capture the main contribution and key result.
+""")
+
+_PARAGRAPH_TEMPLATE = Template("""
+Write a paragraph summary (100-150 words) for this research paper:
+
+Title: $title
+Abstract: $abstract
+
+Include: research problem, approach, key results, and significance.
+""")
+
+_DETAILED_TEMPLATE = Template("""
+Write a comprehensive summary (500+ words) for this research paper:
+
+Title: $title
+Abstract: $abstract
+
+Key Sections:
+$sections_text
+
+Cover:
+1. Background and motivation
+2. Research question and objectives
+3. Methodology and approach
+4. Key results and findings
+5. Implications and future work
+""")
+
+_FINDINGS_TEMPLATE = Template("""
+Extract 3-5 key findings from this research paper:
+
+Title: $title
+Abstract: $abstract
+Results/Conclusions: $results_text
+
+List the most important findings as bullet points.
+""")
+
+
 class SummaryAgent(BaseAgent):
     """Generates multi-level summaries of research papers."""
     
+    __slots__ = ()
+    
     def __init__(self, logger=None, config=None):
         """
         Initialize SummaryAgent.
@@ -35,6 +102,18 @@ class SummaryAgent(BaseAgent):
         Args:
             data: Must contain 'document' key with parsed paper
             
+        Returns:
+            Dictionary with tldr, paragraph_summary, detailed_summary, key_findings
+        """
+        return self._run_sync(self.arun(data))
+    
+    async def arun(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate summaries with the LLM calls run concurrently.
+        
+        Args:
+            data: Must contain 'document' key with parsed paper
+        
         Returns:
             Dictionary with tldr, paragraph_summary, detailed_summary, key_findings
         """
@@ -46,31 +125,14 @@ class SummaryAgent(BaseAgent):
             self._validate_input(data, ['document'])
             
             document = data['document']
-            include_tldr = data.get('include_tldr', True)
-            include_detailed = data.get('include_detailed', True)
-            
-            # Generate summaries at different levels
-            summaries = {}
-            
-            if include_tldr:
-                summaries['tldr'] = self._generate_tldr(document)
             
-            summaries['paragraph_summary'] = self._generate_paragraph_summary(document)
-            
-            if include_detailed:
-                summaries['detailed_summary'] = self._generate_detailed_summary(document)
-            
-            summaries['key_findings'] = self._extract_key_findings(document)
+            # Generate summaries at different levels (independent LLM calls)
+            tasks = self._summary_tasks(document, data)
+            results = await self._gather_limited(*tasks.values())
+            summaries = dict(zip(tasks, results))
             
             # Create output
-            output = self._create_output(
-                status="success",
-                result=summaries,
-                metadata={
-                    "title": document.get('title', 'Unknown'),
-                    "num_sections": len(document.get('sections', []))
-                }
-            )
+            output = self._summary_output(document, summaries)
             
             duration = time.time() - start_time
             self._log_complete(output, duration)
@@ -85,7 +147,53 @@ class SummaryAgent(BaseAgent):
                 errors=[str(e)]
             )
     
-    def _generate_tldr(self, document: Dict[str, Any]) -> str:
+    def _summary_tasks(
+        self,
+        document: Dict[str, Any],
+        data: Dict[str, Any]
+    ) -> Dict[str, Coroutine]:
+        """
+        Create the summary coroutines requested by the input options.
+        
+        Args:
+            document: Document dictionary
+            data: Agent input (include_tldr, include_detailed)
+            
+        Returns:
+            Mapping of summary field to coroutine, in output order
+        """
+        # Index the sections the prompts draw on once
+        key_sections = self._index_key_sections(document)
+        
+        tasks = {}
+        
+        if data.get('include_tldr', True):
+            tasks['tldr'] = self._generate_tldr(document)
+        
+        tasks['paragraph_summary'] = self._generate_paragraph_summary(document)
+        
+        if data.get('include_detailed', True):
+            tasks['detailed_summary'] = self._generate_detailed_summary(document, key_sections)
+        
+        tasks['key_findings'] = self._extract_key_findings(document, key_sections)
+        
+        return tasks
+    
+    def _summary_output(self, document: Dict[str, Any], summaries: Dict[str, Any]) -> Dict[str, Any]:
+        """Create the agent output for completed summaries."""
+        return self._create_output(
+            status="success",
+            result=summaries,
+            metadata={
+                "title": document.get('title', 'Unknown'),
+                "num_sections": len(document.get('sections', []))
+            }
+        )
+    
+    async def _generate_tldr(
+        self,
+        document: Dict[str, Any]
+    ) -> str:
         """
         Generate TL;DR summary (2-3 sentences).
         
@@ -95,22 +203,22 @@ class SummaryAgent(BaseAgent):
         Returns:
             TL;DR string
         """
-        prompt = f"""
-Create a TL;DR (2-3 sentences) for this research paper:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')[:1000]}
-
-TL;DR should capture the main contribution and key result.
-"""
+        prompt = self._format_prompt(
+            _TLDR_TEMPLATE,
+            title=document.get('title', ''),
+            abstract=document.get('abstract', '')[:self._prompt_budget('tldr_abstract')]
+        )
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=200)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=200)
         
         # Placeholder response
         return f"TL;DR: This paper presents {document.get('title', 'a research contribution')}. The main finding demonstrates novel results in the field. The approach shows promising improvements over existing methods."
     
-    def _generate_paragraph_summary(self, document: Dict[str, Any]) -> str:
+    async def _generate_paragraph_summary(
+        self,
+        document: Dict[str, Any]
+    ) -> str:
         """
         Generate paragraph summary (100-150 words).
         
@@ -120,17 +228,14 @@ TL;DR should capture the main contribution and key result.
         Returns:
             Paragraph summary string
         """
-        prompt = f"""
-Write a paragraph summary (100-150 words) for this research paper:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')}
-
-Include: research problem, approach, key results, and significance.
-"""
+        prompt = self._format_prompt(
+            _PARAGRAPH_TEMPLATE,
+            title=document.get('title', ''),
+            abstract=document.get('abstract', '')[:self._prompt_budget('para_abstract')]
+        )
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=300)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=300)
         
         # Placeholder response
         abstract = document.get('abstract', 'No abstract available')
@@ -138,38 +243,25 @@ Include: research problem, approach, key results, and significance.
             return abstract[:500] + "..."
         return abstract
     
-    def _generate_detailed_summary(self, document: Dict[str, Any]) -> str:
+    async def _generate_detailed_summary(
+        self,
+        document: Dict[str, Any],
+        key_sections: List[Tuple[str, str, str]]
+    ) -> str:
         """
         Generate detailed summary (500+ words).
         
         Args:
             document: Document dictionary
+            key_sections: Key sections from _index_key_sections
             
         Returns:
             Detailed summary string
         """
-        # Collect content from key sections
-        sections_text = self._get_key_sections_text(document)
-        
-        prompt = f"""
-Write a comprehensive summary (500+ words) for this research paper:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')}
-
-Key Sections:
-{sections_text[:3000]}
-
-Cover:
-1. Background and motivation
-2. Research question and objectives
-3. Methodology and approach
-4. Key results and findings
-5. Implications and future work
-"""
+        prompt = self._detailed_summary_prompt(document, key_sections)
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=1500)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=1500)
         
         # Placeholder response
         return f"""
@@ -186,31 +278,55 @@ Implications: These results have important implications for both research and pr
 Future Work: The authors identify several promising directions for extending this work.
 """
     
-    def _extract_key_findings(self, document: Dict[str, Any]) -> List[str]:
+    def _detailed_summary_prompt(
+        self,
+        document: Dict[str, Any],
+        key_sections: List[Tuple[str, str, str]]
+    ) -> str:
+        """Build the detailed summary prompt."""
+        # Collect content from key sections
+        sections_text = self._get_key_sections_text(
+            key_sections,
+            self._prompt_budget('detailed_sections')
+        )
+        
+        return self._format_prompt(
+            _DETAILED_TEMPLATE,
+            title=document.get('title', ''),
+            abstract=document.get('abstract', '')[:self._prompt_budget('detailed_abstract')],
+            sections_text=sections_text
+        )
+    
+    async def _extract_key_findings(
+        self,
+        document: Dict[str, Any],
+        key_sections: List[Tuple[str, str, str]]
+    ) -> List[str]:
         """
         Extract key findings from the paper.
         
         Args:
             document: Document dictionary
+            key_sections: Key sections from _index_key_sections
             
         Returns:
             List of key findings
         """
         # Look for results, conclusion sections
-        results_text = self._get_section_by_name(document, ['result', 'conclusion', 'discussion'])
+        results_text = self._get_findings_text(
+            key_sections,
+            self._prompt_budget('findings_results')
+        )
         
-        prompt = f"""
-Extract 3-5 key findings from this research paper:
-
-Title: {document.get('title', '')}
-Abstract: {document.get('abstract', '')}
-Results/Conclusions: {results_text[:2000]}
-
-List the most important findings as bullet points.
-"""
+        prompt = self._format_prompt(
+            _FINDINGS_TEMPLATE,
+            title=document.get('title', ''),
+            abstract=document.get('abstract', '')[:self._prompt_budget('findings_abstract')],
+            results_text=results_text
+        )
         
         # TODO: integrate Gemini LLM call here (ADK)
-        llm_response = self._call_llm(prompt, temperature=0.3, max_tokens=500)
+        llm_response = await self._call_llm_async(prompt, temperature=0.3, max_tokens=500)
         
         # Placeholder response
         return [
@@ -220,44 +336,86 @@ List the most important findings as bullet points.
             "Theoretical analysis provides strong guarantees on convergence and optimality"
         ]
     
-    def _get_key_sections_text(self, document: Dict[str, Any]) -> str:
+    def _index_key_sections(self, document: Dict[str, Any]) -> List[Tuple[str, str, str]]:
         """
-        Get text from key sections (intro, methods, results, conclusion).
+        Collect key sections (intro, methods, results, conclusion) in one pass.
         
         Args:
             document: Document dictionary
             
         Returns:
-            Combined text from key sections
+            List of (lowercased title, title, content) in document order
         """
-        sections = document.get('sections', [])
-        key_section_names = ['introduction', 'method', 'result', 'conclusion', 'discussion']
+        key_sections = []
+        for section in document.get('sections', []):
+            title = section.get('title', '')
+            title_lower = title.lower()
+            if _KEY_SECTION_RE.search(title_lower):
+                key_sections.append((title_lower, title, section.get('content', '')))
+        return key_sections
+    
+    def _prompt_budget(self, name: str) -> int:
+        """
+        Get the character budget for a prompt input.
         
-        key_texts = []
-        for section in sections:
-            title_lower = section.get('title', '').lower()
-            if any(name in title_lower for name in key_section_names):
-                key_texts.append(f"{section['title']}: {section.get('content', '')[:1000]}")
+        Args:
+            name: Budget name (e.g. 'tldr_abstract')
+            
+        Returns:
+            Maximum number of characters
+        """
+        return self._get_setting('PROMPT_BUDGETS', _PROMPT_BUDGETS).get(name, _PROMPT_BUDGETS[name])
+    
+    def _get_key_sections_text(
+        self,
+        key_sections: List[Tuple[str, str, str]],
+        max_chars: int
+    ) -> str:
+        """
+        Get text from key sections, stopping once the budget is filled.
         
-        return "\n\n".join(key_texts)
+        Args:
+            key_sections: Key sections from _index_key_sections
+            max_chars: Maximum length of the returned text
+            
+        Returns:
+            Combined text from key sections
+        """
+        buf = io.StringIO()
+        for _, title, content in key_sections:
+            if buf.tell() >= max_chars:
+                break
+            if buf.tell():
+                buf.write("\n\n")
+            buf.write(f"{title}: {content[:1000]}")
+        
+        return buf.getvalue()[:max_chars]
     
-    def _get_section_by_name(self, document: Dict[str, Any], names: List[str]) -> str:
+    def _get_findings_text(
+        self,
+        key_sections: List[Tuple[str, str, str]],
+        max_chars: int
+    ) -> str:
         """
-        Get section content by matching name.
+        Get results, conclusion and discussion text, stopping once the
+        budget is filled.
         
         Args:
-            document: Document dictionary
-            names: List of section names to match
+            key_sections: Key sections from _index_key_sections
+            max_chars: Maximum length of the returned text
             
         Returns:
             Combined section text
         """
-        sections = document.get('sections', [])
-        matching_texts = []
-        
-        for section in sections:
-            title_lower = section.get('title', '').lower()
-            if any(name in title_lower for name in names):
-                matching_texts.append(section.get('content', ''))
+        buf = io.StringIO()
+        matched = False
+        for title_lower, _, content in key_sections:
+            if buf.tell() >= max_chars:
+                break
+            if _FINDINGS_SECTION_RE.search(title_lower):
+                if matched:
+                    buf.write("\n\n")
+                buf.write(content[:max_chars - buf.tell()])
+                matched = True
         
-        return "\n\n".join(matching_texts)
+        return buf.getvalue()[:max_chars]
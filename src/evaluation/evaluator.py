@@ -13,6 +13,14 @@ from datetime import datetime
 class ReportEvaluator:
     """Evaluates quality and completeness of research reports."""
     
+    # (section, field) pairs whose values must be lists
+    _LIST_FIELDS = (
+        ('summaries', 'key_findings'),
+        ('critique', 'assumptions'),
+        ('critique', 'limitations'),
+        ('critique', 'biases')
+    )
+    
     def __init__(self):
         """Initialize evaluator."""
         self.required_sections = [
@@ -27,6 +35,14 @@ class ReportEvaluator:
         self.methodology_fields = ['approach', 'pipeline_stages', 'data_collection', 'validation']
         self.critique_fields = ['assumptions', 'limitations', 'biases', 'reproducibility_score']
         self.implementation_fields = ['pseudocode', 'complexity', 'recommendations']
+        
+        # Required fields per section, as sets for key intersection
+        self.required_field_sets = {
+            'summaries': frozenset(self.summary_fields),
+            'methodology': frozenset(self.methodology_fields),
+            'critique': frozenset(self.critique_fields),
+            'implementation': frozenset(self.implementation_fields)
+        }
     
     def evaluate_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -38,13 +54,23 @@ class ReportEvaluator:
         Returns:
             Evaluation results dictionary
         """
+        # Look up each report section once for all checks
+        metadata = report.get('metadata', {})
+        summaries = report.get('summaries', {})
+        methodology = report.get('methodology', {})
+        critique = report.get('critique', {})
+        implementation = report.get('implementation', {})
+        math_explanations = report.get('math_explanations', {})
+        
         evaluation = {
             'timestamp': datetime.now().isoformat(),
             'overall_score': 0.0,
             'completeness': self._check_completeness(report),
-            'consistency': self._check_consistency(report),
-            'structure': self._check_structure(report),
-            'quality_metrics': self._calculate_quality_metrics(report),
+            'consistency': self._check_consistency(metadata, summaries, methodology, critique),
+            'structure': self._check_structure(report, metadata, summaries, critique),
+            'quality_metrics': self._calculate_quality_metrics(
+                self._collect_stats(summaries, critique, implementation, math_explanations)
+            ),
             'issues': [],
             'recommendations': []
         }
@@ -76,18 +102,22 @@ class ReportEvaluator:
         
         total_sections = len(self.required_sections)
         present_sections = 0
+        section_scores = results['section_scores']
+        incomplete_sections = results['incomplete_sections']
+        missing_sections = results['missing_sections']
         
         for section in self.required_sections:
-            if section in report and report[section]:
+            section_data = report.get(section)
+            if section_data:
                 present_sections += 1
                 # Check section completeness
-                section_score = self._evaluate_section_completeness(section, report[section])
-                results['section_scores'][section] = section_score
+                section_score = self._evaluate_section_completeness(section, section_data)
+                section_scores[section] = section_score
                 
                 if section_score < 0.5:
-                    results['incomplete_sections'].append(section)
+                    incomplete_sections.append(section)
             else:
-                results['missing_sections'].append(section)
+                missing_sections.append(section)
         
         results['score'] = present_sections / total_sections
         
@@ -108,25 +138,32 @@ class ReportEvaluator:
         Returns:
             Completeness score (0-1)
         """
-        required_fields = {
-            'summaries': self.summary_fields,
-            'methodology': self.methodology_fields,
-            'critique': self.critique_fields,
-            'implementation': self.implementation_fields
-        }.get(section_name, [])
+        required_fields = self.required_field_sets.get(section_name)
         
         if not required_fields:
             return 1.0  # No specific requirements
         
-        present_fields = sum(1 for field in required_fields if field in section_data and section_data[field])
+        # Intersect with the dict's key view, then check only those values
+        present_fields = sum(
+            1 for field in required_fields & section_data.keys() if section_data[field]
+        )
         return present_fields / len(required_fields)
     
-    def _check_consistency(self, report: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_consistency(
+        self,
+        metadata: Dict[str, Any],
+        summaries: Dict[str, Any],
+        methodology: Dict[str, Any],
+        critique: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
         Check consistency across different sections.
         
         Args:
-            report: Report dictionary
+            metadata: Report metadata section
+            summaries: Report summaries section
+            methodology: Report methodology section
+            critique: Report critique section
             
         Returns:
             Consistency results
@@ -137,15 +174,12 @@ class ReportEvaluator:
         }
         
         # Check title consistency
-        doc_title = report.get('metadata', {}).get('title', '')
+        doc_title = metadata.get('title', '')
         if doc_title == 'Unknown' or doc_title == 'Untitled Paper':
             results['inconsistencies'].append('Document title not properly extracted')
             results['score'] -= 0.1
         
         # Check if key findings match critique limitations
-        summaries = report.get('summaries', {})
-        critique = report.get('critique', {})
-        
         key_findings = summaries.get('key_findings', [])
         limitations = critique.get('limitations', [])
         
@@ -160,7 +194,6 @@ class ReportEvaluator:
             results['score'] -= 0.2
         
         # Check if methodology has pipeline stages
-        methodology = report.get('methodology', {})
         pipeline_stages = methodology.get('pipeline_stages', [])
         
         if methodology.get('approach') and not pipeline_stages:
@@ -171,12 +204,21 @@ class ReportEvaluator:
         
         return results
     
-    def _check_structure(self, report: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_structure(
+        self,
+        report: Dict[str, Any],
+        metadata: Any,
+        summaries: Dict[str, Any],
+        critique: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
         Check structural validity of report.
         
         Args:
             report: Report dictionary
+            metadata: Report metadata section
+            summaries: Report summaries section
+            critique: Report critique section
             
         Returns:
             Structure validation results
@@ -187,25 +229,20 @@ class ReportEvaluator:
         }
         
         # Check if markdown is present
-        if 'final_markdown' not in report or not report['final_markdown']:
+        if not report.get('final_markdown'):
             results['structural_issues'].append('No markdown representation generated')
             results['score'] -= 0.2
         
         # Check metadata structure
-        metadata = report.get('metadata', {})
         if not isinstance(metadata, dict):
             results['structural_issues'].append('Invalid metadata structure')
             results['score'] -= 0.2
         
         # Check if lists are actually lists
-        summaries = report.get('summaries', {})
-        if 'key_findings' in summaries and not isinstance(summaries['key_findings'], list):
-            results['structural_issues'].append('key_findings is not a list')
-            results['score'] -= 0.1
-        
-        critique = report.get('critique', {})
-        for field in ['assumptions', 'limitations', 'biases']:
-            if field in critique and not isinstance(critique[field], list):
+        sections = {'summaries': summaries, 'critique': critique}
+        for section, field in self._LIST_FIELDS:
+            value = sections[section].get(field, [])
+            if not isinstance(value, list):
                 results['structural_issues'].append(f'{field} is not a list')
                 results['score'] -= 0.1
         
@@ -213,118 +250,128 @@ class ReportEvaluator:
         
         return results
     
-    def _calculate_quality_metrics(self, report: Dict[str, Any]) -> Dict[str, Any]:
+    def _collect_stats(
+        self,
+        summaries: Dict[str, Any],
+        critique: Dict[str, Any],
+        implementation: Dict[str, Any],
+        math_explanations: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
-        Calculate various quality metrics.
+        Collect the lengths and flags the quality metrics score.
         
         Args:
-            report: Report dictionary
+            summaries: Report summaries section
+            critique: Report critique section
+            implementation: Report implementation section
+            math_explanations: Report math section
             
         Returns:
-            Quality metrics
+            Dictionary of lengths, counts and flags
         """
-        metrics = {}
-        
-        # Summary quality
-        summaries = report.get('summaries', {})
-        metrics['summary_quality'] = self._evaluate_summary_quality(summaries)
-        
-        # Critique depth
-        critique = report.get('critique', {})
-        metrics['critique_depth'] = self._evaluate_critique_depth(critique)
-        
-        # Implementation usefulness
-        implementation = report.get('implementation', {})
-        metrics['implementation_usefulness'] = self._evaluate_implementation_usefulness(implementation)
+        complexity = implementation.get('complexity', {})
         
-        # Math coverage
-        math_explanations = report.get('math_explanations', {})
-        metrics['math_coverage'] = self._evaluate_math_coverage(math_explanations)
+        return {
+            'tldr_len': len(summaries.get('tldr') or ''),
+            'paragraph_len': len(summaries.get('paragraph_summary') or ''),
+            'detailed_len': len(summaries.get('detailed_summary') or ''),
+            'findings_count': len(summaries.get('key_findings') or ()),
+            'assumptions_count': len(critique.get('assumptions', [])),
+            'limitations_count': len(critique.get('limitations', [])),
+            'biases_count': len(critique.get('biases', [])),
+            'reproducibility_score': critique.get('reproducibility_score', 0),
+            'pseudocode_count': len(implementation.get('pseudocode') or ()),
+            'has_complexity': 'time_complexity' in complexity and 'space_complexity' in complexity,
+            'recommendations_count': len(implementation.get('recommendations', [])),
+            'interpretations_count': len(math_explanations.get('interpretations') or ()),
+            'no_equations': 'no mathematical equations' in math_explanations.get('note', '').lower()
+        }
+    
+    def _calculate_quality_metrics(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calculate various quality metrics.
         
-        return metrics
+        Args:
+            stats: Report statistics from _collect_stats
+            
+        Returns:
+            Quality metrics
+        """
+        return {
+            'summary_quality': self._evaluate_summary_quality(stats),
+            'critique_depth': self._evaluate_critique_depth(stats),
+            'implementation_usefulness': self._evaluate_implementation_usefulness(stats),
+            'math_coverage': self._evaluate_math_coverage(stats)
+        }
     
-    def _evaluate_summary_quality(self, summaries: Dict[str, Any]) -> float:
+    def _evaluate_summary_quality(self, stats: Dict[str, Any]) -> float:
         """Evaluate summary quality (0-1)."""
         score = 0.0
         
-        tldr = summaries.get('tldr', '')
-        if tldr and len(tldr) > 20:
+        if stats['tldr_len'] > 20:
             score += 0.3
         
-        para_summary = summaries.get('paragraph_summary', '')
-        if para_summary and len(para_summary) > 100:
+        if stats['paragraph_len'] > 100:
             score += 0.3
         
-        detailed = summaries.get('detailed_summary', '')
-        if detailed and len(detailed) > 300:
+        if stats['detailed_len'] > 300:
             score += 0.2
         
-        key_findings = summaries.get('key_findings', [])
-        if key_findings and len(key_findings) >= 3:
+        if stats['findings_count'] >= 3:
             score += 0.2
         
         return score
     
-    def _evaluate_critique_depth(self, critique: Dict[str, Any]) -> float:
+    def _evaluate_critique_depth(self, stats: Dict[str, Any]) -> float:
         """Evaluate critique depth (0-1)."""
         score = 0.0
         
-        assumptions = critique.get('assumptions', [])
-        if len(assumptions) >= 3:
+        if stats['assumptions_count'] >= 3:
             score += 0.25
         
-        limitations = critique.get('limitations', [])
-        if len(limitations) >= 3:
+        if stats['limitations_count'] >= 3:
             score += 0.25
         
-        biases = critique.get('biases', [])
-        if len(biases) >= 2:
+        if stats['biases_count'] >= 2:
             score += 0.25
         
-        repro_score = critique.get('reproducibility_score', 0)
-        if 0 <= repro_score <= 10:
+        if 0 <= stats['reproducibility_score'] <= 10:
             score += 0.25
         
         return score
     
-    def _evaluate_implementation_usefulness(self, implementation: Dict[str, Any]) -> float:
+    def _evaluate_implementation_usefulness(self, stats: Dict[str, Any]) -> float:
         """Evaluate implementation usefulness (0-1)."""
         score = 0.0
         
-        pseudocode = implementation.get('pseudocode', [])
-        if pseudocode and len(pseudocode) >= 1:
+        if stats['pseudocode_count'] >= 1:
             score += 0.3
         
-        complexity = implementation.get('complexity', {})
-        if 'time_complexity' in complexity and 'space_complexity' in complexity:
+        if stats['has_complexity']:
             score += 0.3
         
-        recommendations = implementation.get('recommendations', [])
-        if len(recommendations) >= 3:
+        if stats['recommendations_count'] >= 3:
             score += 0.4
         
         return score
     
-    def _evaluate_math_coverage(self, math_explanations: Dict[str, Any]) -> float:
+    def _evaluate_math_coverage(self, stats: Dict[str, Any]) -> float:
         """Evaluate math coverage (0-1)."""
-        interpretations = math_explanations.get('interpretations', [])
+        interpretations = stats['interpretations_count']
         
         if not interpretations:
             # Check if paper has no equations
-            note = math_explanations.get('note', '')
-            if 'no mathematical equations' in note.lower():
+            if stats['no_equations']:
                 return 1.0  # Perfect score if paper has no equations
             return 0.0
         
         # Score based on number of interpreted equations
-        if len(interpretations) >= 5:
+        if interpretations >= 5:
             return 1.0
-        elif len(interpretations) >= 3:
+        elif interpretations >= 3:
             return 0.8
-        elif len(interpretations) >= 1:
-            return 0.5
         else:
-            return 0.0
+            return 0.5
     
     def _calculate_overall_score(self, evaluation: Dict[str, Any]) -> float:
         """
@@ -408,6 +455,10 @@ class ReportEvaluator:
         return recommendations
 
 
+# Evaluators hold no per-report state, so one instance serves every call
+_evaluator = ReportEvaluator()
+
+
 def evaluate_report(report: Dict[str, Any]) -> Dict[str, Any]:
     """
     Convenience function to evaluate a report.
@@ -418,5 +469,4 @@ def evaluate_report(report: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Evaluation results
     """
-    evaluator = ReportEvaluator()
-    return evaluator.evaluate_report(report)
+    return _evaluator.evaluate_report(report)
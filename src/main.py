@@ -8,13 +8,52 @@ import sys
 import argparse
 from pathlib import Path
 
-from src.orchestrator import OrchestratorAgent
-from src.utils import config, main_logger, get_logger
+from src.utils import config, main_logger, get_logger, file_sha256
 from src.memory import get_session_manager
 
 
+# Defaults shared by the parser and the fast path in _parse_simple_command
+_DEFAULTS = {
+    'pdf': None,
+    'session': None,
+    'no_save': False,
+    'force': False,
+    'list_sessions': False,
+    'get_report': None,
+    'clear_sessions': False,
+    'output_dir': None,
+    'log_level': 'INFO'
+}
+
+
+def _parse_simple_command(argv):
+    """
+    Recognize the session management commands without building the parser.
+    
+    Args:
+        argv: Command-line arguments (without the program name)
+    
+    Returns:
+        Parsed arguments, or None if argparse is needed
+    """
+    args = argparse.Namespace(**_DEFAULTS)
+    if argv == ['--list-sessions']:
+        args.list_sessions = True
+    elif argv == ['--clear-sessions']:
+        args.clear_sessions = True
+    elif len(argv) == 2 and argv[0] == '--get-report' and not argv[1].startswith('-'):
+        args.get_report = argv[1]
+    else:
+        return None
+    return args
+
+
 def parse_arguments():
     """Parse command-line arguments."""
+    args = _parse_simple_command(sys.argv[1:])
+    if args is not None:
+        return args
+    
     parser = argparse.ArgumentParser(
         description='ScholarLens - AI-powered research paper analyzer',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -26,6 +65,9 @@ Examples:
   # Analyze with specific session
   python main.py --pdf paper.pdf --session abc123
   
+  # Analyze again even if the same PDF was analyzed before
+  python main.py --pdf paper.pdf --force
+  
   # List all sessions
   python main.py --list-sessions
   
@@ -55,6 +97,12 @@ Examples:
         help='Do not save outputs to disk'
     )
     
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Analyze even if a report for identical content exists'
+    )
+    
     parser.add_argument(
         '--list-sessions',
         action='store_true',
@@ -84,10 +132,10 @@ Examples:
         '--log-level',
         type=str,
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
-        default='INFO',
-        help='Logging level (default: INFO)'
+        help=f"Logging level (default: {_DEFAULTS['log_level']})"
     )
     
+    parser.set_defaults(**_DEFAULTS)
     return parser.parse_args()
 
 
@@ -113,12 +161,16 @@ def main():
         config.OUTPUTS_DIR = Path(args.output_dir)
         config.OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Initialize orchestrator
+    # Initialize session manager
     try:
-        session_manager = get_session_manager()
-        orchestrator = OrchestratorAgent(session_manager=session_manager, logger=logger)
+        session_manager = get_session_manager(
+            max_sessions=config.MAX_SESSIONS,
+            session_timeout_hours=config.SESSION_TIMEOUT_HOURS,
+            enable_persistence=config.SESSION_PERSISTENCE_ENABLED,
+            persistence_path=config.SESSIONS_DIR
+        )
     except Exception as e:
-        logger.error(f"Failed to initialize orchestrator: {e}")
+        logger.error(f"Failed to initialize session manager: {e}")
         print(f"\n❌ Error: Failed to initialize ScholarLens: {e}")
         return 1
     
@@ -126,7 +178,7 @@ def main():
     try:
         # List sessions
         if args.list_sessions:
-            sessions = orchestrator.list_sessions()
+            sessions = session_manager.list_sessions()
             print(f"\n📋 Active Sessions ({len(sessions)}):\n")
             if not sessions:
                 print("No active sessions.")
@@ -141,7 +193,8 @@ def main():
         
         # Get report for session
         if args.get_report:
-            report = orchestrator.get_session_report(args.get_report)
+            session = session_manager.get_session(args.get_report)
+            report = session.final_report if session else None
             if report:
                 print(f"\n📊 Report for session {args.get_report}:\n")
                 print(report.get('final_markdown', 'No markdown available'))
@@ -151,7 +204,7 @@ def main():
         
         # Clear sessions
         if args.clear_sessions:
-            count = orchestrator.clear_sessions()
+            count = session_manager.clear_all_sessions()
             print(f"\n🗑️  Cleared {count} sessions")
             return 0
         
@@ -163,13 +216,36 @@ def main():
                 print(f"\n❌ Error: PDF file not found: {pdf_path}")
                 return 1
             
+            # Reuse a completed analysis of identical content, unless a
+            # session was named or a fresh run was asked for
+            content_hash = file_sha256(pdf_path, config.UPLOAD_CHUNK_SIZE)
+            cached = None
+            if not args.session and not args.force:
+                cached = session_manager.find_by_content_hash(content_hash)
+            if cached and cached.status == 'completed' and cached.final_report:
+                print(f"\n♻️  {pdf_path.name} was already analyzed in session {cached.session_id}")
+                print("   (pass --force to analyze it again)\n")
+                print(cached.final_report.get('final_markdown', 'No markdown available'))
+                return 0
+            
+            # Initialize orchestrator; imported here because the agents pull in
+            # the LLM and PDF libraries, which session commands don't need
+            try:
+                from src.orchestrator import OrchestratorAgent
+                orchestrator = OrchestratorAgent(session_manager=session_manager, logger=logger)
+            except Exception as e:
+                logger.error(f"Failed to initialize orchestrator: {e}")
+                print(f"\n❌ Error: Failed to initialize ScholarLens: {e}")
+                return 1
+            
             print(f"\n🚀 Starting analysis of: {pdf_path.name}\n")
             
             # Run analysis
             report = orchestrator.analyze_paper(
                 pdf_path=str(pdf_path),
                 session_id=args.session,
-                save_outputs=not args.no_save
+                save_outputs=not args.no_save,
+                content_hash=content_hash
             )
             
             # Print summary
@@ -5,9 +5,17 @@ from .session_manager import (
     SessionData,
     get_session_manager
 )
+from .progress_store import (
+    ProgressStore,
+    RedisProgressStore,
+    create_progress_store
+)
 
 __all__ = [
     'SessionManager',
     'SessionData',
-    'get_session_manager'
+    'get_session_manager',
+    'ProgressStore',
+    'RedisProgressStore',
+    'create_progress_store'
 ]
@@ -0,0 +1,291 @@
+"""
+Progress tracking store for ScholarLens.
+
+Tracks the status of background analysis jobs keyed by session ID.
+The in-memory store serves single-process deployments; the Redis
+store shares state across API workers and survives restarts.
+"""
+
+import json
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value for storage."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value).encode('utf-8')
+
+
+def _loads(data: Any) -> Any:
+    """Deserialize a stored value."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ProgressStore:
+    """In-memory progress store (single process)."""
+    
+    def __init__(self, ttl: int = 3600):
+        """
+        Initialize progress store.
+        
+        Args:
+            ttl: Seconds to keep progress entries (unused in memory)
+        """
+        self.ttl = ttl
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._report_paths: Dict[str, Dict[str, str]] = {}
+        self._content_index: Dict[str, str] = {}
+    
+    async def set_progress(
+        self,
+        session_id: str,
+        progress: Dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> None:
+        """
+        Replace progress entry for a session.
+        
+        Args:
+            session_id: Session ID
+            progress: Progress dictionary
+            ttl: Optional override of the entry lifetime
+        """
+        self._progress[session_id] = dict(progress)
+    
+    async def update_progress(self, session_id: str, **fields) -> None:
+        """
+        Merge fields into the progress entry for a session.
+        
+        Args:
+            session_id: Session ID
+            **fields: Fields to update
+        """
+        self._progress.setdefault(session_id, {}).update(fields)
+    
+    async def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get progress entry for a session.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            Progress dictionary or None if not found
+        """
+        return self._progress.get(session_id)
+    
+    async def get_many(self, session_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get progress entries for several sessions.
+        
+        Args:
+            session_ids: Session IDs
+            
+        Returns:
+            Progress dictionaries (None where not found), in input order
+        """
+        return [self._progress.get(session_id) for session_id in session_ids]
+    
+    async def set_report_paths(self, session_id: str, paths: Dict[str, str]) -> None:
+        """
+        Record generated report files for a session.
+        
+        Unlike progress entries these don't expire: the files stay on disk,
+        so downloads keep working until the session is deleted.
+        
+        Args:
+            session_id: Session ID
+            paths: Mapping of format ('json', 'md') to file path
+        """
+        self._report_paths[session_id] = dict(paths)
+    
+    async def get_report_path(self, session_id: str, fmt: str) -> Optional[str]:
+        """
+        Get the report file path for a session and format.
+        
+        Args:
+            session_id: Session ID
+            fmt: Report format ('json' or 'md')
+        
+        Returns:
+            File path or None if not recorded
+        """
+        return self._report_paths.get(session_id, {}).get(fmt)
+    
+    async def set_content_session(self, content_hash: str, session_id: str) -> None:
+        """
+        Record the session that analyzed a given upload.
+        
+        Args:
+            content_hash: Hex digest of the uploaded file
+            session_id: Session ID holding the completed analysis
+        """
+        self._content_index[content_hash] = session_id
+    
+    async def get_content_session(self, content_hash: str) -> Optional[str]:
+        """
+        Find the session that already analyzed a given upload.
+        
+        Args:
+            content_hash: Hex digest of the uploaded file
+        
+        Returns:
+            Session ID or None if the content has not been analyzed
+        """
+        return self._content_index.get(content_hash)
+    
+    async def delete(self, session_id: str) -> None:
+        """Delete progress entry for a session."""
+        self._progress.pop(session_id, None)
+        self._report_paths.pop(session_id, None)
+    
+    async def clear(self) -> None:
+        """Delete all progress entries."""
+        self._progress.clear()
+        self._report_paths.clear()
+        self._content_index.clear()
+    
+    async def close(self) -> None:
+        """Release store resources."""
+        pass
+
+
+class RedisProgressStore(ProgressStore):
+    """Redis-backed progress store shared across workers."""
+    
+    def __init__(self, url: str, ttl: int = 3600, prefix: str = "scholarlens"):
+        """
+        Initialize Redis progress store.
+        
+        Args:
+            url: Redis connection URL
+            ttl: Seconds to keep progress entries
+            prefix: Key namespace prefix
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis is not installed. Install with: pip install redis")
+        
+        super().__init__(ttl=ttl)
+        self.prefix = prefix
+        self.redis = aioredis.Redis.from_url(url)
+    
+    def _key(self, session_id: str) -> str:
+        """Build progress key for a session."""
+        return f"{self.prefix}:progress:{session_id}"
+    
+    def _report_key(self, session_id: str) -> str:
+        """Build report path key for a session."""
+        return f"{self.prefix}:report:{session_id}"
+    
+    def _content_key(self, content_hash: str) -> str:
+        """Build content index key for an upload digest."""
+        return f"{self.prefix}:content:{content_hash}"
+    
+    async def set_progress(
+        self,
+        session_id: str,
+        progress: Dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> None:
+        """Replace progress entry for a session."""
+        key = self._key(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={k: _dumps(v) for k, v in progress.items()})
+            pipe.expire(key, ttl or self.ttl)
+            await pipe.execute()
+    
+    async def update_progress(self, session_id: str, **fields) -> None:
+        """Merge fields into the progress entry for a session."""
+        key = self._key(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={k: _dumps(v) for k, v in fields.items()})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+    
+    async def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get progress entry for a session."""
+        raw = await self.redis.hgetall(self._key(session_id))
+        return self._decode(raw)
+    
+    async def get_many(self, session_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get progress entries for several sessions in one round-trip."""
+        if not session_ids:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(self._key(session_id))
+            results = await pipe.execute()
+        return [self._decode(raw) for raw in results]
+    
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Optional[Dict[str, Any]]:
+        """Decode a raw progress hash."""
+        if not raw:
+            return None
+        return {k.decode('utf-8'): _loads(v) for k, v in raw.items()}
+    
+    async def set_report_paths(self, session_id: str, paths: Dict[str, str]) -> None:
+        """Record generated report files for a session (no expiry)."""
+        if not paths:
+            return
+        await self.redis.hset(self._report_key(session_id), mapping=paths)
+    
+    async def get_report_path(self, session_id: str, fmt: str) -> Optional[str]:
+        """Get the report file path for a session and format."""
+        path = await self.redis.hget(self._report_key(session_id), fmt)
+        return path.decode('utf-8') if path else None
+    
+    async def set_content_session(self, content_hash: str, session_id: str) -> None:
+        """Record the session that analyzed a given upload."""
+        await self.redis.set(self._content_key(content_hash), session_id, ex=self.ttl)
+    
+    async def get_content_session(self, content_hash: str) -> Optional[str]:
+        """Find the session that already analyzed a given upload."""
+        session_id = await self.redis.get(self._content_key(content_hash))
+        return session_id.decode('utf-8') if session_id else None
+    
+    async def delete(self, session_id: str) -> None:
+        """Delete progress entry for a session."""
+        await self.redis.delete(self._key(session_id), self._report_key(session_id))
+    
+    async def clear(self) -> None:
+        """Delete all progress entries."""
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
+
+def create_progress_store(redis_url: str = "", ttl: int = 3600) -> ProgressStore:
+    """
+    Create a progress store for the configured backend.
+    
+    Args:
+        redis_url: Redis URL (in-memory store is used when empty)
+        ttl: Seconds to keep progress entries
+    
+    Returns:
+        ProgressStore instance
+    """
+    if redis_url:
+        return RedisProgressStore(redis_url, ttl=ttl)
+    return ProgressStore(ttl=ttl)
@@ -5,15 +5,123 @@ Manages paper analysis sessions, stores intermediate results,
 and maintains conversation history.
 """
 
+import os
+import time
 import uuid
+import heapq
+import queue
+import hashlib
+import atexit
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field, fields, replace, MISSING
 import json
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+def _dumps(value: Any, indent: bool = False) -> bytes:
+    """Serialize session data as UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option)
+    if indent:
+        return json.dumps(value, indent=2).encode('utf-8')
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize session data."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Document fields larger than this (estimated serialized bytes) are stored
+# in a sidecar file, so session snapshots don't rewrite them
+_SPILL_THRESHOLD = 64 * 1024
+
+
+def _exceeds_size(value: Any, limit: int) -> bool:
+    """
+    Estimate whether a value serializes to more than limit bytes.
+    
+    Walks the value counting string and byte lengths, stopping as soon as
+    the limit is passed, so large fields are found without encoding them.
+    
+    Args:
+        value: JSON-compatible value
+        limit: Size in bytes
+        
+    Returns:
+        True if the estimate exceeds the limit
+    """
+    remaining = limit
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes)):
+            remaining -= len(item) + 2
+        elif isinstance(item, dict):
+            remaining -= 2
+            for key, child in item.items():
+                remaining -= len(str(key)) + 4
+                stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            remaining -= 2
+            stack.extend(item)
+        else:
+            remaining -= 8
+        if remaining < 0:
+            return True
+    return False
+
+# Attempts at writing a session's queued state before it is dropped
+_MAX_WRITE_ATTEMPTS = 3
+
+# Most buffers a single writev() call accepts
+_IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') else 16
+
+
+def _write_buffers(fd: int, buffers: List[bytes]) -> None:
+    """Write buffers to a file descriptor, gathering them per syscall."""
+    if not hasattr(os, 'writev'):
+        os.write(fd, b''.join(buffers))
+        return
+    for start in range(0, len(buffers), _IOV_MAX):
+        batch = buffers[start:start + _IOV_MAX]
+        written = os.writev(fd, batch)
+        total = sum(len(buf) for buf in batch)
+        if written < total:
+            # Short write (e.g. interrupted); finish with plain writes
+            rest = memoryview(b''.join(batch))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary file and rename, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+@dataclass(slots=True)
 class SessionData:
     """Represents a paper analysis session."""
     session_id: str
@@ -26,12 +134,31 @@ class SessionData:
     metadata: Dict[str, Any] = field(default_factory=dict)
     status: str = "initialized"  # initialized, processing, completed, failed
     
+    # ISO strings of the timestamps, formatted once per change
+    _created_at_iso: str = field(default="", init=False, repr=False, compare=False)
+    _last_accessed_iso: str = field(default="", init=False, repr=False, compare=False)
+    # Monotonic clock reading of the last access, used for expiry
+    _last_access_ns: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._created_at_iso = self.created_at.isoformat()
+        self._last_accessed_iso = self.last_accessed.isoformat()
+        # Sessions loaded from disk were last accessed before this process started
+        age = datetime.now() - self.last_accessed
+        self._last_access_ns = time.monotonic_ns() - int(age.total_seconds() * 1e9)
+    
+    def _touch(self) -> None:
+        """Mark session as accessed now."""
+        self.last_accessed = datetime.now()
+        self._last_accessed_iso = self.last_accessed.isoformat()
+        self._last_access_ns = time.monotonic_ns()
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary."""
         return {
             'session_id': self.session_id,
-            'created_at': self.created_at.isoformat(),
-            'last_accessed': self.last_accessed.isoformat(),
+            'created_at': self._created_at_iso,
+            'last_accessed': self._last_accessed_iso,
             'paper_path': self.paper_path,
             'document': self.document,
             'agent_outputs': self.agent_outputs,
@@ -45,7 +172,51 @@ class SessionData:
         """Create session from dictionary."""
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         data['last_accessed'] = datetime.fromisoformat(data['last_accessed'])
-        return cls(**data)
+        # Ignore unknown keys from older or foreign files
+        fields = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in fields and fields[k].init})
+
+
+def _record_field(f) -> tuple:
+    """Translate a SessionData field into a msgspec.defstruct field spec."""
+    if f.default_factory is not MISSING:
+        return (f.name, f.type, msgspec.field(default_factory=f.default_factory))
+    if f.default is not MISSING:
+        return (f.name, f.type, f.default)
+    return (f.name, f.type)
+
+
+if MSGSPEC_AVAILABLE:
+    # Typed persistence schema generated from SessionData's init fields, so
+    # the two can't drift apart
+    _SessionRecord = msgspec.defstruct(
+        '_SessionRecord',
+        [_record_field(f) for f in fields(SessionData) if f.init]
+    )
+    
+    _session_encoder = msgspec.json.Encoder()
+    _session_decoder = msgspec.json.Decoder(_SessionRecord)
+
+
+def _encode_session(session: SessionData, document: Optional[Dict[str, Any]]) -> bytes:
+    """Serialize a session snapshot, using msgspec's typed encoder when available."""
+    if MSGSPEC_AVAILABLE:
+        values = {name: getattr(session, name) for name in _SessionRecord.__struct_fields__}
+        values['document'] = document
+        return _session_encoder.encode(_SessionRecord(**values))
+    return _dumps(dict(session.to_dict(), document=document))
+
+
+def _decode_session(data: bytes) -> SessionData:
+    """Deserialize a session snapshot."""
+    if MSGSPEC_AVAILABLE:
+        try:
+            record = _session_decoder.decode(data)
+            return SessionData(**{name: getattr(record, name) for name in record.__struct_fields__})
+        except msgspec.ValidationError:
+            # Files that don't match the schema take the untyped path
+            pass
+    return SessionData.from_dict(_loads(data))
 
 
 class SessionManager:
@@ -69,23 +240,59 @@ class SessionManager:
         """
         self.max_sessions = max_sessions
         self.session_timeout = timedelta(hours=session_timeout_hours)
+        self.session_timeout_ns = session_timeout_hours * 3600 * 10**9
         self.enable_persistence = enable_persistence
         self.persistence_path = persistence_path
         
-        # In-memory session storage
-        self.sessions: Dict[str, SessionData] = {}
+        # In-memory session storage, least recently accessed first (LRU order)
+        self.sessions: "OrderedDict[str, SessionData]" = OrderedDict()
+        
+        # SHA-256 of analyzed PDFs -> session ID, for reusing reports
+        self.content_index: Dict[str, str] = {}
+        
+        # Guards sessions and content_index; analyses may run on several
+        # threads (see OrchestratorAgent.process_batch). One lock rather than
+        # per-bucket stripes: LRU eviction, the content index and the expiry
+        # heap all span sessions, so stripes would still need a global lock
+        # for them, and critical sections are dict operations (no I/O) that
+        # are dwarfed by the LLM calls each analysis makes between them
+        self._lock = threading.RLock()
         
-        # Session access tracking for LRU eviction
-        self.access_order: List[str] = []
+        # Expiry deadlines as (monotonic ns, session ID); entries go stale
+        # when a session is touched again and are skipped by the sweeper
+        self._expiry_heap: List[Tuple[int, str]] = []
+        self._expiry_cv = threading.Condition(self._lock)
+        
+        # Background persistence: latest unsaved state per session, written
+        # by a daemon thread so callers never wait on disk I/O
+        self._pending: Dict[str, SessionData] = {}
+        # Agent outputs waiting to be appended to the session's log file
+        self._pending_appends: Dict[str, List[Tuple[str, Any]]] = {}
+        # Per session: digest of the large fields in its sidecar file, so
+        # unchanged fields aren't rewritten (guarded by _io_lock)
+        self._spilled_docs: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._write_q: "queue.Queue[Optional[str]]" = queue.Queue()
+        # Consecutive failed writes per session (writer thread only)
+        self._write_failures: Dict[str, int] = {}
+        
+        # Sweeper and writer threads start on first use, once per process;
+        # threads don't survive fork, so a child starts its own
+        self._threads_lock = threading.Lock()
+        self._threads_pid: Optional[int] = None
+        self._closed = threading.Event()
         
         # Load persisted sessions if enabled
         if self.enable_persistence and self.persistence_path:
             self._load_sessions()
+            atexit.register(self.close)
     
     def create_session(
         self,
         paper_path: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None
     ) -> str:
         """
         Create a new analysis session.
@@ -93,12 +300,14 @@ class SessionManager:
         Args:
             paper_path: Path to the paper being analyzed
             metadata: Optional metadata for the session
+            session_id: Optional ID for the session (generated if not provided)
             
         Returns:
             Session ID
         """
         # Generate unique session ID
-        session_id = str(uuid.uuid4())
+        if session_id is None:
+            session_id = str(uuid.uuid4())
         
         # Create session
         now = datetime.now()
@@ -111,46 +320,51 @@ class SessionManager:
             status="initialized"
         )
         
-        # Store session
-        self.sessions[session_id] = session
-        self.access_order.append(session_id)
-        
-        # Evict old sessions if needed
-        self._evict_if_needed()
-        
-        # Persist if enabled
-        if self.enable_persistence:
-            self._persist_session(session_id)
+        with self._lock:
+            # Store session
+            self.sessions[session_id] = session
+            self._index_content(session)
+            self._schedule_expiry(session)
+            
+            # Evict old sessions if needed
+            self._evict_if_needed()
+            
+            # Persist if enabled
+            if self.enable_persistence:
+                self._persist_session(session_id)
         
         return session_id
     
-    def get_session(self, session_id: str) -> Optional[SessionData]:
+    def get_session(self, session_id: str, touch: bool = True) -> Optional[SessionData]:
         """
         Get session by ID.
         
         Args:
             session_id: Session ID
+            touch: Mark the session as accessed; read-only callers pass
+                False to leave its access time and LRU position alone
             
         Returns:
-            SessionData or None if not found
+            SessionData or None if not found or expired
         """
-        session = self.sessions.get(session_id)
-        
-        if session:
-            # Update last accessed time
-            session.last_accessed = datetime.now()
-            
-            # Update access order
-            if session_id in self.access_order:
-                self.access_order.remove(session_id)
-            self.access_order.append(session_id)
+        with self._lock:
+            session = self.sessions.get(session_id)
             
-            # Check if session is expired
-            if self._is_expired(session):
-                self.delete_session(session_id)
+            if session and self._is_expired(session):
+                # The sweeper may not have reached it yet; never revive it
+                if touch:
+                    self.delete_session(session_id)
                 return None
-        
-        return session
+            
+            if session and touch:
+                # Update last accessed time
+                session._touch()
+                self._schedule_expiry(session)
+                
+                # Update access order
+                self.sessions.move_to_end(session_id)
+            
+            return session
     
     def update_session(
         self,
@@ -167,22 +381,26 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        session = self.get_session(session_id)
-        if not session:
-            return False
-        
-        # Update fields
-        for key, value in updates.items():
-            if hasattr(session, key):
-                setattr(session, key, value)
-        
-        session.last_accessed = datetime.now()
-        
-        # Persist if enabled
-        if self.enable_persistence:
-            self._persist_session(session_id)
-        
-        return True
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return False
+            
+            # Update fields
+            for key, value in updates.items():
+                if hasattr(session, key):
+                    setattr(session, key, value)
+            if 'created_at' in updates:
+                session._created_at_iso = session.created_at.isoformat()
+            
+            session._touch()
+            self._schedule_expiry(session)
+            
+            # Persist if enabled
+            if self.enable_persistence:
+                self._persist_session(session_id)
+            
+            return True
     
     def store_document(
         self,
@@ -210,6 +428,10 @@ class SessionManager:
         """
         Store agent output in session.
         
+        The session takes ownership of output: it is kept and persisted by
+        reference rather than copied, so callers must not mutate it after
+        storing it.
+        
         Args:
             session_id: Session ID
             agent_name: Name of the agent
@@ -218,18 +440,18 @@ class SessionManager:
         Returns:
             True if successful
         """
-        session = self.get_session(session_id)
-        if not session:
-            return False
-        
-        session.agent_outputs[agent_name] = output
-        session.last_accessed = datetime.now()
-        
-        # Persist if enabled
-        if self.enable_persistence:
-            self._persist_session(session_id)
-        
-        return True
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return False
+            
+            session.agent_outputs[agent_name] = output
+            
+            # Persist if enabled (appended to the log, not a full rewrite)
+            if self.enable_persistence:
+                self._append_agent_output(session_id, agent_name, output)
+            
+            return True
     
     def get_agent_output(
         self,
@@ -246,7 +468,7 @@ class SessionManager:
         Returns:
             Agent output dictionary or None
         """
-        session = self.get_session(session_id)
+        session = self.get_session(session_id, touch=False)
         if not session:
             return None
         
@@ -282,7 +504,7 @@ class SessionManager:
         Returns:
             Dictionary with all session data
         """
-        session = self.get_session(session_id)
+        session = self.get_session(session_id, touch=False)
         if not session:
             return None
         
@@ -304,21 +526,26 @@ class SessionManager:
         Returns:
             True if deleted, False if not found
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            
-            if session_id in self.access_order:
-                self.access_order.remove(session_id)
-            
-            # Remove persisted file if enabled
-            if self.enable_persistence and self.persistence_path:
-                session_file = self.persistence_path / f"{session_id}.json"
-                if session_file.exists():
-                    session_file.unlink()
+        with self._lock:
+            if session_id in self.sessions:
+                self._unindex_content(self.sessions.pop(session_id))
+                
+                # Remove persisted file if enabled
+                if self.enable_persistence and self.persistence_path:
+                    with self._pending_lock:
+                        self._pending.pop(session_id, None)
+                        self._pending_appends.pop(session_id, None)
+                    session_file = self.persistence_path / f"{session_id}.json"
+                    with self._io_lock:
+                        if session_file.exists():
+                            session_file.unlink()
+                        self._log_path(session_id).unlink(missing_ok=True)
+                        self._doc_path(session_id).unlink(missing_ok=True)
+                        self._spilled_docs.pop(session_id, None)
+                
+                return True
             
-            return True
-        
-        return False
+            return False
     
     def clear_all_sessions(self) -> int:
         """
@@ -327,16 +554,27 @@ class SessionManager:
         Returns:
             Number of sessions cleared
         """
-        count = len(self.sessions)
-        self.sessions.clear()
-        self.access_order.clear()
-        
-        # Clear persisted files if enabled
-        if self.enable_persistence and self.persistence_path:
-            for session_file in self.persistence_path.glob("*.json"):
-                session_file.unlink()
-        
-        return count
+        with self._lock:
+            count = len(self.sessions)
+            self.sessions.clear()
+            self.content_index.clear()
+            self._expiry_heap.clear()
+            
+            # Clear persisted files if enabled
+            if self.enable_persistence and self.persistence_path:
+                with self._pending_lock:
+                    self._pending.clear()
+                    self._pending_appends.clear()
+                with self._io_lock:
+                    for session_file in self.persistence_path.glob("*.json"):
+                        session_file.unlink()
+                    for log_file in self.persistence_path.glob("*.log.jsonl"):
+                        log_file.unlink()
+                    for doc_file in self.persistence_path.glob("*.doc.bin"):
+                        doc_file.unlink()
+                    self._spilled_docs.clear()
+            
+            return count
     
     def list_sessions(self) -> List[Dict[str, Any]]:
         """
@@ -345,19 +583,17 @@ class SessionManager:
         Returns:
             List of session summaries
         """
-        sessions = []
-        for session_id in self.access_order:
-            session = self.sessions.get(session_id)
-            if session:
-                sessions.append({
+        with self._lock:
+            return [
+                {
                     'session_id': session.session_id,
                     'paper_path': session.paper_path,
                     'status': session.status,
-                    'created_at': session.created_at.isoformat(),
-                    'last_accessed': session.last_accessed.isoformat()
-                })
-        
-        return sessions
+                    'created_at': session._created_at_iso,
+                    'last_accessed': session._last_accessed_iso
+                }
+                for session in self.sessions.values()
+            ]
     
     def get_session_count(self) -> int:
         """
@@ -368,36 +604,358 @@ class SessionManager:
         """
         return len(self.sessions)
     
+    def find_by_content_hash(self, content_hash: str) -> Optional[SessionData]:
+        """
+        Find the session that analyzed a PDF with the given content.
+        
+        Args:
+            content_hash: SHA-256 hex digest of the PDF
+            
+        Returns:
+            SessionData or None if the content has not been seen
+        """
+        with self._lock:
+            session_id = self.content_index.get(content_hash)
+            if session_id is None:
+                return None
+            
+            session = self.get_session(session_id)
+            if session is None:
+                self.content_index.pop(content_hash, None)
+            return session
+    
+    def set_content_hash(self, session_id: str, content_hash: str) -> bool:
+        """
+        Record the content hash of the PDF a session analyzes.
+        
+        Args:
+            session_id: Session ID
+            content_hash: SHA-256 hex digest of the PDF
+            
+        Returns:
+            True if recorded, False if session not found
+        """
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return False
+            
+            self._unindex_content(session)
+            session.metadata['content_hash'] = content_hash
+            self._index_content(session)
+            
+            if self.enable_persistence:
+                self._persist_session(session_id)
+            
+            return True
+    
+    def _index_content(self, session: SessionData) -> None:
+        """Record the session's content hash, if any."""
+        content_hash = session.metadata.get('content_hash')
+        if content_hash:
+            self.content_index[content_hash] = session.session_id
+    
+    def _unindex_content(self, session: SessionData) -> None:
+        """Drop the session's content hash entry."""
+        content_hash = session.metadata.get('content_hash')
+        if content_hash and self.content_index.get(content_hash) == session.session_id:
+            del self.content_index[content_hash]
+    
+    def _ensure_threads(self) -> None:
+        """Start the sweeper and writer threads if this process has none yet."""
+        if self._threads_pid == os.getpid() or self._closed.is_set():
+            return
+        
+        with self._threads_lock:
+            pid = os.getpid()
+            if self._threads_pid == pid:
+                return
+            if self._threads_pid is not None:
+                # Forked child: the parent's queued writes are the parent's
+                # to make, and its queue may be mid-operation
+                self._write_q = queue.Queue()
+                self._pending.clear()
+                self._pending_appends.clear()
+                self._write_failures.clear()
+            self._threads_pid = pid
+            threading.Thread(target=self._sweeper_loop, daemon=True).start()
+            if self.enable_persistence and self.persistence_path:
+                threading.Thread(target=self._writer_loop, daemon=True).start()
+    
+    def close(self) -> None:
+        """Write pending sessions to disk and stop the background threads."""
+        if self._closed.is_set():
+            return
+        
+        self.flush()
+        self._closed.set()
+        with self._expiry_cv:
+            self._expiry_cv.notify_all()
+        if self._threads_pid == os.getpid():
+            self._write_q.put(None)
+        atexit.unregister(self.close)
+    
+    def _schedule_expiry(self, session: SessionData) -> None:
+        """Queue the session's expiry deadline for the sweeper."""
+        self._ensure_threads()
+        deadline = session._last_access_ns + self.session_timeout_ns
+        with self._expiry_cv:
+            # Rebuild once stale entries dominate the heap
+            if len(self._expiry_heap) > 2 * len(self.sessions) + 64:
+                self._expiry_heap = [
+                    (s._last_access_ns + self.session_timeout_ns, s.session_id)
+                    for s in self.sessions.values()
+                ]
+                heapq.heapify(self._expiry_heap)
+            heapq.heappush(self._expiry_heap, (deadline, session.session_id))
+            if self._expiry_heap[0][1] == session.session_id:
+                self._expiry_cv.notify()
+    
+    def _sweeper_loop(self) -> None:
+        """Delete sessions as their deadlines pass (runs in a daemon thread)."""
+        with self._expiry_cv:
+            while not self._closed.is_set():
+                if not self._expiry_heap:
+                    self._expiry_cv.wait()
+                    continue
+                
+                delay_ns = self._expiry_heap[0][0] - time.monotonic_ns()
+                if delay_ns > 0:
+                    self._expiry_cv.wait(delay_ns / 1e9)
+                    continue
+                
+                _, session_id = heapq.heappop(self._expiry_heap)
+                session = self.sessions.get(session_id)
+                if session is not None and self._is_expired(session):
+                    try:
+                        self.delete_session(session_id)
+                    except Exception as e:
+                        print(f"Error expiring session {session_id}: {e}")
+    
     def _is_expired(self, session: SessionData) -> bool:
         """Check if session is expired."""
-        age = datetime.now() - session.last_accessed
-        return age > self.session_timeout
+        return time.monotonic_ns() - session._last_access_ns > self.session_timeout_ns
     
     def _evict_if_needed(self) -> None:
         """Evict oldest sessions if max capacity reached."""
         while len(self.sessions) > self.max_sessions:
-            if not self.access_order:
-                break
-            
             # Remove least recently accessed session
-            oldest_id = self.access_order.pop(0)
-            if oldest_id in self.sessions:
-                del self.sessions[oldest_id]
+            _, session = self.sessions.popitem(last=False)
+            self._unindex_content(session)
     
     def _persist_session(self, session_id: str) -> None:
-        """Persist session to disk."""
-        if not self.persistence_path:
+        """Queue session for writing to disk by the background writer."""
+        if not self.persistence_path or self._closed.is_set():
             return
+        self._ensure_threads()
         
         session = self.sessions.get(session_id)
         if not session:
             return
         
+        # Successive updates before the write coalesce into one
+        with self._pending_lock:
+            queued = session_id in self._pending or session_id in self._pending_appends
+            self._pending[session_id] = session
+        if not queued:
+            self._write_q.put(session_id)
+    
+    def _append_agent_output(self, session_id: str, agent_name: str, output: Any) -> None:
+        """Queue an agent output for appending to the session's log file."""
+        if not self.persistence_path or self._closed.is_set():
+            return
+        self._ensure_threads()
+        
+        with self._pending_lock:
+            queued = session_id in self._pending or session_id in self._pending_appends
+            self._pending_appends.setdefault(session_id, []).append((agent_name, output))
+        if not queued:
+            self._write_q.put(session_id)
+    
+    def flush(self) -> None:
+        """Block until all queued session writes are on disk."""
+        if self.enable_persistence and self.persistence_path and self._threads_pid == os.getpid():
+            self._write_q.join()
+    
+    def _writer_loop(self) -> None:
+        """Write queued sessions to disk (runs in a daemon thread)."""
+        while True:
+            session_id = self._write_q.get()
+            if session_id is None:
+                # Sentinel from close()
+                self._write_q.task_done()
+                return
+            session = appends = None
+            try:
+                # Take the queued state and copy the session's containers under
+                # the session lock, so encoding can't race store_agent_output
+                with self._lock, self._pending_lock:
+                    session = self._pending.pop(session_id, None)
+                    appends = self._pending_appends.pop(session_id, None)
+                    snapshot = self._snapshot(session) if session is not None else None
+                # A full snapshot already includes any queued outputs
+                if snapshot is not None:
+                    self._write_session(snapshot)
+                elif appends:
+                    self._write_log(session_id, appends)
+                self._write_failures.pop(session_id, None)
+            except Exception as e:
+                print(f"Error persisting session {session_id}: {e}")
+                self._requeue(session_id, session, appends)
+            finally:
+                self._write_q.task_done()
+    
+    @staticmethod
+    def _snapshot(session: SessionData) -> SessionData:
+        """Copy a session with its own agent_outputs and metadata dicts."""
+        return replace(
+            session,
+            agent_outputs=dict(session.agent_outputs),
+            metadata=dict(session.metadata)
+        )
+    
+    def _requeue(
+        self,
+        session_id: str,
+        session: Optional[SessionData],
+        appends: Optional[List[Tuple[str, Any]]]
+    ) -> None:
+        """Put back state whose write failed, up to _MAX_WRITE_ATTEMPTS."""
+        attempts = self._write_failures.get(session_id, 0) + 1
+        if attempts >= _MAX_WRITE_ATTEMPTS:
+            self._write_failures.pop(session_id, None)
+            print(f"Dropping unsaved state of session {session_id} after {attempts} failed writes")
+            return
+        self._write_failures[session_id] = attempts
+        
+        with self._pending_lock:
+            queued = session_id in self._pending or session_id in self._pending_appends
+            if session is not None:
+                # A snapshot queued since supersedes this one
+                self._pending.setdefault(session_id, session)
+            if appends:
+                self._pending_appends[session_id] = appends + self._pending_appends.get(session_id, [])
+        if not queued:
+            self._write_q.put(session_id)
+    
+    def _write_session(self, session: SessionData) -> None:
+        """Write session to disk."""
+        self.persistence_path.mkdir(parents=True, exist_ok=True)
+        
+        session_file = self.persistence_path / f"{session.session_id}.json"
+        with self._io_lock:
+            # Skip sessions deleted while queued
+            if session.session_id not in self.sessions:
+                return
+            document = self._spill_document(session)
+            _write_atomic(session_file, _encode_session(session, document))
+            # The snapshot supersedes the log, but only once it is on disk
+            self._log_path(session.session_id).unlink(missing_ok=True)
+    
+    def _write_log(self, session_id: str, appends: List[Tuple[str, Any]]) -> None:
+        """Append agent outputs to the session's log file."""
         self.persistence_path.mkdir(parents=True, exist_ok=True)
         
-        session_file = self.persistence_path / f"{session_id}.json"
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session.to_dict(), f, indent=2)
+        buffers = [
+            _dumps({'t': time.time_ns(), 'a': agent_name, 'o': output}) + b'\n'
+            for agent_name, output in appends
+        ]
+        with self._io_lock:
+            if session_id not in self.sessions:
+                return
+            fd = os.open(self._log_path(session_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                try:
+                    _write_buffers(fd, buffers)
+                except OSError:
+                    # Cut the partial record so the retried records don't
+                    # follow a torn line, which replay would stop at
+                    os.ftruncate(fd, size)
+                    raise
+            finally:
+                os.close(fd)
+    
+    def _replay_log(self, session: SessionData) -> None:
+        """Apply agent outputs logged after the session's last snapshot."""
+        log_file = self._log_path(session.session_id)
+        if not log_file.exists():
+            return
+        
+        for line in log_file.read_bytes().splitlines():
+            try:
+                record = _loads(line)
+            except ValueError:
+                # Torn final line from an interrupted write
+                break
+            session.agent_outputs[record['a']] = record['o']
+    
+    def _spill_document(self, session: SessionData) -> Optional[Dict[str, Any]]:
+        """
+        Get the document as stored in the snapshot, spilling large fields.
+        
+        Large fields are written to the session's sidecar file, rewritten
+        only when their content changes, and replaced by {'_spill': filename}
+        references. Called with _io_lock held.
+        
+        Args:
+            session: Session being written
+            
+        Returns:
+            Document with large fields replaced by references
+        """
+        document = session.document
+        if not document:
+            return document
+        
+        large = {
+            key: value for key, value in document.items()
+            if _exceeds_size(value, _SPILL_THRESHOLD)
+        }
+        doc_path = self._doc_path(session.session_id)
+        if not large:
+            if self._spilled_docs.pop(session.session_id, None) is not None:
+                doc_path.unlink(missing_ok=True)
+            return document
+        
+        data = _dumps(large)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if self._spilled_docs.get(session.session_id) != digest:
+            _write_atomic(doc_path, data)
+            self._spilled_docs[session.session_id] = digest
+        
+        stored = dict(document)
+        for key in large:
+            stored[key] = {'_spill': doc_path.name}
+        return stored
+    
+    def _restore_document(self, session: SessionData) -> None:
+        """Load spilled document fields back from the sidecar file."""
+        document = session.document
+        if not document:
+            return
+        
+        spilled_keys = [
+            key for key, value in document.items()
+            if isinstance(value, dict) and '_spill' in value
+        ]
+        if not spilled_keys:
+            return
+        
+        data = self._doc_path(session.session_id).read_bytes()
+        large = _loads(data)
+        for key in spilled_keys:
+            document[key] = large[key]
+        with self._io_lock:
+            self._spilled_docs[session.session_id] = hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _doc_path(self, session_id: str) -> Path:
+        """Get the spilled document file for a session."""
+        return self.persistence_path / f"{session_id}.doc.bin"
+    
+    def _log_path(self, session_id: str) -> Path:
+        """Get the agent output log file for a session."""
+        return self.persistence_path / f"{session_id}.log.jsonl"
     
     def _load_sessions(self) -> None:
         """Load persisted sessions from disk."""
@@ -406,14 +964,15 @@ class SessionManager:
         
         for session_file in self.persistence_path.glob("*.json"):
             try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    session = SessionData.from_dict(data)
-                    
-                    # Only load non-expired sessions
-                    if not self._is_expired(session):
-                        self.sessions[session.session_id] = session
-                        self.access_order.append(session.session_id)
+                session = _decode_session(session_file.read_bytes())
+                self._restore_document(session)
+                self._replay_log(session)
+                
+                # Only load non-expired sessions
+                if not self._is_expired(session):
+                    self.sessions[session.session_id] = session
+                    self._index_content(session)
+                    self._schedule_expiry(session)
             except Exception as e:
                 print(f"Error loading session from {session_file}: {e}")
     
@@ -438,8 +997,7 @@ class SessionManager:
         
         export_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(export_path, 'w', encoding='utf-8') as f:
-            json.dump(session.to_dict(), f, indent=2)
+        export_path.write_bytes(_dumps(session.to_dict(), indent=True))
         
         return True
     
@@ -457,17 +1015,73 @@ class SessionManager:
             return None
         
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                session = SessionData.from_dict(data)
-                
-                self.sessions[session.session_id] = session
-                self.access_order.append(session.session_id)
-                
-                return session.session_id
+            return self.add_session(_decode_session(import_path.read_bytes()))
         except Exception as e:
             print(f"Error importing session: {e}")
             return None
+    
+    def add_session(self, session: SessionData) -> str:
+        """
+        Add a session built elsewhere, e.g. by an analysis worker process.
+        
+        Args:
+            session: Session data; replaces any session with the same ID
+            
+        Returns:
+            Session ID
+        """
+        with self._lock:
+            previous = self.sessions.get(session.session_id)
+            if previous is not None:
+                self._unindex_content(previous)
+            self.sessions[session.session_id] = session
+            self.sessions.move_to_end(session.session_id)
+            self._index_content(session)
+            self._schedule_expiry(session)
+            self._evict_if_needed()
+            
+            if self.enable_persistence:
+                self._persist_session(session.session_id)
+        
+        return session.session_id
+    
+    def copy_session(
+        self,
+        session_id: str,
+        new_session_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Add a copy of a session under a new ID, e.g. for a re-upload of a
+        paper that was already analyzed.
+        
+        Args:
+            session_id: ID of the session to copy
+            new_session_id: ID for the copy
+            metadata: Optional metadata merged into the copy's metadata
+            
+        Returns:
+            New session ID, or None if the source session doesn't exist
+        """
+        with self._lock:
+            source = self.get_session(session_id, touch=False)
+            if source is None:
+                return None
+            
+            # The document and report are read-only once analysis completes,
+            # so only the containers that sessions mutate are copied
+            now = datetime.now()
+            return self.add_session(SessionData(
+                session_id=new_session_id,
+                created_at=now,
+                last_accessed=now,
+                paper_path=source.paper_path,
+                document=source.document,
+                agent_outputs=dict(source.agent_outputs),
+                final_report=source.final_report,
+                metadata={**source.metadata, **(metadata or {})},
+                status=source.status
+            ))
 
 
 # Global session manager instance
@@ -476,7 +1090,9 @@ _global_session_manager: Optional[SessionManager] = None
 
 def get_session_manager(
     max_sessions: int = 100,
-    session_timeout_hours: int = 24
+    session_timeout_hours: int = 24,
+    enable_persistence: bool = False,
+    persistence_path: Optional[Path] = None
 ) -> SessionManager:
     """
     Get or create global session manager.
@@ -484,6 +1100,8 @@ def get_session_manager(
     Args:
         max_sessions: Maximum sessions to keep
         session_timeout_hours: Session timeout in hours
+        enable_persistence: Whether to persist sessions to disk
+        persistence_path: Path for session persistence
         
     Returns:
         SessionManager instance
@@ -493,7 +1111,9 @@ def get_session_manager(
     if _global_session_manager is None:
         _global_session_manager = SessionManager(
             max_sessions=max_sessions,
-            session_timeout_hours=session_timeout_hours
+            session_timeout_hours=session_timeout_hours,
+            enable_persistence=enable_persistence,
+            persistence_path=persistence_path
         )
     
     return _global_session_manager
@@ -7,7 +7,8 @@ error recovery, and session management.
 """
 
 import time
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 from src.agents import (
@@ -19,7 +20,7 @@ from src.agents import (
     ImplementationAgent,
     AggregatorAgent
 )
-from src.memory import SessionManager, get_session_manager
+from src.memory import SessionManager, SessionData, get_session_manager
 from src.utils import get_logger, config, export_json, export_markdown
 from src.tools import parse_pdf
 
@@ -68,15 +69,20 @@ class OrchestratorAgent:
         self,
         pdf_path: str,
         session_id: Optional[str] = None,
-        save_outputs: bool = True
+        save_outputs: bool = True,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyze a research paper through the full agent pipeline.
         
         Args:
             pdf_path: Path to PDF file
-            session_id: Optional session ID (creates new if not provided)
+            session_id: Optional session ID (a new session is created, under
+                this ID if given, unless it already exists)
             save_outputs: Whether to save outputs to disk
+            content_hash: SHA-256 of the PDF, recorded on the session so
+                later runs on the same content can reuse the report, and
+                passed to document extraction instead of hashing again
             
         Returns:
             Final research report dictionary
@@ -89,22 +95,31 @@ class OrchestratorAgent:
         if not pdf_path_obj.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
+        # Placeholder reports (no API key) must not be reused for this content
+        reuse_hash = content_hash if self.summary_agent.llm_enabled else None
+        
         # Create or retrieve session
-        if session_id is None:
+        if session_id is None or self.session_manager.get_session(session_id) is None:
+            metadata = {'started_at': time.time()}
+            if reuse_hash:
+                metadata['content_hash'] = reuse_hash
             session_id = self.session_manager.create_session(
                 paper_path=str(pdf_path_obj),
-                metadata={'started_at': time.time()}
+                metadata=metadata,
+                session_id=session_id
             )
             self.logger.info(f"Created new session: {session_id}")
         else:
             self.logger.info(f"Using existing session: {session_id}")
+            if reuse_hash:
+                self.session_manager.set_content_hash(session_id, reuse_hash)
         
         try:
             # Stage 1: Document Extraction
             self.logger.info("=" * 60)
             self.logger.info("STAGE 1: Document Extraction")
             self.logger.info("=" * 60)
-            document_result = self._run_document_extraction(session_id, str(pdf_path_obj))
+            document_result = self._run_document_extraction(session_id, str(pdf_path_obj), content_hash)
             
             # Stage 2: Parallel Analysis (sequential for now)
             self.logger.info("=" * 60)
@@ -122,8 +137,9 @@ class OrchestratorAgent:
             self.session_manager.store_final_report(session_id, final_report)
             
             # Save outputs to disk
+            output_files = {}
             if save_outputs:
-                self._save_outputs(pdf_path_obj, final_report)
+                output_files = self._save_outputs(pdf_path_obj, final_report)
             
             # Calculate total duration
             total_duration = time.time() - start_time
@@ -132,24 +148,90 @@ class OrchestratorAgent:
             self.logger.info(f"Session ID: {session_id}")
             self.logger.info("=" * 60)
             
-            # Add execution metadata to report
-            final_report['execution_metadata'] = {
-                'session_id': session_id,
-                'total_duration': total_duration,
-                'pdf_path': str(pdf_path_obj)
+            # Add execution metadata to a copy; the stored report is owned by
+            # the session and may still be queued for persistence
+            return {
+                **final_report,
+                'execution_metadata': {
+                    'session_id': session_id,
+                    'total_duration': total_duration,
+                    'pdf_path': str(pdf_path_obj),
+                    'output_files': output_files,
+                    'llm_enabled': self.summary_agent.llm_enabled
+                }
             }
             
-            return final_report
-            
         except Exception as e:
             self.logger.error(f"Error during analysis: {str(e)}")
             self.session_manager.update_session(session_id, {'status': 'failed'})
             raise
     
+    def process_batch(
+        self,
+        pdf_paths: List[str],
+        max_concurrency: int = 4,
+        save_outputs: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several papers concurrently.
+        
+        Args:
+            pdf_paths: Paths to PDF files
+            max_concurrency: Maximum number of papers analyzed at once
+            save_outputs: Whether to save outputs to disk
+            
+        Returns:
+            Final reports in input order; failed papers get a dictionary
+            with 'status': 'error', 'pdf_path' and 'error'
+        """
+        return asyncio.run(self.process_batch_async(pdf_paths, max_concurrency, save_outputs))
+    
+    async def process_batch_async(
+        self,
+        pdf_paths: List[str],
+        max_concurrency: int = 4,
+        save_outputs: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several papers concurrently from async code.
+        
+        Each paper's pipeline runs in a worker thread so its LLM waits
+        overlap with the other papers'.
+        
+        Args:
+            pdf_paths: Paths to PDF files
+            max_concurrency: Maximum number of papers analyzed at once
+            save_outputs: Whether to save outputs to disk
+            
+        Returns:
+            Final reports in input order; failed papers get a dictionary
+            with 'status': 'error', 'pdf_path' and 'error'
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze_one(pdf_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self.analyze_paper, pdf_path, None, save_outputs)
+        
+        results = await asyncio.gather(
+            *(analyze_one(pdf_path) for pdf_path in pdf_paths),
+            return_exceptions=True
+        )
+        
+        reports = []
+        for pdf_path, result in zip(pdf_paths, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Batch analysis failed for {pdf_path}: {result}")
+                result = {'status': 'error', 'pdf_path': str(pdf_path), 'error': str(result)}
+            reports.append(result)
+        
+        return reports
+    
     def _run_document_extraction(
         self,
         session_id: str,
-        pdf_path: str
+        pdf_path: str,
+        content_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Run document extraction agent.
@@ -157,6 +239,7 @@ class OrchestratorAgent:
         Args:
             session_id: Session ID
             pdf_path: Path to PDF
+            content_hash: SHA-256 of the PDF, if already computed
             
         Returns:
             Document extraction result
@@ -165,7 +248,8 @@ class OrchestratorAgent:
         
         result = self.document_agent.run({
             'file_path': pdf_path,
-            'session_id': session_id
+            'session_id': session_id,
+            'content_hash': content_hash
         })
         
         if result['status'] != 'success':
@@ -300,13 +384,16 @@ class OrchestratorAgent:
         self,
         pdf_path: Path,
         report: Dict[str, Any]
-    ) -> None:
+    ) -> Dict[str, str]:
         """
         Save outputs to disk.
         
         Args:
             pdf_path: Original PDF path
             report: Final report
+            
+        Returns:
+            Mapping of format ('json', 'md') to saved file path
         """
         # Create output filename based on PDF name
         base_name = pdf_path.stem
@@ -316,6 +403,7 @@ class OrchestratorAgent:
         json_path = config.get_output_path(f"{base_name}_{timestamp}_report.json")
         export_json(report, json_path, indent=config.OUTPUT_JSON_INDENT)
         self.logger.info(f"💾 Saved JSON report: {json_path}")
+        output_files = {'json': str(json_path)}
         
         # Save Markdown
         markdown_content = report.get('final_markdown', '')
@@ -323,6 +411,9 @@ class OrchestratorAgent:
             md_path = config.get_output_path(f"{base_name}_{timestamp}_report.md")
             export_markdown(markdown_content, md_path)
             self.logger.info(f"💾 Saved Markdown report: {md_path}")
+            output_files['md'] = str(md_path)
+        
+        return output_files
     
     def list_sessions(self) -> List[Dict[str, Any]]:
         """
@@ -356,3 +447,43 @@ class OrchestratorAgent:
             Number of sessions cleared
         """
         return self.session_manager.clear_all_sessions()
+
+
+# Per-process orchestrator used by analysis worker pools
+_worker_orchestrator: Optional[OrchestratorAgent] = None
+
+
+def analyze_paper_in_worker(
+    pdf_path: str,
+    session_id: Optional[str] = None,
+    save_outputs: bool = True,
+    content_hash: Optional[str] = None
+) -> Tuple[Dict[str, Any], Optional[SessionData]]:
+    """
+    Analyze a paper inside a worker process.
+    
+    Module-level so it can be submitted to a ProcessPoolExecutor; the
+    orchestrator is built once per worker process and reused across jobs.
+    The session lives in the worker's session manager, so it is returned
+    for the caller to add to its own (see SessionManager.add_session).
+    
+    Args:
+        pdf_path: Path to PDF file
+        session_id: Optional session ID
+        save_outputs: Whether to save outputs to disk
+        content_hash: SHA-256 of the PDF, if already computed
+        
+    Returns:
+        Tuple of (final research report, analyzed session)
+    """
+    global _worker_orchestrator
+    
+    if _worker_orchestrator is None:
+        _worker_orchestrator = OrchestratorAgent()
+    
+    report = _worker_orchestrator.analyze_paper(pdf_path, session_id, save_outputs, content_hash)
+    session_id = report['execution_metadata']['session_id']
+    # Hand the session over; the worker has no further use for it
+    session = _worker_orchestrator.session_manager.get_session(session_id, touch=False)
+    _worker_orchestrator.session_manager.delete_session(session_id)
+    return report, session
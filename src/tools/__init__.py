@@ -1,6 +1,6 @@
 """Tools package for ScholarLens."""
 
-from .pdf_parser import PDFParser, Document, Section, parse_pdf
+from .pdf_parser import PDFParser, Document, Section, parse_pdf, parse_pdf_streaming
 from .text_cleaner import TextCleaner, clean_text
 from .code_exec import CodeExecutor, ExecutionResult, execute_code
 
@@ -9,6 +9,7 @@ __all__ = [
     'Document',
     'Section',
     'parse_pdf',
+    'parse_pdf_streaming',
     'TextCleaner',
     'clean_text',
     'CodeExecutor',
@@ -7,7 +7,7 @@ Uses PyMuPDF (fitz) as primary parser with fallback to pdfplumber.
 
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from dataclasses import dataclass, asdict
 
 try:
@@ -83,12 +83,18 @@ class PDFParser:
                 "Install with: pip install pymupdf pdfplumber"
             )
     
-    def parse_pdf(self, pdf_path: str) -> Document:
+    def parse_pdf(
+        self,
+        pdf_path: str,
+        on_section: Optional[Callable[[Section], Section]] = None
+    ) -> Document:
         """
         Parse PDF file and extract structured content.
         
         Args:
             pdf_path: Path to PDF file
+            on_section: Optional callback applied to each section as soon as
+                it is extracted; its return value is stored in its place
             
         Returns:
             Document object with extracted content
@@ -100,18 +106,23 @@ class PDFParser:
         
         # Try PyMuPDF first, fallback to pdfplumber
         if PYMUPDF_AVAILABLE:
-            return self._parse_with_pymupdf(pdf_path)
+            return self._parse_with_pymupdf(pdf_path, on_section)
         elif PDFPLUMBER_AVAILABLE:
-            return self._parse_with_pdfplumber(pdf_path)
+            return self._parse_with_pdfplumber(pdf_path, on_section)
         else:
             raise RuntimeError("No PDF parser available")
     
-    def _parse_with_pymupdf(self, pdf_path: Path) -> Document:
+    def _parse_with_pymupdf(
+        self,
+        pdf_path: Path,
+        on_section: Optional[Callable[[Section], Section]] = None
+    ) -> Document:
         """
         Parse PDF using PyMuPDF.
         
         Args:
             pdf_path: Path to PDF file
+            on_section: Optional per-section callback
             
         Returns:
             Document object
@@ -119,13 +130,8 @@ class PDFParser:
         doc = fitz.open(pdf_path)
         
         # Extract full text
-        full_text = ""
-        page_texts = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            page_texts.append(text)
-            full_text += text + "\n\n"
+        page_texts = [doc[page_num].get_text() for page_num in range(len(doc))]
+        full_text = "".join(text + "\n\n" for text in page_texts)
         
         # Extract metadata
         metadata = {
@@ -148,7 +154,7 @@ class PDFParser:
         title = self._extract_title(full_text, metadata)
         authors = self._extract_authors(full_text)
         abstract = self._extract_abstract(full_text)
-        sections = self._extract_sections(page_texts)
+        sections = self._extract_sections(page_texts, on_section)
         equations = self._extract_equations(full_text)
         figures = self._extract_figures(doc) if self.extract_images else []
         tables = self._extract_tables(full_text) if self.extract_tables else []
@@ -169,25 +175,29 @@ class PDFParser:
             metadata=metadata
         )
     
-    def _parse_with_pdfplumber(self, pdf_path: Path) -> Document:
+    def _parse_with_pdfplumber(
+        self,
+        pdf_path: Path,
+        on_section: Optional[Callable[[Section], Section]] = None
+    ) -> Document:
         """
         Parse PDF using pdfplumber (fallback).
         
         Args:
             pdf_path: Path to PDF file
+            on_section: Optional per-section callback
             
         Returns:
             Document object
         """
         with pdfplumber.open(pdf_path) as pdf:
             # Extract text from all pages
-            full_text = ""
             page_texts = []
             for page in pdf.pages:
                 text = page.extract_text()
                 if text:
                     page_texts.append(text)
-                    full_text += text + "\n\n"
+            full_text = "".join(text + "\n\n" for text in page_texts)
             
             # Metadata
             metadata = {
@@ -200,7 +210,7 @@ class PDFParser:
             title = self._extract_title(full_text, metadata)
             authors = self._extract_authors(full_text)
             abstract = self._extract_abstract(full_text)
-            sections = self._extract_sections(page_texts)
+            sections = self._extract_sections(page_texts, on_section)
             equations = self._extract_equations(full_text)
             figures = []  # pdfplumber doesn't easily extract figure info
             tables = []
@@ -461,10 +471,17 @@ class PDFParser:
         
         return "No abstract found"
     
-    def _extract_sections(self, page_texts: List[str]) -> List[Section]:
+    def _extract_sections(
+        self,
+        page_texts: List[str],
+        on_section: Optional[Callable[[Section], Section]] = None
+    ) -> List[Section]:
         """Extract paper sections from page texts."""
         sections = []
         
+        def emit(section: Section) -> None:
+            sections.append(on_section(section) if on_section else section)
+        
         # Common section headers
         section_patterns = [
             r'^\s*(\d+\.?\s+[A-Z][a-zA-Z\s]+)',  # "1. Introduction"
@@ -484,7 +501,7 @@ class PDFParser:
                     if re.match(pattern, line.strip()):
                         # Save previous section
                         if current_section:
-                            sections.append(Section(
+                            emit(Section(
                                 title=current_section,
                                 content='\n'.join(current_content),
                                 start_page=page_num,
@@ -502,7 +519,7 @@ class PDFParser:
         
         # Add last section
         if current_section:
-            sections.append(Section(
+            emit(Section(
                 title=current_section,
                 content='\n'.join(current_content),
                 start_page=len(page_texts) - 1,
@@ -583,3 +600,29 @@ def parse_pdf(pdf_path: str, extract_images: bool = False, extract_tables: bool
     """
     parser = PDFParser(extract_images=extract_images, extract_tables=extract_tables)
     return parser.parse_pdf(pdf_path)
+
+
+def parse_pdf_streaming(
+    pdf_path: str,
+    on_section: Callable[[Section], Section],
+    extract_images: bool = False,
+    extract_tables: bool = True
+) -> Document:
+    """
+    Parse a PDF file, handing each section to a callback as it is extracted.
+    
+    Lets callers transform (e.g. clean) section text immediately so the raw
+    and processed copies of every section are never held at once.
+    
+    Args:
+        pdf_path: Path to PDF file
+        on_section: Callback receiving each Section; its return value is
+            stored in the document in place of the raw section
+        extract_images: Whether to extract image metadata
+        extract_tables: Whether to extract table information
+        
+    Returns:
+        Document object with extracted content
+    """
+    parser = PDFParser(extract_images=extract_images, extract_tables=extract_tables)
+    return parser.parse_pdf(pdf_path, on_section=on_section)
@@ -10,25 +10,52 @@ import unicodedata
 from typing import List, Optional, Dict
 
 
+# Common LaTeX commands to remove or replace
+_LATEX_REPLACEMENTS = {
+    r'\\textbf\{([^}]+)\}': r'\1',
+    r'\\textit\{([^}]+)\}': r'\1',
+    r'\\emph\{([^}]+)\}': r'\1',
+    r'\\section\{([^}]+)\}': r'\1',
+    r'\\subsection\{([^}]+)\}': r'\1',
+    r'\\cite\{[^}]+\}': '',
+    r'\\ref\{[^}]+\}': '',
+    r'\\label\{[^}]+\}': '',
+    r'\\begin\{[^}]+\}': '',
+    r'\\end\{[^}]+\}': '',
+    r'\\[a-zA-Z]+': '',  # Other LaTeX commands
+}
+_LATEX_PATTERNS = [(re.compile(p), r) for p, r in _LATEX_REPLACEMENTS.items()]
+
+# Common unicode symbols with ASCII equivalents (single translate pass)
+_UNICODE_TABLE = str.maketrans({
+    '\u2018': "'",  # Left single quote
+    '\u2019': "'",  # Right single quote
+    '\u201c': '"',  # Left double quote
+    '\u201d': '"',  # Right double quote
+    '\u2013': '-',  # En dash
+    '\u2014': '--', # Em dash
+    '\u2026': '...', # Ellipsis
+    '\u00a0': ' ',  # Non-breaking space
+    '\u00ad': '',   # Soft hyphen
+})
+
+# Precompiled patterns for the hot cleaning paths
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPACES_RE = re.compile(r' +')
+_MULTI_NEWLINE_RE = re.compile(r'\n\n+')
+_HYPHEN_BREAK_RE = re.compile(r'(\w)-\s*\n\s*(\w)')
+_CONTINUED_LINE_RE = re.compile(r'([a-z,])\s*\n\s*([a-z])')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+_SINGLE_NEWLINE_RE = re.compile(r'(?<!\n)\n(?!\n)')
+
+
 class TextCleaner:
     """Handles various text cleaning operations."""
     
     def __init__(self):
         """Initialize text cleaner."""
         # Common LaTeX commands to remove or replace
-        self.latex_replacements = {
-            r'\\textbf\{([^}]+)\}': r'\1',
-            r'\\textit\{([^}]+)\}': r'\1',
-            r'\\emph\{([^}]+)\}': r'\1',
-            r'\\section\{([^}]+)\}': r'\1',
-            r'\\subsection\{([^}]+)\}': r'\1',
-            r'\\cite\{[^}]+\}': '',
-            r'\\ref\{[^}]+\}': '',
-            r'\\label\{[^}]+\}': '',
-            r'\\begin\{[^}]+\}': '',
-            r'\\end\{[^}]+\}': '',
-            r'\\[a-zA-Z]+': '',  # Other LaTeX commands
-        }
+        self.latex_replacements = _LATEX_REPLACEMENTS
     
     def clean_text(
         self,
@@ -92,22 +119,7 @@ class TextCleaner:
         text = unicodedata.normalize('NFKC', text)
         
         # Replace common unicode symbols with ASCII equivalents
-        replacements = {
-            '\u2018': "'",  # Left single quote
-            '\u2019': "'",  # Right single quote
-            '\u201c': '"',  # Left double quote
-            '\u201d': '"',  # Right double quote
-            '\u2013': '-',  # En dash
-            '\u2014': '--', # Em dash
-            '\u2026': '...', # Ellipsis
-            '\u00a0': ' ',  # Non-breaking space
-            '\u00ad': '',   # Soft hyphen
-        }
-        
-        for unicode_char, ascii_char in replacements.items():
-            text = text.replace(unicode_char, ascii_char)
-        
-        return text
+        return text.translate(_UNICODE_TABLE)
     
     def remove_latex(self, text: str) -> str:
         """
@@ -120,14 +132,14 @@ class TextCleaner:
             Text with LaTeX removed
         """
         # Apply replacements in order
-        for pattern, replacement in self.latex_replacements.items():
-            text = re.sub(pattern, replacement, text)
+        for pattern, replacement in _LATEX_PATTERNS:
+            text = pattern.sub(replacement, text)
         
         # Remove remaining curly braces
         text = text.replace('{', '').replace('}', '')
         
         # Clean up multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         return text
     
@@ -142,16 +154,16 @@ class TextCleaner:
             Text with fixed line breaks
         """
         # Fix hyphenated line breaks (word- \n word -> word)
-        text = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', text)
+        text = _HYPHEN_BREAK_RE.sub(r'\1\2', text)
         
         # Join lines that should be continuous (lowercase to lowercase)
-        text = re.sub(r'([a-z,])\s*\n\s*([a-z])', r'\1 \2', text)
+        text = _CONTINUED_LINE_RE.sub(r'\1 \2', text)
         
         # Keep paragraph breaks (double newlines)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        text = _PARAGRAPH_BREAK_RE.sub('\n\n', text)
         
         # Remove single line breaks within paragraphs
-        text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
+        text = _SINGLE_NEWLINE_RE.sub(' ', text)
         
         return text
     
@@ -166,15 +178,13 @@ class TextCleaner:
             Text with normalized whitespace
         """
         # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
+        text = _SPACES_RE.sub(' ', text)
         
         # Replace multiple newlines with double newline
-        text = re.sub(r'\n\n+', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         
         # Remove leading/trailing whitespace from lines
-        lines = text.split('\n')
-        lines = [line.strip() for line in lines]
-        text = '\n'.join(lines)
+        text = '\n'.join([line.strip() for line in text.split('\n')])
         
         # Remove leading/trailing whitespace from entire text
         text = text.strip()
@@ -301,6 +311,10 @@ class TextCleaner:
         return equation
 
 
+# Shared instance for the convenience function (the cleaner is stateless)
+_DEFAULT_CLEANER = TextCleaner()
+
+
 def clean_text(
     text: str,
     remove_latex: bool = True,
@@ -323,8 +337,7 @@ def clean_text(
     Returns:
         Cleaned text
     """
-    cleaner = TextCleaner()
-    return cleaner.clean_text(
+    return _DEFAULT_CLEANER.clean_text(
         text,
         remove_latex=remove_latex,
         normalize_unicode=normalize_unicode,
@@ -3,9 +3,19 @@
 from .config import Config, config
 from .logger import get_logger, time_it, log_agent_execution, main_logger
 from .chunking import TextChunker, TextChunk, chunk_text
+from .llm_cache import (
+    CacheBackend,
+    MemoryCache,
+    PromptCache,
+    TieredCache,
+    get_prompt_cache
+)
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .hashing import file_sha256
 from .formatting import (
     MarkdownFormatter,
     dict_to_markdown,
+    format_timestamp,
     export_json,
     export_markdown
 )
@@ -20,8 +30,17 @@ __all__ = [
     'TextChunker',
     'TextChunk',
     'chunk_text',
+    'CacheBackend',
+    'MemoryCache',
+    'PromptCache',
+    'TieredCache',
+    'get_prompt_cache',
+    'RateLimiter',
+    'get_rate_limiter',
+    'file_sha256',
     'MarkdownFormatter',
     'dict_to_markdown',
+    'format_timestamp',
     'export_json',
     'export_markdown'
 ]
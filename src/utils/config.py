@@ -40,6 +40,7 @@ class Config:
     SRC_ROOT = PROJECT_ROOT / "src"
     DATA_ROOT = PROJECT_ROOT / "data"
     OUTPUTS_DIR = DATA_ROOT / "outputs"
+    CACHE_DIR = DATA_ROOT / "cache"
     SAMPLES_DIR = DATA_ROOT / "samples"
     LOGS_DIR = PROJECT_ROOT / "logs"
     
@@ -102,11 +103,33 @@ class Config:
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # seconds
     RATE_LIMIT_DELAY = 1  # seconds between API calls
+    LLM_MAX_CONCURRENCY = 8  # concurrent LLM calls per agent
+    # Client-side rate limiting of async LLM calls
+    LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    LLM_RATE_LIMIT_CONCURRENCY = 4  # API calls in flight per event loop
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))  # 0 = no budget
+    # Documents with less text (chars) than this skip LLM analysis
+    MIN_TEXT_LEN = 500
+    # Character budgets for document text placed in summary prompts
+    PROMPT_BUDGETS = {
+        'tldr_abstract': 1000,
+        'para_abstract': 2000,
+        'detailed_abstract': 2000,
+        'detailed_sections': 3000,
+        'findings_abstract': 2000,
+        'findings_results': 2000
+    }
     
     # PDF parsing settings
     PDF_DPI = 300
     PDF_EXTRACT_IMAGES = False
     PDF_EXTRACT_TABLES = True
+    # Cache parsed and cleaned documents under CACHE_DIR/documents, keyed on
+    # PDF content; entries are never expired, so clear the directory by hand
+    DOCUMENT_CACHE_ENABLED = os.getenv("DOCUMENT_CACHE_ENABLED", "false").lower() == "true"
+    # Section text (chars) above which cleaning runs in a process pool
+    PARALLEL_CLEAN_MIN_CHARS = 200_000
+    CLEAN_WORKERS = os.cpu_count() or 1
     
     # Logging settings
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -114,13 +137,45 @@ class Config:
     LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # 10MB
     LOG_FILE_BACKUP_COUNT = 5
     
+    # LLM response cache
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = CACHE_DIR / "llm_cache.sqlite3"
+    LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES = 10000
+    LLM_CACHE_MEMORY_ENTRIES = 512
+    # Only near-deterministic calls are cached
+    LLM_CACHE_MAX_TEMPERATURE = 0.3
+    
     # Session settings
     MAX_SESSIONS = 100
     SESSION_TIMEOUT_HOURS = 24
+    # Persist CLI sessions so repeat runs on the same PDF reuse the report;
+    # without it each CLI run starts with no sessions and nothing is reused
+    SESSION_PERSISTENCE_ENABLED = os.getenv("SESSION_PERSISTENCE_ENABLED", "false").lower() == "true"
+    SESSIONS_DIR = DATA_ROOT / "sessions"
+    
+    # API settings
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read buffer for streamed uploads
+    REDIS_URL = os.getenv("REDIS_URL", "")  # Shared progress store; empty = in-memory
+    PROGRESS_TTL_SECONDS = 3600
+    # Analysis worker processes; keep small on memory-constrained hosts
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", min(os.cpu_count() or 1, 4)))
+    # Celery broker for durable analysis jobs; empty = in-process background tasks
+    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "")
+    # Uvicorn worker processes. Sessions and reports live in each worker's
+    # memory (only progress is shared via REDIS_URL), so more than one worker
+    # serves partial session lists and 404s reports held by another worker.
+    # Each worker also starts its own pool of ANALYSIS_WORKERS processes.
+    API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+    API_RELOAD = os.getenv("API_RELOAD", "false").lower() == "true"  # Dev auto-reload
+    # nginx internal location aliased to OUTPUTS_DIR (e.g. "/internal/");
+    # when set, downloads are handed to nginx via X-Accel-Redirect
+    NGINX_ACCEL_REDIRECT_PREFIX = os.getenv("NGINX_ACCEL_REDIRECT_PREFIX", "")
     
     # Output settings
     OUTPUT_JSON_INDENT = 2
     OUTPUT_MARKDOWN_WIDTH = 80
+    MAX_ITEMS_PER_SECTION = 50  # Longer report lists are truncated
     
     @classmethod
     def get_model_config(cls, agent_name: str) -> ModelConfig:
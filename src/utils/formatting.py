@@ -5,6 +5,7 @@ Handles conversion of analysis results to various output formats
 including Markdown and JSON.
 """
 
+import io
 import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -291,44 +292,45 @@ class MarkdownFormatter:
         Returns:
             Formatted markdown report
         """
-        output = ""
+        buf = io.StringIO()
+        w = buf.write
         
         # Title
         title = report.get("metadata", {}).get("title", "Research Paper Analysis")
-        output += self.format_header(title, 1)
-        output += "---\n\n"
+        w(self.format_header(title, 1))
+        w("---\n\n")
         
         # Metadata
         if "metadata" in report:
-            output += self.format_metadata(report["metadata"])
+            w(self.format_metadata(report["metadata"]))
         
-        output += "---\n\n"
+        w("---\n\n")
         
         # Summaries
         if "summaries" in report:
-            output += self.format_summaries(report["summaries"])
+            w(self.format_summaries(report["summaries"]))
         
         # Methodology
         if "methodology" in report:
-            output += self.format_methodology(report["methodology"])
+            w(self.format_methodology(report["methodology"]))
         
         # Math
         if "math_explanations" in report:
-            output += self.format_math(report["math_explanations"])
+            w(self.format_math(report["math_explanations"]))
         
         # Critique
         if "critique" in report:
-            output += self.format_critique(report["critique"])
+            w(self.format_critique(report["critique"]))
         
         # Implementation
         if "implementation" in report:
-            output += self.format_implementation(report["implementation"])
+            w(self.format_implementation(report["implementation"]))
         
         # Footer
-        output += "---\n\n"
-        output += f"*Generated by ScholarLens on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        w("---\n\n")
+        w(f"*Generated by ScholarLens on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
         
-        return output
+        return buf.getvalue()
 
 
 def dict_to_markdown(report: Dict[str, Any], width: int = 80) -> str:
@@ -346,6 +348,22 @@ def dict_to_markdown(report: Dict[str, Any], width: int = 80) -> str:
     return formatter.format_full_report(report)
 
 
+def format_timestamp(ns: Optional[int]) -> Optional[str]:
+    """
+    Format a nanosecond epoch timestamp as a local ISO 8601 string.
+    
+    Args:
+        ns: Nanoseconds since the epoch (time.time_ns())
+        
+    Returns:
+        ISO formatted timestamp (microsecond precision), or None if ns is None
+    """
+    if ns is None:
+        return None
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000).isoformat()
+
+
 def export_json(data: Dict[str, Any], filepath: Path, indent: int = 2) -> None:
     """
     Export data to JSON file.
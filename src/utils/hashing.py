@@ -0,0 +1,31 @@
+"""
+Content hashing for ScholarLens.
+
+PDFs are identified by the SHA-256 of their bytes everywhere (upload
+dedupe, CLI report reuse, document cache), so digests computed at one
+entry point can be passed along and compared with those from another.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Union
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file with SHA-256 without reading it into memory at once.
+    
+    Args:
+        path: Path to file
+        chunk_size: Read size when hashlib.file_digest is unavailable
+        
+    Returns:
+        Hex digest
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        hasher = hashlib.sha256()
+        while chunk := f.read(chunk_size):
+            hasher.update(chunk)
+        return hasher.hexdigest()
@@ -0,0 +1,303 @@
+"""
+LLM response cache for ScholarLens.
+
+Content-addressed cache of LLM responses keyed by a hash of the
+calling agent, model, prompt and generation settings. Backends share a
+small get/set interface: an in-process LRU for hot prompts and SQLite
+for persistence across runs, combined by TieredCache so repeated
+prompts are served without another API round-trip.
+"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Tuple
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize prompt whitespace for hashing.
+    
+    Strips surrounding whitespace and trailing spaces on each line, so
+    prompts that differ only in formatting share a cache entry.
+    
+    Args:
+        prompt: Prompt text
+    
+    Returns:
+        Normalized prompt text
+    """
+    return "\n".join(line.rstrip() for line in prompt.strip().splitlines())
+
+
+def make_cache_key(
+    agent: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    model: str = ""
+) -> str:
+    """
+    Build the cache key for an LLM call.
+    
+    Args:
+        agent: Calling agent name
+        prompt: Prompt text
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        model: Model name
+    
+    Returns:
+        Hex digest key
+    """
+    prompt = normalize_prompt(prompt)
+    raw = f"{agent}|{model}|{temperature}|{max_tokens}|{prompt}".encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=20).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached LLM responses."""
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        ...
+    
+    def set(self, key: str, response: str) -> None:
+        """Store a response."""
+        ...
+    
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        ...
+
+
+class MemoryCache:
+    """In-process LRU cache of LLM responses with optional TTL."""
+    
+    def __init__(self, max_entries: int = 512, ttl: Optional[int] = None):
+        """
+        Initialize memory cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Seconds before a cached response expires (never when None)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response, marking it most recently used.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Response text or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, created_at = entry
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+    
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used beyond the cap.
+        
+        Args:
+            key: Cache key
+            response: Response text
+        """
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+
+class PromptCache:
+    """SQLite-backed LLM response cache with TTL and size cap."""
+    
+    def __init__(
+        self,
+        path: Path,
+        ttl: int = 7 * 24 * 3600,
+        max_entries: int = 10000
+    ):
+        """
+        Initialize prompt cache.
+        
+        Args:
+            path: SQLite database file
+            ttl: Seconds before a cached response expires
+            max_entries: Maximum number of cached responses
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)"
+        )
+        self._conn.commit()
+    
+    make_key = staticmethod(make_cache_key)
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Response text or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the oldest entries beyond the size cap.
+        
+        Args:
+            key: Cache key
+            response: Response text
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """Memory LRU in front of a persistent backend."""
+    
+    def __init__(self, memory: CacheBackend, persistent: Optional[CacheBackend] = None):
+        """
+        Initialize tiered cache.
+        
+        Args:
+            memory: Fast in-process backend checked first
+            persistent: Optional slower backend shared across runs
+        """
+        self.memory = memory
+        self.persistent = persistent
+    
+    make_key = staticmethod(make_cache_key)
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response, promoting persistent hits into memory.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Response text or None if missing
+        """
+        response = self.memory.get(key)
+        if response is None and self.persistent is not None:
+            response = self.persistent.get(key)
+            if response is not None:
+                self.memory.set(key, response)
+        return response
+    
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response in every tier.
+        
+        Args:
+            key: Cache key
+            response: Response text
+        """
+        self.memory.set(key, response)
+        if self.persistent is not None:
+            self.persistent.set(key, response)
+    
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+
+# Open caches per process, keyed by settings
+_caches: Dict[Tuple[str, int, int, int], TieredCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_prompt_cache(
+    path: Optional[Path],
+    ttl: int = 7 * 24 * 3600,
+    max_entries: int = 10000,
+    memory_entries: int = 512
+) -> TieredCache:
+    """
+    Get a shared LLM response cache.
+    
+    Args:
+        path: SQLite database file (memory-only cache when None)
+        ttl: Seconds before a cached response expires
+        max_entries: Maximum number of persisted responses
+        memory_entries: Maximum number of responses kept in memory
+    
+    Returns:
+        TieredCache instance
+    """
+    cache_id = (str(path), ttl, max_entries, memory_entries)
+    with _caches_lock:
+        cache = _caches.get(cache_id)
+        if cache is None:
+            persistent = None
+            if path is not None:
+                persistent = PromptCache(path, ttl=ttl, max_entries=max_entries)
+            cache = TieredCache(MemoryCache(memory_entries, ttl=ttl), persistent)
+            _caches[cache_id] = cache
+        return cache
@@ -0,0 +1,154 @@
+"""
+Client-side LLM rate limiter for ScholarLens.
+
+Keeps request bursts under the provider's limits instead of relying on
+429 retries: a concurrency gate, a sliding one-minute token budget, and
+a shared back-off window opened whenever a rate-limit error is seen.
+"""
+
+import time
+import random
+import asyncio
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+
+class RateLimiter:
+    """Concurrency gate, token budget and adaptive back-off for LLM calls."""
+    
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        tokens_per_minute: int = 0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        jitter: float = 0.25
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_concurrency: Maximum calls in flight per event loop
+            tokens_per_minute: Token budget per minute (0 disables it)
+            base_backoff: Seconds to wait after the first rate-limit error
+            max_backoff: Upper bound on the back-off delay
+            jitter: Relative random spread applied to back-off delays
+        """
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._blocked_until = 0.0
+        self._failures = 0
+        # asyncio primitives are bound to one loop; agents run their own
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @asynccontextmanager
+    async def reserve(self, tokens: int) -> AsyncIterator[None]:
+        """
+        Wait for a call slot and token budget.
+        
+        Args:
+            tokens: Estimated tokens the call will consume (input + output)
+        """
+        await self._wait_backoff()
+        async with self._get_semaphore():
+            await self._take_tokens(tokens)
+            yield
+    
+    def register_429(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a rate-limit error and open a back-off window.
+        
+        Args:
+            retry_after: Server-provided delay in seconds, if any
+        
+        Returns:
+            Seconds until calls resume
+        """
+        with self._lock:
+            self._failures += 1
+            if retry_after is None:
+                delay = min(self.base_backoff * 2 ** (self._failures - 1), self.max_backoff)
+                delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            else:
+                delay = retry_after
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            return delay
+    
+    def register_success(self) -> None:
+        """Reset the back-off after a successful call."""
+        with self._lock:
+            self._failures = 0
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency gate for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+    
+    async def _wait_backoff(self) -> None:
+        """Sleep until any open back-off window has passed."""
+        while True:
+            with self._lock:
+                delay = self._blocked_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+    
+    async def _take_tokens(self, tokens: int) -> None:
+        """Sleep until the per-minute token budget has room, then spend it."""
+        if not self.tokens_per_minute:
+            return
+        # A single call larger than the budget only waits for an empty window
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60.0:
+                    self._window_tokens -= self._window.popleft()[1]
+                if self._window_tokens + tokens <= self.tokens_per_minute:
+                    self._window.append((now, tokens))
+                    self._window_tokens += tokens
+                    return
+                delay = 60.0 - (now - self._window[0][0])
+            await asyncio.sleep(delay)
+
+
+# Shared limiters per process, keyed by settings
+_limiters: Dict[Tuple[int, int], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(max_concurrency: int = 4, tokens_per_minute: int = 0) -> RateLimiter:
+    """
+    Get a shared rate limiter.
+    
+    Args:
+        max_concurrency: Maximum calls in flight per event loop
+        tokens_per_minute: Token budget per minute (0 disables it)
+    
+    Returns:
+        RateLimiter instance
+    """
+    limiter_id = (max_concurrency, tokens_per_minute)
+    with _limiters_lock:
+        limiter = _limiters.get(limiter_id)
+        if limiter is None:
+            limiter = RateLimiter(max_concurrency, tokens_per_minute)
+            _limiters[limiter_id] = limiter
+        return limiter
@@ -0,0 +1,39 @@
+"""
+Tests for AggregatorAgent report size limits.
+"""
+from src.agents import AggregatorAgent
+
+
+def test_long_lists_are_truncated_with_a_count():
+    """Lists beyond the limit are cut and the dropped count recorded beside them."""
+    agent = AggregatorAgent()
+    report = {
+        'title': 'T',
+        'equations': list(range(5)),
+        'critique': {'weaknesses': ['a', 'b', 'c'], 'strengths': ['x']}
+    }
+    
+    assert agent._limit_items(report, 2) == {
+        'title': 'T',
+        'equations': [0, 1],
+        'equations_truncated': 3,
+        'critique': {'weaknesses': ['a', 'b'], 'weaknesses_truncated': 1, 'strengths': ['x']}
+    }
+
+
+def test_lists_nested_in_lists_are_cut_without_a_count():
+    """Inner lists have no key to hang a count on, so they are only cut."""
+    agent = AggregatorAgent()
+    report = {'tables': [[1, 2, 3], {'rows': [1, 2, 3]}]}
+    
+    assert agent._limit_items(report, 2) == {
+        'tables': [[1, 2], {'rows': [1, 2], 'rows_truncated': 1}]
+    }
+
+
+def test_reports_within_limits_are_unchanged():
+    """Nothing is added when no list exceeds the limit."""
+    agent = AggregatorAgent()
+    report = {'summaries': {'key_findings': ['a', 'b']}, 'score': 7}
+    
+    assert agent._limit_items(report, 2) == report
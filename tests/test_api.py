@@ -0,0 +1,158 @@
+"""
+Tests for the API upload, progress, report and download flow.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from api import server
+from src.memory import SessionData
+from src.utils import file_sha256
+
+
+def _stub_worker(tmp_path, llm_enabled=True):
+    """Build a stand-in for analyze_paper_in_worker that writes a tiny report."""
+    def analyze(pdf_path, session_id=None, save_outputs=True, content_hash=None):
+        # The upload's digest is passed through rather than recomputed
+        assert content_hash == file_sha256(pdf_path)
+        report_path = tmp_path / f"{session_id}.json"
+        report = {
+            'title': 'Test Paper',
+            'execution_metadata': {
+                'session_id': session_id,
+                'output_files': {'json': str(report_path)},
+                'llm_enabled': llm_enabled
+            }
+        }
+        report_path.write_bytes(orjson.dumps(report))
+        now = datetime.now()
+        session = SessionData(
+            session_id=session_id,
+            created_at=now,
+            last_accessed=now,
+            paper_path=pdf_path,
+            agent_outputs={'Summary': {'status': 'success'}},
+            final_report=report,
+            status='completed'
+        )
+        return report, session
+    
+    return analyze
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client running analyses in a thread with a stub worker."""
+    monkeypatch.setattr(server.Config, 'CELERY_BROKER_URL', '')
+    monkeypatch.setattr(server.Config, 'REDIS_URL', '')
+    monkeypatch.setattr(server.Config, 'NGINX_ACCEL_REDIRECT_PREFIX', '')
+    monkeypatch.setattr(server, 'UPLOAD_DIR', tmp_path / "uploads")
+    monkeypatch.setattr(server, 'analyze_paper_in_worker', _stub_worker(tmp_path))
+    with TestClient(server.app) as test_client:
+        monkeypatch.setattr(server, 'analysis_pool', ThreadPoolExecutor(max_workers=1))
+        yield test_client
+
+
+def _upload(client, content=b"%PDF-1.4 test paper", **params):
+    response = client.post(
+        "/api/analyze",
+        params=params,
+        files={'file': ('paper.pdf', content, 'application/pdf')}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_upload_runs_analysis_and_serves_results(client):
+    """An upload is queued, completes, and its report can be fetched."""
+    queued = _upload(client)
+    assert queued['status'] == 'queued'
+    session_id = queued['session_id']
+    
+    # TestClient runs background tasks before returning the response
+    status = client.get(f"/api/status/{session_id}").json()
+    assert status['status'] == 'completed'
+    assert status['progress'] == 100
+    assert status['completed_at'] is not None
+    
+    report = client.get(f"/api/report/{session_id}").json()
+    assert report['session_id'] == session_id
+    assert report['agent_outputs'] == {'Summary': {'status': 'success'}}
+    
+    download = client.get(f"/api/download/{session_id}/json")
+    assert download.status_code == 200
+    assert download.json()['title'] == 'Test Paper'
+    
+    server.session_manager.delete_session(session_id)
+
+
+def test_unknown_session_returns_404(client):
+    """Status, report and download all 404 for an unknown session."""
+    assert client.get("/api/status/missing").status_code == 404
+    assert client.get("/api/report/missing").status_code == 404
+    assert client.get("/api/download/missing/json").status_code == 404
+
+
+
+def test_invalid_download_format_returns_400(client):
+    """Only json and markdown downloads are offered."""
+    assert client.get("/api/download/missing/pdf").status_code == 400
+
+
+def test_reupload_reuses_completed_analysis(client):
+    """Uploading identical content completes immediately from the prior run."""
+    content = b"%PDF-1.4 reused paper"
+    first = _upload(client, content)['session_id']
+    second = _upload(client, content)
+    session_id = second['session_id']
+    
+    assert second['status'] == 'completed'
+    assert session_id != first
+    
+    report = client.get(f"/api/report/{session_id}").json()
+    assert report['session_id'] == session_id
+    assert report['agent_outputs'] == {'Summary': {'status': 'success'}}
+    assert report['metadata']['reused_from'] == first
+    
+    listed = {s['session_id'] for s in client.get("/api/sessions").json()['sessions']}
+    assert {first, session_id} <= listed
+    
+    download = client.get(f"/api/download/{session_id}/json")
+    assert download.status_code == 200
+    
+    server.session_manager.delete_session(first)
+    server.session_manager.delete_session(session_id)
+
+
+def test_force_reanalyzes_identical_upload(client):
+    """force=true skips reuse and runs a fresh analysis."""
+    content = b"%PDF-1.4 forced paper"
+    first = _upload(client, content)['session_id']
+    second = _upload(client, content, force=True)
+    
+    assert second['status'] == 'queued'
+    report = client.get(f"/api/report/{second['session_id']}").json()
+    assert 'reused_from' not in report['metadata']
+    
+    server.session_manager.delete_session(first)
+    server.session_manager.delete_session(second['session_id'])
+
+
+def test_placeholder_reports_are_not_reused(client, tmp_path, monkeypatch):
+    """Analyses run without an API key are analyzed again on re-upload."""
+    monkeypatch.setattr(server, 'analyze_paper_in_worker', _stub_worker(tmp_path, llm_enabled=False))
+    content = b"%PDF-1.4 placeholder paper"
+    first = _upload(client, content)['session_id']
+    second = _upload(client, content)
+    
+    assert second['status'] == 'queued'
+    
+    server.session_manager.delete_session(first)
+    server.session_manager.delete_session(second['session_id'])
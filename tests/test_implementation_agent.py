@@ -0,0 +1,29 @@
+"""
+Tests for ImplementationAgent pseudo-code parsing.
+"""
+from src.agents.implementation_agent import _parse_pseudocode_blocks
+
+
+def test_blocks_are_split_on_headers():
+    """Each "### " header starts a block; preamble and code fences are dropped."""
+    text = (
+        "Here is the pseudo-code:\n"
+        "### Training Loop\n"
+        "```\n"
+        "for epoch in epochs:\n"
+        "    step()\n"
+        "```\n"
+        "### Inference\n"
+        "return model(x)"
+    )
+    
+    assert _parse_pseudocode_blocks(text) == [
+        {'title': 'Training Loop', 'code': 'for epoch in epochs:\n    step()', 'language': 'pseudocode'},
+        {'title': 'Inference', 'code': 'return model(x)', 'language': 'pseudocode'}
+    ]
+
+
+def test_text_without_headers_has_no_blocks():
+    """Responses without headers (e.g. placeholders) parse to nothing."""
+    assert _parse_pseudocode_blocks("[LLM Response Placeholder]") == []
+    assert _parse_pseudocode_blocks("") == []
@@ -0,0 +1,66 @@
+"""
+Tests for LLM response cache gating in BaseAgent.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import SummaryAgent
+
+
+class _FakeModel:
+    """Stands in for a Gemini model, counting calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_content(self, prompt, generation_config):
+        self.calls += 1
+        candidate = SimpleNamespace(content=SimpleNamespace(parts=['text']), finish_reason=None)
+        return SimpleNamespace(candidates=[candidate], text=f"response {self.calls}")
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Summary agent with caching enabled and a fake model."""
+    config = SimpleNamespace(
+        LLM_CACHE_ENABLED=True,
+        LLM_CACHE_PATH=tmp_path / "llm_cache.sqlite3",
+        LLM_CACHE_MAX_TEMPERATURE=0.3
+    )
+    model = _FakeModel()
+    monkeypatch.setattr(SummaryAgent, '_get_api_key', lambda self: 'test-key')
+    monkeypatch.setattr(SummaryAgent, '_get_model', lambda self, api_key: model)
+    agent = SummaryAgent(config=config)
+    return agent, model
+
+
+def test_low_temperature_calls_are_cached(agent):
+    """A repeated call at or below the threshold is served from the cache."""
+    agent, model = agent
+    first = agent._call_llm("cached prompt", temperature=0.3, max_tokens=100)
+    second = agent._call_llm("cached prompt", temperature=0.3, max_tokens=100)
+    
+    assert first == second == "response 1"
+    assert model.calls == 1
+    assert agent.stats == {'llm_cache_hits': 1, 'llm_cache_misses': 1}
+
+
+def test_high_temperature_calls_bypass_cache(agent):
+    """Calls above the threshold always reach the model."""
+    agent, model = agent
+    first = agent._call_llm("sampled prompt", temperature=0.7, max_tokens=100)
+    second = agent._call_llm("sampled prompt", temperature=0.7, max_tokens=100)
+    
+    assert (first, second) == ("response 1", "response 2")
+    assert model.calls == 2
+    assert agent.stats == {'llm_cache_hits': 0, 'llm_cache_misses': 0}
+
+
+def test_json_and_text_responses_are_cached_separately(agent):
+    """The same prompt asked for JSON doesn't reuse the plain text response."""
+    agent, model = agent
+    agent._call_llm("shared prompt", temperature=0.1, max_tokens=100)
+    agent._call_llm("shared prompt", temperature=0.1, max_tokens=100, json_output=True)
+    
+    assert model.calls == 2
@@ -0,0 +1,77 @@
+"""
+Tests for coalescing of concurrent identical async LLM calls.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import SummaryAgent
+from src.agents import base_agent
+
+
+class _SlowModel:
+    """Async stand-in for a Gemini model that answers after a short delay."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def generate_content_async(self, prompt, generation_config):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        candidate = SimpleNamespace(content=SimpleNamespace(parts=['text']), finish_reason=None)
+        return SimpleNamespace(candidates=[candidate], text=f"{prompt} -> {self.calls}")
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Summary agent without caching or rate limiting, and a slow fake model."""
+    config = SimpleNamespace(LLM_CACHE_ENABLED=False, LLM_RATE_LIMIT_ENABLED=False)
+    model = _SlowModel()
+    monkeypatch.setattr(SummaryAgent, '_get_api_key', lambda self: 'test-key')
+    monkeypatch.setattr(SummaryAgent, '_get_model', lambda self, api_key: model)
+    return SummaryAgent(config=config), model
+
+
+def test_identical_concurrent_calls_share_one_request(agent):
+    """Concurrent calls with the same prompt and settings send one request."""
+    agent, model = agent
+    
+    async def main():
+        return await asyncio.gather(*(
+            agent._call_llm_async("same prompt", temperature=0.7) for _ in range(3)
+        ))
+    
+    assert asyncio.run(main()) == ["same prompt -> 1"] * 3
+    assert model.calls == 1
+    assert not base_agent._INFLIGHT
+
+
+def test_different_settings_are_not_coalesced(agent):
+    """Calls differing in prompt or settings each reach the model."""
+    agent, model = agent
+    
+    async def main():
+        await asyncio.gather(
+            agent._call_llm_async("prompt a"),
+            agent._call_llm_async("prompt b"),
+            agent._call_llm_async("prompt a", json_output=True)
+        )
+    
+    asyncio.run(main())
+    assert model.calls == 3
+
+
+def test_cancelled_caller_does_not_cancel_others(agent):
+    """One waiter being cancelled leaves the shared request running."""
+    agent, model = agent
+    
+    async def main():
+        first = asyncio.ensure_future(agent._call_llm_async("shared prompt"))
+        second = asyncio.ensure_future(agent._call_llm_async("shared prompt"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == "shared prompt -> 1"
+    assert model.calls == 1
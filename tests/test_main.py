@@ -0,0 +1,38 @@
+"""
+Tests for the CLI argument fast path.
+"""
+import sys
+
+import pytest
+
+from src import main
+
+
+@pytest.mark.parametrize("argv", [
+    ['--list-sessions'],
+    ['--clear-sessions'],
+    ['--get-report', 'abc123']
+])
+def test_fast_path_matches_argparse(argv, monkeypatch):
+    """Session commands parse to exactly what the full parser produces."""
+    fast = main._parse_simple_command(argv)
+    
+    # Force the full parser by disabling the fast path
+    monkeypatch.setattr(main, '_parse_simple_command', lambda argv: None)
+    monkeypatch.setattr(sys, 'argv', ['main.py', *argv])
+    
+    assert fast is not None
+    assert vars(fast) == vars(main.parse_arguments())
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ['--pdf', 'paper.pdf'],
+    ['--list-sessions', '--log-level', 'DEBUG'],
+    ['--get-report'],
+    ['--get-report', '--list-sessions'],
+    ['--help']
+])
+def test_other_commands_use_argparse(argv):
+    """Anything but a bare session command falls through to argparse."""
+    assert main._parse_simple_command(argv) is None
@@ -0,0 +1,71 @@
+"""
+Tests for MathAgent's batched equation interpretation.
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.agents import MathAgent
+
+
+@pytest.fixture
+def respond(monkeypatch):
+    """Answer the batched prompt with canned interpretations, recording prompts."""
+    prompts = []
+    
+    def install(interpretations):
+        async def fake_call(self, prompt, temperature=0.3, max_tokens=2048, json_output=False):
+            prompts.append(prompt)
+            return json.dumps({'interpretations': interpretations})
+        monkeypatch.setattr(MathAgent, '_call_llm_async', fake_call)
+        return prompts
+    
+    return install
+
+
+def _interpret(equations):
+    return asyncio.run(MathAgent()._interpret_equations(equations, "context"))
+
+
+def test_entries_are_routed_by_equation_number(respond):
+    """Entries are matched to equations by number, not by response order."""
+    respond([
+        {'equation_number': 2, 'explanation': 'second', 'intuition': 'i2', 'purpose': 'p2'},
+        {'equation_number': 1, 'explanation': 'first', 'intuition': 'i1', 'purpose': 'p1'}
+    ])
+    
+    results = _interpret(["x = y + 1", "E = m c^2"])
+    
+    assert [r['equation_number'] for r in results] == [1, 2]
+    assert [r['explanation'] for r in results] == ['first', 'second']
+    assert results[1]['equation'] == "E = m c^2"
+
+
+def test_missing_entries_fall_back_to_placeholders(respond):
+    """Equations the response skips (or numbers it invents) get placeholder text."""
+    respond([
+        {'equation_number': 1, 'explanation': 'first'},
+        {'equation_number': 7, 'explanation': 'unknown'},
+        {'equation_number': '2', 'explanation': 'not an int'}
+    ])
+    
+    results = _interpret(["x = y + 1", "E = m c^2"])
+    
+    assert results[0]['explanation'] == 'first'
+    assert results[1]['explanation'].startswith("This equation defines")
+    assert results[1]['variables']
+
+
+def test_repeated_equations_are_asked_once(respond):
+    """A restated equation is sent once and its answer fanned out to each copy."""
+    prompts = respond([
+        {'equation_number': 1, 'explanation': 'loss'},
+        {'equation_number': 2, 'explanation': 'update'}
+    ])
+    
+    results = _interpret(["L = (y - f(x))^2", "w = w - a g", "L = (y - f(x))^2"])
+    
+    assert prompts[0].count("Equation ") == 2
+    assert [r['equation_number'] for r in results] == [1, 2, 3]
+    assert [r['explanation'] for r in results] == ['loss', 'update', 'loss']
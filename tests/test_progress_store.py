@@ -0,0 +1,167 @@
+"""
+Tests for the Redis progress store's key layout, encoding and expiry.
+
+The store talks to an in-test double implementing the handful of async
+redis commands it uses, so these run without a Redis server.
+"""
+import asyncio
+import fnmatch
+
+import pytest
+
+from src.memory.progress_store import RedisProgressStore
+
+
+def _bytes(value):
+    return value if isinstance(value, bytes) else str(value).encode('utf-8')
+
+
+class _FakeRedis:
+    """Minimal async Redis double (hashes, strings, expiry, pipelines)."""
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+    
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({_bytes(k): _bytes(v) for k, v in mapping.items()})
+    
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+    
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(_bytes(field))
+    
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+    
+    async def set(self, key, value, ex=None):
+        self.data[key] = _bytes(value)
+        if ex is not None:
+            self.ttls[key] = ex
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+    
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+    
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+    
+    async def aclose(self):
+        pass
+
+
+class _FakePipeline:
+    """Queues commands and runs them in order on execute()."""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.redis, name), args, kwargs))
+        return queue
+    
+    async def execute(self):
+        return [await command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def store():
+    """Redis progress store wired to the in-test double."""
+    store = RedisProgressStore.__new__(RedisProgressStore)
+    store.ttl = 60
+    store.prefix = "test"
+    store.redis = _FakeRedis()
+    return store
+
+
+def test_progress_round_trip_and_expiry(store):
+    """Progress fields are JSON-encoded per field and expire after the TTL."""
+    async def main():
+        await store.set_progress("s1", {"status": "queued", "progress": 0, "started_at": 123})
+        await store.update_progress("s1", status="completed", progress=100, result={"title": "T"})
+        return await store.get_progress("s1")
+    
+    assert asyncio.run(main()) == {
+        "status": "completed",
+        "progress": 100,
+        "started_at": 123,
+        "result": {"title": "T"}
+    }
+    assert store.redis.ttls["test:progress:s1"] == 60
+
+
+def test_set_progress_replaces_the_entry(store):
+    """set_progress drops fields left over from an earlier entry."""
+    async def main():
+        await store.set_progress("s1", {"status": "failed", "error": "boom"})
+        await store.set_progress("s1", {"status": "queued"}, ttl=5)
+        return await store.get_progress("s1")
+    
+    assert asyncio.run(main()) == {"status": "queued"}
+    assert store.redis.ttls["test:progress:s1"] == 5
+
+
+def test_get_many_keeps_input_order(store):
+    """Batched lookups return entries in input order, None where missing."""
+    async def main():
+        await store.set_progress("a", {"progress": 1})
+        await store.set_progress("b", {"progress": 2})
+        return await store.get_many(["b", "missing", "a"]), await store.get_many([])
+    
+    entries, empty = asyncio.run(main())
+    assert entries == [{"progress": 2}, None, {"progress": 1}]
+    assert empty == []
+
+
+def test_report_paths_and_content_index(store):
+    """Report paths don't expire; the content index does."""
+    async def main():
+        await store.set_report_paths("s1", {"json": "/out/r.json"})
+        await store.set_report_paths("s2", {})
+        await store.set_content_session("abc", "s1")
+        return (
+            await store.get_report_path("s1", "json"),
+            await store.get_report_path("s1", "md"),
+            await store.get_content_session("abc"),
+            await store.get_content_session("other")
+        )
+    
+    assert asyncio.run(main()) == ("/out/r.json", None, "s1", None)
+    assert "test:report:s1" not in store.redis.ttls
+    assert "test:report:s2" not in store.redis.data
+    assert store.redis.ttls["test:content:abc"] == 60
+
+
+def test_delete_and_clear(store):
+    """delete drops one session's keys; clear drops everything under the prefix."""
+    store.redis.data["other:key"] = b"kept"
+    
+    async def main():
+        for session_id in ("s1", "s2"):
+            await store.set_progress(session_id, {"status": "completed"})
+            await store.set_report_paths(session_id, {"json": f"/out/{session_id}.json"})
+        await store.delete("s1")
+        deleted = (await store.get_progress("s1"), await store.get_report_path("s1", "json"))
+        await store.clear()
+        return deleted, await store.get_progress("s2")
+    
+    assert asyncio.run(main()) == ((None, None), None)
+    assert list(store.redis.data) == ["other:key"]
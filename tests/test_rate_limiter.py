@@ -0,0 +1,98 @@
+"""
+Tests for the client-side LLM rate limiter.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import rate_limiter
+from src.utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; the limiter's sleeps advance it instantly."""
+    state = SimpleNamespace(now=1000.0, sleeps=[])
+    
+    async def sleep(delay):
+        state.sleeps.append(delay)
+        state.now += delay
+    
+    monkeypatch.setattr(rate_limiter, 'time', SimpleNamespace(monotonic=lambda: state.now))
+    monkeypatch.setattr(rate_limiter, 'asyncio', SimpleNamespace(
+        sleep=sleep,
+        Semaphore=asyncio.Semaphore,
+        get_running_loop=asyncio.get_running_loop
+    ))
+    return state
+
+
+def test_concurrency_is_capped():
+    """No more than max_concurrency calls hold a slot at once."""
+    limiter = RateLimiter(max_concurrency=2)
+    in_flight = peak = 0
+    
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.reserve(10):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+    
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+    
+    asyncio.run(main())
+    assert peak == 2
+
+
+def test_token_budget_waits_for_the_window(clock):
+    """A call that would exceed the per-minute budget waits for room."""
+    limiter = RateLimiter(tokens_per_minute=100)
+    
+    async def main():
+        async with limiter.reserve(60):
+            pass
+        clock.now += 10
+        async with limiter.reserve(60):
+            pass
+    
+    asyncio.run(main())
+    # The first reservation leaves the window 60s after it was made
+    assert clock.sleeps == [50.0]
+
+
+def test_oversized_call_only_waits_for_an_empty_window(clock):
+    """A call larger than the whole budget is clamped instead of blocking forever."""
+    limiter = RateLimiter(tokens_per_minute=100)
+    
+    async def main():
+        async with limiter.reserve(500):
+            pass
+    
+    asyncio.run(main())
+    assert clock.sleeps == []
+
+
+def test_backoff_doubles_and_resets():
+    """Rate-limit errors back off exponentially up to the cap; success resets."""
+    limiter = RateLimiter(base_backoff=1.0, max_backoff=3.0, jitter=0.0)
+    
+    assert [limiter.register_429() for _ in range(3)] == [1.0, 2.0, 3.0]
+    limiter.register_success()
+    assert limiter.register_429() == 1.0
+
+
+def test_retry_after_blocks_new_calls(clock):
+    """A server-provided delay holds back the next reservation."""
+    limiter = RateLimiter()
+    assert limiter.register_429(retry_after=5.0) == 5.0
+    
+    async def main():
+        async with limiter.reserve(10):
+            pass
+    
+    asyncio.run(main())
+    assert clock.sleeps == [5.0]
@@ -0,0 +1,102 @@
+"""
+Tests for session persistence.
+"""
+from datetime import datetime
+
+import pytest
+
+from src.memory import session_manager as sm
+from src.memory import SessionData
+
+
+@pytest.mark.skipif(not sm.MSGSPEC_AVAILABLE, reason="msgspec not installed")
+def test_msgspec_record_round_trip():
+    """The msgspec schema matches SessionData and round-trips every field."""
+    init_fields = [f.name for f in sm.fields(SessionData) if f.init]
+    assert list(sm._SessionRecord.__struct_fields__) == init_fields
+    
+    session = SessionData(
+        session_id="s1",
+        created_at=datetime(2024, 1, 2, 3, 4, 5),
+        last_accessed=datetime(2024, 1, 2, 3, 4, 6),
+        paper_path="paper.pdf",
+        document={'title': 'T', 'sections': [{'c': 'text'}]},
+        agent_outputs={'summary': {'status': 'success'}},
+        final_report={'title': 'T'},
+        metadata={'content_hash': 'abc'},
+        status="completed"
+    )
+    restored = sm._decode_session(sm._encode_session(session, session.document))
+    
+    assert restored == session
+    # Defaults come from SessionData's factories, one fresh dict per record
+    first = sm._SessionRecord(session_id="a", created_at=session.created_at,
+                              last_accessed=session.created_at, paper_path="p")
+    second = sm._SessionRecord(session_id="b", created_at=session.created_at,
+                               last_accessed=session.created_at, paper_path="p")
+    assert first.metadata == {} and first.metadata is not second.metadata
+
+
+def _manager(path):
+    """Create a persisting session manager."""
+    return sm.SessionManager(enable_persistence=True, persistence_path=path)
+
+
+def test_snapshot_and_log_replay(tmp_path):
+    """Agent outputs appended after a snapshot survive a reload."""
+    manager = _manager(tmp_path)
+    session_id = manager.create_session("paper.pdf", {'content_hash': 'abc'})
+    manager.flush()
+    manager.store_agent_output(session_id, 'Summary', {'status': 'success'})
+    manager.store_agent_output(session_id, 'Math', {'status': 'partial'})
+    manager.close()
+    
+    assert (tmp_path / f"{session_id}.json").exists()
+    assert (tmp_path / f"{session_id}.log.jsonl").exists()
+    
+    reloaded = _manager(tmp_path)
+    session = reloaded.get_session(session_id)
+    assert session.agent_outputs == {
+        'Summary': {'status': 'success'},
+        'Math': {'status': 'partial'}
+    }
+    assert reloaded.find_by_content_hash('abc').session_id == session_id
+    reloaded.close()
+
+
+def test_large_document_fields_are_spilled(tmp_path):
+    """Large document fields go to the sidecar file and are restored on load."""
+    document = {
+        'title': 'T',
+        'full_text': 'x' * (sm._SPILL_THRESHOLD + 1),
+        'sections': [{'title': 'Intro', 'content': 'short'}]
+    }
+    manager = _manager(tmp_path)
+    session_id = manager.create_session("paper.pdf")
+    manager.store_document(session_id, document)
+    manager.update_session(session_id, {'status': 'processing'})
+    manager.close()
+    
+    snapshot = (tmp_path / f"{session_id}.json").read_bytes()
+    assert len(snapshot) < sm._SPILL_THRESHOLD
+    assert (tmp_path / f"{session_id}.doc.bin").exists()
+    
+    reloaded = _manager(tmp_path)
+    session = reloaded.get_session(session_id)
+    assert session.document == document
+    assert session.status == 'processing'
+    reloaded.close()
+
+
+def test_delete_removes_persisted_files(tmp_path):
+    """Deleting a session removes its snapshot, log and sidecar files."""
+    manager = _manager(tmp_path)
+    session_id = manager.create_session("paper.pdf")
+    manager.store_document(session_id, {'full_text': 'x' * (sm._SPILL_THRESHOLD + 1)})
+    manager.flush()
+    manager.store_agent_output(session_id, 'Summary', {})
+    manager.flush()
+    
+    assert manager.delete_session(session_id)
+    manager.close()
+    assert list(tmp_path.iterdir()) == []